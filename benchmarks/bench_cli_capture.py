@@ -0,0 +1,57 @@
+"""Benchmark: sustained headless capture rate of `bretclip capture`.
+
+Runs the command in a loop against the synthetic backend (so no display
+is needed and every run grabs the same pixels) and reports the captures
+per second it sustains, for files written through the save pipeline and
+for a PNG stream on stdout, at a few sizes and encoder thread counts.
+
+Usage:
+    python benchmarks/bench_cli_capture.py [--count 100] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("800x600 region", ['--region', '0,0,800,600']),
+    ("1920x1080 monitor", ['--monitor', '1']),
+    ("3840x2160 monitor", ['--monitor', '1', '--synthetic', '3840x2160']),
+]
+
+
+def rate(arguments, count):
+    """Captures per second reported by one looped run."""
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'bretclip.py'), 'capture', '--synthetic',
+         '--count', str(count)] + arguments,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+        env=dict(os.environ, QT_QPA_PLATFORM='offscreen'))
+    return float(re.search(r'\(([\d.]+)/s\)', result.stderr).group(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU(s); captures/s over {args.count} captures, fast PNG profile")
+    print(f"{'':20s}" + "".join(f"{f'files, {w}w':>12s}{f'stdout, {w}w':>13s}" for w in args.workers))
+    with tempfile.TemporaryDirectory(prefix="bretclip-cli-") as folder:
+        for label, arguments in CASES:
+            row = f"{label:20s}"
+            for workers in args.workers:
+                common = arguments + ['--workers', str(workers)]
+                row += f"{rate(common + ['--output', os.path.join(folder, 'c{n}.png')], args.count):12.1f}"
+                row += f"{rate(common + ['--output', '-'], args.count):13.1f}"
+            print(row, flush=True)
+
+
+if __name__ == "__main__":
+    main()
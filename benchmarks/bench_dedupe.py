@@ -0,0 +1,89 @@
+"""Benchmark: duplicate detection cost at autosave time.
+
+Measures hashing a capture (exact pixel hash and 64-bit dHash) at common
+resolutions, then fills a library with N synthetic records and times the
+exact-duplicate and near-duplicate lookups that run before every
+deduplicated autosave, against a brute-force scan of every hash.
+
+Usage:
+    python benchmarks/bench_dedupe.py [--records 100000] [--lookups 200]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_png_profiles import make_ui_text
+from library import ScreenshotLibrary
+from library.dedupe import dhash, hamming, pixel_hash
+from library.index import CaptureRecord
+
+
+def median_ms(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def flip_bits(value: int, count: int, rng: random.Random) -> int:
+    for bit in rng.sample(range(64), count):
+        value ^= 1 << bit
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--lookups', type=int, default=200)
+    args = parser.parse_args()
+
+    print("hashing a capture:")
+    for size in ((1920, 1080), (3840, 2160), (7680, 4320)):
+        image = make_ui_text(size)
+        print(f"  {size[0]}x{size[1]}: pixel hash {median_ms(lambda: pixel_hash(image), 5):7.1f} ms, "
+              f"dhash {median_ms(lambda: dhash(image), 5):6.1f} ms")
+
+    workdir = tempfile.mkdtemp(prefix="bretclip-dedupe-")
+    try:
+        library = ScreenshotLibrary(os.path.join(workdir, "library.sqlite3"),
+                                    os.path.join(workdir, "thumbnails"))
+        rng = random.Random(7)
+        hashes = [rng.getrandbits(64) for _ in range(args.records)]
+        start = time.perf_counter()
+        library._upsert(
+            CaptureRecord(f"/captures/{i}.png", float(i), 1000, 1920, 1080, None, None,
+                          f"{i:032x}", float(i), f"{i:032x}", value)
+            for i, value in enumerate(hashes))
+        print(f"\n{args.records} records inserted in {time.perf_counter() - start:.1f} s")
+
+        probes = [flip_bits(rng.choice(hashes), rng.randint(0, 3), rng) for _ in range(args.lookups)]
+        pixel_probes = [f"{rng.randrange(args.records * 2):032x}" for _ in range(args.lookups)]
+
+        exact = median_ms(lambda: [library._select("pixel_hash = ?", (p,)) for p in pixel_probes], 3)
+        print(f"exact lookup:          {exact / args.lookups * 1000:8.1f} us")
+        near = median_ms(lambda: [library.find_similar(p) for p in probes], 3)
+        found = sum(bool(library.find_similar(p)) for p in probes)
+        print(f"near lookup (banded):  {near / args.lookups * 1000:8.1f} us  "
+              f"({found}/{len(probes)} planted near-duplicates found)")
+
+        brute = median_ms(lambda: [[h for h in hashes if hamming(p, h) <= 3] for p in probes[:10]], 1)
+        print(f"near lookup (scan):    {brute / 10 * 1000:8.1f} us  (in-memory, no SQL)")
+        library.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
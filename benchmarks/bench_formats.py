@@ -0,0 +1,84 @@
+"""Benchmark: WebP and AVIF against the PNG save path.
+
+Encodes the bench_png_profiles corpus (UI text, photo-like, mostly flat)
+with the PNG profiles used by autosave and Save As and with every other
+format in storage.formats.available_formats, at one or more effort levels.
+Reports the median encode time, the file size relative to PNG "balanced"
+and the largest per-channel pixel error after decoding (0 = lossless).
+
+Usage:
+    python benchmarks/bench_formats.py [--runs 3] [--efforts 20 50] [--quality 90] [--images a.png ...]
+"""
+
+import argparse
+import functools
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image, ImageChops
+
+from bench_png_profiles import corpus
+from storage.formats import available_formats
+from storage.profiles import PROFILES
+
+
+def save(image: Image.Image, f, pil_format: str, options):
+    image.save(f, format=pil_format, **options)
+
+
+def encoders(efforts, quality):
+    """(label, callable writing an image to a file object) pairs."""
+    for name in ('fast', 'balanced'):
+        profile = PROFILES[name]
+        yield f"png {name}", lambda image, f, p=profile: p.prepare(image).save(
+            f, format='PNG', **p.png_options())
+    for output_format in available_formats():
+        if output_format.pil_format == 'PNG':
+            continue
+        for effort in efforts or [output_format.effort]:
+            yield f"{output_format.name} e{effort}", functools.partial(
+                save, pil_format=output_format.pil_format,
+                options=output_format.save_options(effort=effort, quality=quality))
+
+
+def max_error(image: Image.Image, data: bytes) -> int:
+    decoded = Image.open(io.BytesIO(data)).convert(image.mode)
+    return max(high for _, high in ImageChops.difference(decoded, image).getextrema())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3, help="encodes per image and format")
+    parser.add_argument('--efforts', type=int, nargs='*', default=[],
+                        help="0-100 (default: each format's default effort)")
+    parser.add_argument('--quality', type=int, default=90, help="quality for lossy formats")
+    parser.add_argument('--images', nargs='*', default=[], help="extra captures to include")
+    args = parser.parse_args()
+
+    print(f"{'image':<14}{'encoder':<22}{'encode ms':>10}{'bytes':>12}{'vs png':>9}{'max err':>9}")
+    for label, image in corpus(args.images):
+        results = []
+        for name, encode in encoders(args.efforts, args.quality):
+            times = []
+            for _ in range(args.runs):
+                buffer = io.BytesIO()
+                start = time.perf_counter()
+                encode(image, buffer)
+                times.append((time.perf_counter() - start) * 1000)
+            data = buffer.getvalue()
+            results.append((name, statistics.median(times), len(data), max_error(image, data)))
+
+        reference = dict((name, size) for name, _, size, _ in results)["png balanced"]
+        for name, ms, size, error in results:
+            print(f"{label:<14}{name:<22}{ms:>10.1f}{size:>12,}{size / reference:>8.2f}x{error:>9}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark: capture-to-editor image handoff, PIL path vs raw BGRA frame path.
+
+Old path (before zero-copy handoff):
+    grab -> Image.frombytes(BGRX) -> tobytes -> QImage -> QPixmap.fromImage -> copy()
+New path:
+    grab -> Frame -> QImage wrapping the grab buffer (PIL only made at export)
+
+Each path runs in its own subprocess so peak RSS can be compared.
+
+Usage:
+    python benchmarks/bench_frame_handoff.py [width] [height]
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPEATS = 5
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return float('nan')
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def run_path(path: str, width: int, height: int):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QImage, QPixmap
+    from PIL import Image
+    from capture.backends import SyntheticBackend
+
+    app = QApplication(sys.argv)
+    backend = SyntheticBackend([(width, height)])
+    region = {'left': 0, 'top': 0, 'width': width, 'height': height}
+    baseline = peak_rss_mb()
+
+    keep = []
+    times = []
+    for _ in range(REPEATS):
+        frame = backend.grab(region)
+        start = time.perf_counter()
+        if path == 'pil':
+            image = Image.frombytes('RGB', frame.size, bytes(frame.buffer), 'raw', 'BGRX')
+            data = image.tobytes('raw', 'RGB')
+            qimage = QImage(data, image.width, image.height, image.width * 3, QImage.Format_RGB888)
+            pixmap = QPixmap.fromImage(qimage)
+            display = pixmap.copy()
+            result = (image, data, pixmap, display)
+        else:
+            qimage = frame.to_qimage()
+            result = (frame, qimage)
+        times.append((time.perf_counter() - start) * 1000)
+        keep = [result]  # Hold one capture at a time, like the editor does
+    del keep
+
+    print(f"{min(times):.2f} {sum(times) / len(times):.2f} {peak_rss_mb() - baseline:.1f}")
+
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 7680
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 2160
+
+    if len(sys.argv) > 3:
+        run_path(sys.argv[3], width, height)
+        return
+
+    print(f"Capture handoff benchmark: {width}x{height} ({width * height * 4 / 1e6:.0f} MB BGRA)")
+    print(f"{'path':<8}{'min ms':>10}{'mean ms':>10}{'extra peak RSS MB':>20}")
+    for path in ('pil', 'frame'):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), str(width), str(height), path],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        best, mean, rss = out[-3:]
+        print(f"{path:<8}{float(best):>10.2f}{float(mean):>10.2f}{float(rss):>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark: round-trip latency of commands sent to the running instance.
+
+Starts a stand-in for the BretClip daemon in a subprocess: the real
+InstanceServer on a private socket name, answering capture requests the way
+BretClipApp does (grab through ScreenCapture on the synthetic backend,
+save through SaveService). Then times, from this process:
+
+- ping over one open connection and with a new connection per command
+- headless region and full-monitor captures saved to a file
+- a ping from a freshly started client process, as a script would send
+
+Usage:
+    python benchmarks/bench_instance.py [--count 200] [--captures 20]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import Future
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from system.instance import InstanceClient, send_command
+
+NAME = f"BretClip-bench-{os.getpid()}"
+
+
+def serve(name: str):
+    """Run the stand-in daemon until it is sent ``exit``."""
+    from PyQt5.QtCore import QCoreApplication, QTimer
+    from capture import ScreenCapture, SyntheticBackend
+    from storage.saver import SaveService
+    from system.instance import InstanceServer
+
+    app = QCoreApplication(sys.argv)
+    screen = ScreenCapture(SyntheticBackend.with_monitors(2, 1920, 1080))
+    saver = SaveService()
+    pending = {}
+    saver.saved.connect(lambda path, tag: pending.pop(tag).set_result({'path': path}))
+    saver.failed.connect(lambda path, tag, error: pending.pop(tag).set_result(
+        {'ok': False, 'error': error}))
+
+    def handle(message):
+        if message['command'] == 'exit':
+            QTimer.singleShot(0, app.quit)
+            return {}
+        if 'region' in message:
+            left, top, width, height = message['region']
+            frame = screen.grab_frame({'left': left, 'top': top, 'width': width, 'height': height})
+        else:
+            frame = screen.backend.grab_monitor(message.get('monitor', 0))
+        future = Future()
+        tag = str(len(pending)) + message['output']
+        pending[tag] = future
+        saver.submit(frame.to_image, message['output'], tag=tag, profile='fast')
+        return future
+
+    server = InstanceServer(name)
+    server.handler = handle
+    server.listen()
+    print("ready", flush=True)
+    app.exec_()
+    saver.shutdown()
+
+
+def timed_ms(function, count):
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.95) - 1]
+
+
+def report(label, result):
+    median, p95 = result
+    print(f"{label:34s} {median:8.2f} ms  (p95 {p95:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--captures', type=int, default=20)
+    parser.add_argument('--serve', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve)
+        return
+
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', NAME],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        server.stdout.readline()
+        with InstanceClient(NAME) as client:
+            client.connect()
+            report("ping (open connection)", timed_ms(
+                lambda: client.request({'command': 'ping'}), args.count))
+        report("ping (connect per command)", timed_ms(
+            lambda: send_command({'command': 'ping'}, name=NAME), args.count))
+
+        with tempfile.TemporaryDirectory(prefix="bretclip-instance-") as folder, \
+                InstanceClient(NAME) as client:
+            client.connect()
+            output = os.path.join(folder, "capture.png")
+            report("capture 800x600 region to PNG", timed_ms(lambda: client.request(
+                {'command': 'capture', 'region': [100, 100, 800, 600], 'output': output}),
+                args.captures))
+            report("capture 1920x1080 monitor to PNG", timed_ms(lambda: client.request(
+                {'command': 'capture', 'monitor': 1, 'output': output}), args.captures))
+
+        client = (f"import sys; sys.path.insert(0, {ROOT!r}); "
+                  f"from system.instance import send_command; "
+                  f"sys.exit(not send_command({{'command': 'ping'}}, name={NAME!r}))")
+        report("ping from a new client process", timed_ms(lambda: subprocess.run(
+            [sys.executable, '-c', client], check=True), 5))
+    finally:
+        send_command({'command': 'exit'}, name=NAME)
+        server.wait(10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: screenshot library cold start, rescan, queries and thumbnails.
+
+Fills a temporary folder with N small captures named like autosaves, then
+times a cold-start scan into an empty library, a rescan of the unchanged
+folder (the normal start-up case), newest-first and time-range queries,
+and building thumbnails for one page of results.
+
+Usage:
+    python benchmarks/bench_library.py [--files 10000] [--page 50] [--folder DIR]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+from library import ScreenshotLibrary
+from storage.naming import allocate_path
+
+
+def populate(folder: str, count: int):
+    image = Image.new('RGB', (320, 200), (240, 240, 240))
+    draw = ImageDraw.Draw(image)
+    for i in range(count):
+        draw.rectangle((0, 0, 319, 20), fill=(i * 7 % 256, 90, 160))
+        draw.text((4, 4), f"capture {i}", fill=(255, 255, 255))
+        image.save(allocate_path(folder), compress_level=1)
+
+
+def timed_ms(function, repeat=1):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--page', type=int, default=50, help="records per query / thumbnails built")
+    parser.add_argument('--folder', default=None, help="existing captures to scan instead")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bretclip-library-")
+    try:
+        folder = args.folder
+        if folder is None:
+            folder = os.path.join(workdir, "captures")
+            os.makedirs(folder)
+            start = time.perf_counter()
+            populate(folder, args.files)
+            print(f"created {args.files} captures in {time.perf_counter() - start:.1f} s")
+
+        library = ScreenshotLibrary(os.path.join(workdir, "library.sqlite3"),
+                                    os.path.join(workdir, "thumbnails"))
+        ms, (added, _) = timed_ms(lambda: library.scan(folder))
+        print(f"cold scan:       {ms:8.1f} ms  ({added} records, {ms * 1000 / max(added, 1):.0f} us/file)")
+        ms, (added, removed) = timed_ms(lambda: library.scan(folder))
+        print(f"rescan:          {ms:8.1f} ms  ({added} changed, {removed} removed)")
+
+        ms, page = timed_ms(lambda: library.recent(args.page), repeat=20)
+        print(f"recent({args.page}):      {ms:8.2f} ms")
+        stats = library.stats()
+        middle = (stats['first'] + stats['last']) / 2
+        ms, _ = timed_ms(lambda: library.search(since=middle, until=middle + 3600), repeat=20)
+        print(f"time range:      {ms:8.2f} ms")
+
+        ms, _ = timed_ms(lambda: [f.result() for f in [
+            library.thumbnails.request(r.path, r.content_hash) for r in page]])
+        print(f"{len(page)} thumbnails:   {ms:8.1f} ms  (cold)")
+        ms, _ = timed_ms(lambda: [library.thumbnail(r) for r in page], repeat=5)
+        print(f"{len(page)} thumbnails:   {ms:8.2f} ms  (cached)")
+        library.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark: hotkey-to-crosshair latency, new overlay per capture vs pooled overlay.
+
+"fresh" builds a SelectionOverlay (ScreenCapture, monitor lookup, label
+stylesheet, native top-level window) on every capture like _do_capture used
+to. "pooled" resets and re-shows one pre-warmed overlay. Both run against the
+synthetic 3x4K backend with frozen=False so the screen grab, which is the same
+for both, does not hide the difference.
+
+Usage:
+    python benchmarks/bench_overlay_pool.py [iterations]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from capture.backends import SyntheticBackend, set_default_backend
+from capture.modes import CaptureMode
+from capture.selector import SelectionOverlay
+
+
+def measure(app: QApplication, show_overlay, iterations: int):
+    """Time show_overlay() until the overlay is shown and events are flushed."""
+    times = []
+    for i in range(iterations):
+        mode = (CaptureMode.RECTANGULAR, CaptureMode.WINDOW, CaptureMode.FREEFORM)[i % 3]
+        start = time.perf_counter()
+        overlay = show_overlay(mode)
+        app.processEvents()
+        times.append((time.perf_counter() - start) * 1000)
+        overlay._dismiss()
+        app.processEvents()
+    times.sort()
+    return times[0], times[len(times) // 2], times[-1]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    app = QApplication(sys.argv)
+
+    backend = SyntheticBackend.with_monitors(3)
+    set_default_backend(lambda: backend)
+
+    def fresh(mode):
+        overlay = SelectionOverlay(mode, frozen=False)
+        overlay.show()
+        return overlay
+
+    pooled_overlay = SelectionOverlay(frozen=False, pooled=True)
+    pooled_overlay.warm_up()
+
+    def pooled(mode):
+        pooled_overlay.reset(mode)
+        pooled_overlay.show()
+        return pooled_overlay
+
+    print(f"Overlay show latency over {iterations} captures (3x4K synthetic desktop)")
+    print(f"{'strategy':<10}{'min ms':>10}{'median ms':>12}{'max ms':>10}")
+    for name, fn in (('fresh', fresh), ('pooled', pooled)):
+        best, median, worst = measure(app, fn, iterations)
+        print(f"{name:<10}{best:>10.2f}{median:>12.2f}{worst:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
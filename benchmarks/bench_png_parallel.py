@@ -0,0 +1,88 @@
+"""Benchmark: multi-core PNG encoding of 8K-wide captures.
+
+Encodes 7680x4320 versions of the bench_png_profiles corpus (UI text,
+photo-like, mostly flat) with Pillow's single-stream encoder and with
+storage.pngwriter.save_png using 1, 2, 4 and 8 worker threads, reporting
+the median encode time, the speedup over one worker and the file size.
+Every parallel encoding is decoded with both Pillow and Qt and compared
+with the source pixels.
+
+The speedup is bounded by the number of cores; the core count is printed
+with the results.
+
+Usage:
+    python benchmarks/bench_png_parallel.py [--runs 3] [--level 6] [--workers 1 2 4 8]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+from PyQt5.QtGui import QImage
+
+from bench_png_profiles import make_flat, make_photo, make_ui_text
+from editor.renderer import ensure_gui_application, qimage_to_pil
+from storage.pngwriter import save_png
+
+SIZE = (7680, 4320)
+
+
+def timed(encode, runs):
+    times = []
+    for _ in range(runs):
+        buffer = io.BytesIO()
+        start = time.perf_counter()
+        encode(buffer)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), buffer.getvalue()
+
+
+def decodes_exactly(image: Image.Image, data: bytes) -> bool:
+    decoded = Image.open(io.BytesIO(data)).convert(image.mode)
+    if decoded.tobytes() != image.tobytes():
+        return False
+    qimage = QImage.fromData(data, 'PNG')
+    if qimage.isNull():
+        return False
+    return qimage_to_pil(qimage).convert(image.mode).tobytes() == image.tobytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3, help="encodes per configuration")
+    parser.add_argument('--level', type=int, default=6, help="zlib compression level")
+    parser.add_argument('--workers', type=int, nargs='*', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    ensure_gui_application()
+    print(f"{SIZE[0]}x{SIZE[1]}, zlib level {args.level}, {os.cpu_count()} cores")
+    print(f"{'image':<10}{'encoder':<12}{'seconds':>9}{'speedup':>9}{'MB':>9}{'vs Pillow':>11}")
+
+    for label, make in (('ui-text', make_ui_text), ('photo', make_photo), ('flat', make_flat)):
+        image = make(SIZE)
+        seconds, data = timed(
+            lambda f: image.save(f, format='PNG', compress_level=args.level), args.runs)
+        reference = len(data)
+        print(f"{label:<10}{'pillow':<12}{seconds:>9.2f}{'':>9}{reference / 1e6:>9.2f}{1:>10.2f}x")
+
+        single = None
+        for workers in args.workers:
+            seconds, data = timed(
+                lambda f: save_png(image, f, args.level, workers=workers), args.runs)
+            single = single or seconds
+            status = "" if decodes_exactly(image, data) else "  DECODE MISMATCH"
+            print(f"{'':<10}{f'{workers} workers':<12}{seconds:>9.2f}{single / seconds:>8.2f}x"
+                  f"{len(data) / 1e6:>9.2f}{len(data) / reference:>10.2f}x{status}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark: PNG encode time and file size for each encoding profile.
+
+Encodes a corpus of typical screenshots with every profile in
+storage.profiles and reports the median encode time and the output size.
+The built-in corpus is synthetic (1920x1080):
+
+    ui-text    light window chrome covered in lines of small text
+    photo      smooth gradients with sensor-like noise (a photo/wallpaper)
+    flat       mostly flat panels with a few borders and labels
+
+Real captures can be added with --images. Every encoding is decoded again
+and compared with the source, so lossy output would be reported.
+
+Usage:
+    python benchmarks/bench_png_profiles.py [--runs 5] [--images a.png b.png ...]
+"""
+
+import argparse
+import io
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageChops, ImageDraw, ImageFilter
+
+from storage.profiles import PROFILES
+
+SIZE = (1920, 1080)
+LOREM = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+         "tempor incididunt ut labore et dolore magna aliqua 0123456789")
+
+
+def make_ui_text(size=SIZE) -> Image.Image:
+    image = Image.new('RGB', size, (243, 243, 243))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, size[0], 32), fill=(32, 32, 32))
+    draw.rectangle((0, 32, 260, size[1]), fill=(230, 230, 235))
+    rng = random.Random(1)
+    for y in range(44, size[1] - 12, 16):
+        draw.text((12, y), f"Item {y // 16}", fill=(40, 40, 40))
+        color = (20, 20, 20) if rng.random() > 0.1 else (0, 90, 200)
+        draw.text((276, y), LOREM[:rng.randint(60, len(LOREM))] * 2, fill=color)
+    return image
+
+
+def make_photo(size=SIZE) -> Image.Image:
+    gradient = Image.linear_gradient('L').resize(size)
+    radial = Image.radial_gradient('L').resize(size)
+    image = Image.merge('RGB', (gradient, radial, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    image = image.filter(ImageFilter.GaussianBlur(8))
+    noise = Image.merge('RGB', [Image.effect_noise(size, 12) for _ in range(3)])
+    return ImageChops.add(image, noise, scale=1.0, offset=-128)
+
+
+def make_flat(size=SIZE) -> Image.Image:
+    image = Image.new('RGB', size, (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, size[0], 48), fill=(0, 120, 212))
+    draw.rectangle((0, 48, 300, size[1]), fill=(249, 249, 249), outline=(225, 225, 225))
+    for i in range(6):
+        top = 100 + i * 150
+        draw.rounded_rectangle((340, top, size[0] - 40, top + 120), radius=8,
+                               fill=(250, 250, 250), outline=(220, 220, 220))
+        draw.text((360, top + 16), f"Card {i + 1}", fill=(30, 30, 30))
+    for i in range(12):
+        draw.text((24, 70 + i * 28), f"Navigation {i}", fill=(60, 60, 60))
+    return image
+
+
+def corpus(paths):
+    images = [('ui-text', make_ui_text()), ('photo', make_photo()), ('flat', make_flat())]
+    for path in paths:
+        with Image.open(path) as image:
+            images.append((os.path.basename(path), image.convert('RGBA' if 'A' in image.mode else 'RGB')))
+    return images
+
+
+def encode(image: Image.Image, profile) -> bytes:
+    buffer = io.BytesIO()
+    profile.prepare(image).save(buffer, format='PNG', **profile.png_options())
+    return buffer.getvalue()
+
+
+def lossless(image: Image.Image, data: bytes) -> bool:
+    decoded = Image.open(io.BytesIO(data)).convert(image.mode)
+    return decoded.tobytes() == image.tobytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="encodes per image and profile")
+    parser.add_argument('--images', nargs='*', default=[], help="extra captures to include")
+    args = parser.parse_args()
+
+    images = corpus(args.images)
+    totals = {name: [0.0, 0] for name in PROFILES}
+    print(f"{'image':<14}{'profile':<10}{'encode ms':>10}{'bytes':>12}{'vs balanced':>13}")
+    for label, image in images:
+        results = {}
+        for name, profile in PROFILES.items():
+            times = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                data = encode(image, profile)
+                times.append((time.perf_counter() - start) * 1000)
+            if not lossless(image, data):
+                print(f"{label}: {name} output differs from the source!")
+            results[name] = (statistics.median(times), len(data))
+            totals[name][0] += results[name][0]
+            totals[name][1] += len(data)
+
+        for name, (ms, size) in results.items():
+            ratio = size / results['balanced'][1]
+            print(f"{label:<14}{name:<10}{ms:>10.1f}{size:>12,}{ratio:>12.2f}x")
+        print()
+
+    print(f"{'total':<14}{'profile':<10}{'encode ms':>10}{'bytes':>12}")
+    for name, (ms, size) in totals.items():
+        print(f"{'':<14}{name:<10}{ms:>10.1f}{size:>12,}")
+
+
+if __name__ == "__main__":
+    main()
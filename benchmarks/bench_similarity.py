@@ -0,0 +1,80 @@
+"""Benchmark: search-by-example over perceptual hashes.
+
+Builds a HashIndex (multi-index hashing over the four 16-bit dHash bands)
+from N synthetic hashes - random captures plus clusters of near-identical
+ones, like repeated captures of the same window - and times radius
+queries against a linear scan of every hash. The scan is timed on a
+sample of queries at the largest sizes.
+
+Usage:
+    python benchmarks/bench_similarity.py [--sizes 10000 100000 1000000]
+        [--radii 3 6 8 10 12] [--queries 100]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_dedupe import flip_bits
+from library.dedupe import hamming
+from library.similarity import HashIndex
+
+
+def make_hashes(count: int, rng: random.Random):
+    """Half independent hashes, half in clusters of 20 within 12 bits."""
+    hashes = [rng.getrandbits(64) for _ in range(count // 2)]
+    while len(hashes) < count:
+        centre = rng.getrandbits(64)
+        for _ in range(min(20, count - len(hashes))):
+            hashes.append(flip_bits(centre, rng.randint(0, 12), rng))
+    rng.shuffle(hashes)
+    return hashes
+
+
+def per_query_ms(function, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        function(query)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), max(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--radii', type=int, nargs='+', default=[3, 6, 8, 10, 12])
+    parser.add_argument('--queries', type=int, default=100)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rng = random.Random(size)
+        hashes = make_hashes(size, rng)
+        start = time.perf_counter()
+        index = HashIndex()
+        for key, value in enumerate(hashes):
+            index.add(key, value)
+        print(f"\n{size} hashes: index built in {time.perf_counter() - start:.2f} s")
+
+        # Queries near stored hashes, so every radius has answers
+        queries = [flip_bits(rng.choice(hashes), rng.randint(0, 4), rng) for _ in range(args.queries)]
+        sampled = queries[:max(3, args.queries * 10000 // size)]
+
+        for radius in args.radii:
+            indexed, worst = per_query_ms(lambda q: index.search(q, radius), queries)
+            found = statistics.mean(len(index.search(q, radius)) for q in sampled)
+            scan, _ = per_query_ms(lambda q: [h for h in hashes if hamming(q, h) <= radius], sampled)
+            print(f"  r={radius:2d}: index {indexed:8.2f} ms (max {worst:7.2f})   "
+                  f"scan {scan:8.1f} ms   x{scan / max(indexed, 1e-6):6.1f}   "
+                  f"{found:6.1f} matches/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark: 10k-point freehand stroke, list[QPoint] + QPainterPath vs StrokePoints.
+
+Old path:
+    points: list[QPoint], a QPainterPath rebuilt with lineTo per point on every paint
+New path:
+    points: StrokePoints (interleaved array('i'), near-duplicates dropped),
+    drawn with drawPolyline on a cached QPolygon
+
+Usage:
+    python benchmarks/bench_strokes.py [points]
+"""
+
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QPoint
+from PyQt5.QtGui import QImage, QPainter, QPainterPath, QPen, QColor
+
+from editor.tools import StrokePoints
+
+REPEATS = 20
+
+
+def mouse_samples(count: int):
+    """Simulate a 1000 Hz mouse tracing a spiral at varying hand speed.
+
+    Consecutive samples are 0-3 px apart, so many land on (or next to) the
+    previous pixel, as they do with real high-rate pointing devices.
+    """
+    samples = []
+    angle = 0.0
+    for i in range(count):
+        radius = 60 + i * 0.04
+        speed = 1.5 + 1.5 * math.sin(i / 300.0)  # px per sample
+        angle += speed / radius
+        samples.append(QPoint(round(960 + radius * math.cos(angle)),
+                              round(540 + radius * math.sin(angle))))
+    return samples
+
+
+def measure(label: str, build, paint, samples):
+    tracemalloc.start()
+    start = time.perf_counter()
+    points = build(samples)
+    build_ms = (time.perf_counter() - start) * 1000
+    memory_kb = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+
+    image = QImage(1920, 1080, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    times = []
+    for _ in range(REPEATS):
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(QColor(255, 0, 0), 3, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        start = time.perf_counter()
+        paint(painter, points)
+        painter.end()
+        times.append((time.perf_counter() - start) * 1000)
+
+    print(f"{label:<14}{len(points):>8}{build_ms:>10.2f}{memory_kb:>10.0f}"
+          f"{min(times):>10.2f}{sum(times) / len(times):>10.2f}")
+
+
+def build_list(samples):
+    points = []
+    for point in samples:
+        points.append(QPoint(point))
+    return points
+
+
+def paint_path(painter, points):
+    path = QPainterPath()
+    path.moveTo(points[0])
+    for point in points[1:]:
+        path.lineTo(point)
+    painter.drawPath(path)
+
+
+def build_stroke(samples):
+    points = StrokePoints()
+    for point in samples:
+        points.append(point)
+    return points
+
+
+def paint_polyline(painter, points):
+    painter.drawPolyline(points.polygon())
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    app = QApplication(sys.argv)
+    samples = mouse_samples(count)
+
+    print(f"Stroke benchmark: {count} mouse samples, {REPEATS} paints each")
+    print(f"{'storage':<14}{'points':>8}{'build ms':>10}{'mem KiB':>10}{'min ms':>10}{'mean ms':>10}")
+    measure('list+path', build_list, paint_path, samples)
+    measure('StrokePoints', build_stroke, paint_polyline, samples)
+
+
+if __name__ == "__main__":
+    main()
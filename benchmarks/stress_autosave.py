@@ -0,0 +1,94 @@
+"""Stress test: burst autosaves from several processes into one folder.
+
+Each process runs a SaveService and submits autosaves as fast as it can
+(small images, so naming and file creation dominate) using the same
+allocate_path naming as the editor. Afterwards every submission must have
+produced its own non-empty file: no overwrites, no leftover temp files.
+
+Files are written to ~/Pictures/Screenshots with a BretClipStress prefix and
+removed at the end unless --keep is given.
+
+Usage:
+    python benchmarks/stress_autosave.py [--processes 4] [--saves 500] [--folder DIR] [--keep]
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PREFIX = "BretClipStress"
+
+
+def worker(folder: str, saves: int, seed: int, results):
+    from PIL import Image
+    from storage.naming import allocate_path
+    from storage.saver import SaveService
+
+    service = SaveService(workers=4, max_pending=32)
+    failures = []
+    service.failed.connect(lambda path, tag, error: failures.append(error))
+
+    image = Image.new('RGB', (64, 64), (seed * 40 % 256, 80, 160))
+    paths = []
+    for _ in range(saves):
+        path = allocate_path(folder, prefix=PREFIX)
+        service.submit(image, path, tag='stress', reserved=True)
+        paths.append(path)
+    service.shutdown(wait=True)
+    results.put((paths, failures))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--saves', type=int, default=500, help="saves per process")
+    parser.add_argument('--folder', default=None, help="default: ~/Pictures/Screenshots")
+    parser.add_argument('--keep', action='store_true', help="leave the files behind")
+    args = parser.parse_args()
+
+    from storage.naming import screenshots_folder
+    folder = args.folder or screenshots_folder()
+    os.makedirs(folder, exist_ok=True)
+    before = set(glob.glob(os.path.join(folder, f"{PREFIX}_*")))
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=worker, args=(folder, args.saves, i, results))
+        for i in range(args.processes)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    submitted = [path for paths, _ in outcomes for path in paths]
+    failures = [error for _, errors in outcomes for error in errors]
+    created = set(glob.glob(os.path.join(folder, f"{PREFIX}_*"))) - before
+    empty = [path for path in created if os.path.getsize(path) == 0]
+    temps = glob.glob(os.path.join(folder, ".bretclip-*.tmp"))
+
+    total = len(submitted)
+    print(f"{total} saves from {args.processes} processes in {elapsed:.2f} s "
+          f"({total / elapsed:.0f} saves/s) into {folder}")
+    print(f"unique names: {len(set(submitted))}, files created: {len(created)}, "
+          f"empty: {len(empty)}, temp files left: {len(temps)}, failures: {len(failures)}")
+
+    ok = len(set(submitted)) == total == len(created) and not empty and not temps and not failures
+    print("PASS" if ok else "FAIL")
+
+    if not args.keep:
+        for path in created:
+            os.remove(path)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,10 @@ Hotkey: Ctrl+Alt+B to capture
 import sys
 import os
 import ctypes
-from typing import Optional
+import itertools
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional, Union
 
 # Enable DPI awareness BEFORE importing PyQt5
 try:
@@ -19,6 +22,12 @@ except Exception:
     except Exception:
         pass
 
+# Command-line use (see cli.py) skips the GUI stack entirely
+if __name__ == "__main__" and len(sys.argv) > 1:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import cli
+    sys.exit(cli.main(sys.argv[1:]))
+
 from PyQt5.QtWidgets import (QApplication, QDialog, QVBoxLayout, QHBoxLayout,
                               QPushButton, QLabel, QComboBox, QFrame,
                               QGraphicsDropShadowEffect, QGridLayout)
@@ -30,10 +39,19 @@ from PIL import Image
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from capture.modes import CaptureMode, DelayOption
+from capture.frame import Frame
+from capture.screen import ScreenCapture
 from capture.selector import SelectionOverlay
+from capture.topology import get_topology
 from editor.window import EditorWindow
 from system.tray import SystemTray
 from system.hotkeys import HotkeyManager
+from system.instance import AlreadyRunningError, InstanceServer, Reply, send_command
+from storage.naming import allocate_path
+from storage.formats import AUTOSAVE_FORMAT, format_for_path, get_format
+from storage.profiles import AUTOSAVE_PROFILE
+from storage.saver import get_save_service
+from library import get_library
 
 
 class ModeCard(QFrame):
@@ -357,6 +375,12 @@ class BretClipApp:
         if os.path.exists(self.icon_path):
             self.app.setWindowIcon(QIcon(self.icon_path))
 
+        # One instance per user: later launches and scripts send commands
+        # here (raises AlreadyRunningError before anything else starts)
+        self.instance = InstanceServer()
+        self.instance.handler = self._on_remote_command
+        self.instance.listen()
+
         # Components
         self.editor: Optional[EditorWindow] = None
         self.selector: Optional[SelectionOverlay] = None
@@ -374,6 +398,19 @@ class BretClipApp:
         self.tray.on_show_window = self._on_tray_show
         self.tray.on_exit = self._on_exit
 
+        # Background saving; autosave results are reported through the tray
+        self.save_service = get_save_service()
+        self.save_service.saved.connect(self._on_save_finished)
+        self.save_service.failed.connect(self._on_save_failed)
+
+        # Every save is indexed in the screenshot library; files added while
+        # BretClip was not running are picked up by a background scan
+        self.library = get_library()
+        self.save_service.job_saved.connect(self.library.record_job)
+        # Autosaves identical to an earlier capture become hard links to it
+        self.save_service.duplicate_check = self.library.check_duplicate
+        self.library.scan_async()
+
         # Hotkey manager
         self.hotkey_manager = HotkeyManager()
         self.hotkey_manager.set_callback(self._on_hotkey)
@@ -382,6 +419,21 @@ class BretClipApp:
         self.delay_timer: Optional[QTimer] = None
         self.pending_mode: Optional[CaptureMode] = None
 
+        # Headless captures requested over the instance socket
+        self.screen: Optional[ScreenCapture] = None
+        self._remote_saves: Dict[str, Future] = {}
+        self._remote_ids = itertools.count(1)
+
+        # Pre-warmed selection overlay, reset and re-shown for every capture
+        self._create_selector()
+
+    def _create_selector(self):
+        """Create the pooled selection overlay hidden, ready for the first hotkey."""
+        self.selector = SelectionOverlay(pooled=True)
+        self.selector.selection_complete.connect(self._on_capture_complete)
+        self.selector.selection_cancelled.connect(self._on_capture_cancelled)
+        self.selector.warm_up()
+
     def _create_editor(self):
         """Create the editor window if not exists."""
         if self.editor is None:
@@ -434,16 +486,16 @@ class BretClipApp:
         else:
             self._do_capture(mode)
 
-    def _start_delay_countdown(self, seconds: int):
+    def _start_delay_countdown(self, seconds: float):
         """Start delay countdown before capture."""
         self.delay_timer = QTimer()
         self.delay_timer.timeout.connect(self._on_delay_complete)
         self.delay_timer.setSingleShot(True)
-        self.delay_timer.start(seconds * 1000)
+        self.delay_timer.start(int(seconds * 1000))
 
         self.tray.show_notification(
             "BretClip",
-            f"Capturing in {seconds} seconds..."
+            f"Capturing in {seconds:g} seconds..."
         )
 
     def _on_delay_complete(self):
@@ -454,66 +506,202 @@ class BretClipApp:
 
     def _do_capture(self, mode: CaptureMode):
         """Perform the actual capture."""
+        if self.selector.isVisible():
+            return  # A capture is already in progress
+
         if self.editor and self.editor.isVisible():
             self.editor.hide()
 
-        self.selector = SelectionOverlay(mode)
-        self.selector.selection_complete.connect(self._on_capture_complete)
-        self.selector.selection_cancelled.connect(self._on_capture_cancelled)
+        self.selector.reset(mode)
         self.selector.show()
 
-    def _on_capture_complete(self, image: Image.Image):
+    def _on_capture_complete(self, image: Union[Frame, Image.Image]):
         """Handle completed capture - open editor for editing."""
-        # Don't null self.selector here — it's still mid-signal.
-        # Use QTimer to clean it up safely after the signal finishes.
-        if self.selector:
-            QTimer.singleShot(0, self._cleanup_selector)
-
         if image:
-            try:
-                print(f"Capture complete: {image.size} {image.mode}")
-                self._create_editor()
-                print("Editor created")
-                self.editor.set_image(image)
-                print("Image set")
-                self.editor.show()
-                self.editor.activateWindow()
-                self.editor.raise_()
-                print("Editor shown and raised")
-            except Exception as e:
-                import traceback
-                print(f"Editor error: {e}")
-                traceback.print_exc()
-                self._emergency_save(image)
+            window = None
+            if self.selector.mode == CaptureMode.WINDOW:
+                window = self.selector.captured_window_title
+            self._open_capture(image, self._capture_metadata(image, window))
         else:
             print("Warning: _on_capture_complete received None image")
 
-    def _cleanup_selector(self):
-        """Safely clean up the selector after signal processing completes."""
-        self.selector = None
-
-    def _emergency_save(self, image: Image.Image):
+    def _open_capture(self, image: Union[Frame, Image.Image], metadata: Dict):
+        """Show a capture in the editor, or save it if the editor fails."""
+        try:
+            print(f"Capture complete: {image.size} {image.mode}")
+            self._create_editor()
+            print("Editor created")
+            self.editor.set_image(image, metadata)
+            print("Image set")
+            self.editor.show()
+            self.editor.activateWindow()
+            self.editor.raise_()
+            print("Editor shown and raised")
+        except Exception as e:
+            import traceback
+            print(f"Editor error: {e}")
+            traceback.print_exc()
+            self._emergency_save(image, metadata)
+
+    def _capture_metadata(self, image: Union[Frame, Image.Image],
+                          window: Optional[str] = None) -> Dict:
+        """Capture time, source monitor and window for the screenshot library."""
+        metadata = {'captured_at': time.time()}
+        if isinstance(image, Frame):
+            # The monitor under the centre of the captured area
+            metadata['monitor'] = get_topology().index_at(
+                image.left + image.width // 2, image.top + image.height // 2)
+        if window:
+            metadata['window'] = window
+        return metadata
+
+    def _emergency_save(self, image: Image.Image, metadata: Optional[Dict] = None):
         """Emergency save if editor fails to open."""
-        from datetime import datetime
+        output_format = get_format(AUTOSAVE_FORMAT)
+        try:
+            filepath = allocate_path(extension=output_format.extension)
+        except OSError as e:
+            print(f"Emergency save failed: {e}")
+            return
+
+        # Frame.to_image runs on the save worker along with the encode
+        source = image.to_image if isinstance(image, Frame) else image
+        self.save_service.submit(source, filepath, tag='emergency', reserved=True,
+                                 format=output_format.pil_format, profile=AUTOSAVE_PROFILE,
+                                 metadata=metadata, deduplicate=True,
+                                 **output_format.save_options())
+        print(f"Emergency save to: {filepath}")
+
+    def _on_save_finished(self, path: str, tag: str):
+        """Tell the user where background autosaves landed."""
+        remote = self._remote_saves.pop(tag, None)
+        if remote is not None:
+            remote.set_result({'path': path})
+        elif tag in ('autosave', 'emergency'):
+            self.tray.show_notification("BretClip", f"Saved to {os.path.basename(path)}")
+
+    def _on_save_failed(self, path: str, tag: str, error: str):
+        """Surface background save failures, even with no editor open."""
+        remote = self._remote_saves.pop(tag, None)
+        if remote is not None:
+            # The caller reports it; no need for a tray balloon
+            remote.set_result({'ok': False, 'path': path, 'error': error})
+            return
+        self.tray.show_notification("BretClip", f"Failed to save {os.path.basename(path)}: {error}")
+
+    # --- Commands from other processes -------------------------------------
+
+    def _on_remote_command(self, message: Dict) -> Reply:
+        """Serve a command sent over the instance socket (see system.instance).
+
+        Commands:
+            capture: Same as the hotkey, or headless (see _remote_capture)
+            show: Show the editor window
+            exit: Quit BretClip
+        """
+        command = message.get('command')
+        if command == 'capture':
+            return self._remote_capture(message)
+        if command == 'show':
+            self.signals.trigger_show.emit()
+            return {}
+        if command == 'exit':
+            QTimer.singleShot(0, self._on_exit)
+            return {}
+        raise ValueError(f"Unknown command: {command!r}")
+
+    def _remote_capture(self, message: Dict) -> Reply:
+        """Start a capture for another process.
+
+        Without region, monitor or output this is what the hotkey or tray
+        menu does: the mode dialog, or the overlay for ``mode``. Otherwise
+        the screen is grabbed without any UI and either opened in the
+        editor or, with ``output``, saved there; the reply then waits for
+        the save and carries the saved ``path``.
+
+        Request keys (all optional):
+            mode: rectangular, freeform, window or fullscreen
+            region: [left, top, width, height] in virtual-desktop pixels
+            monitor: Monitor index (0 = all monitors, 1+ = one monitor)
+            delay: Seconds to wait before capturing
+            output: Absolute path to save to
+            format: Output format name (default: from the output extension)
+        """
+        mode = message.get('mode')
+        if mode is not None:
+            try:
+                mode = CaptureMode[str(mode).upper()]
+            except KeyError:
+                raise ValueError(f"Unknown capture mode: {message['mode']!r}")
+        region = message.get('region')
+        monitor = message.get('monitor')
+        output = message.get('output')
+        delay = float(message.get('delay') or 0)
+
+        if region is None and monitor is None and output is None:
+            if mode is None:
+                # The dialog runs its own event loop; reply first
+                QTimer.singleShot(0, self._show_capture_dialog)
+            elif delay > 0:
+                self.pending_mode = mode
+                self._start_delay_countdown(delay)
+            else:
+                self.signals.trigger_direct_capture.emit(mode)
+            return {'interactive': True}
+
+        if region is None and monitor is None and mode not in (None, CaptureMode.FULLSCREEN):
+            raise ValueError(f"{mode.name.lower()} capture needs the overlay; "
+                             "give a region or monitor to capture without it")
+        if self.screen is None:
+            self.screen = ScreenCapture()
+        if region is not None:
+            left, top, width, height = (int(value) for value in region)
+            if width <= 0 or height <= 0:
+                raise ValueError(f"Empty capture region: {region}")
+            region = {'left': left, 'top': top, 'width': width, 'height': height}
+        else:
+            monitor = int(monitor or 0)
+            count = len(self.screen.get_monitors())
+            if not 0 <= monitor <= count:
+                raise ValueError(f"No monitor {monitor} (have {count})")
 
-        screenshots_folder = os.path.join(os.path.expanduser("~"), "Pictures", "Screenshots")
-        if not os.path.exists(screenshots_folder):
-            os.makedirs(screenshots_folder)
+        output_format = None
+        if output is not None:
+            output = os.path.abspath(output)
+            output_format = (get_format(message['format']) if message.get('format')
+                             else format_for_path(output))
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"BretClip_{timestamp}.png"
-        filepath = os.path.join(screenshots_folder, filename)
+        future = Future()
 
-        try:
-            image.save(filepath)
-            self.tray.show_notification("BretClip", f"Saved to {filename}")
-            print(f"Emergency save to: {filepath}")
-        except Exception as e:
-            print(f"Emergency save failed: {e}")
+        def grab():
+            tag = f"remote-{next(self._remote_ids)}"
+            try:
+                frame = self.screen.grab_frame(region, monitor)
+                metadata = self._capture_metadata(frame)
+                if output is None:
+                    self._open_capture(frame, metadata)
+                    future.set_result({})
+                    return
+                self._remote_saves[tag] = future
+                options = output_format.save_options() if output_format else {}
+                self.save_service.submit(
+                    frame.to_image, output, tag=tag,
+                    format=output_format.pil_format if output_format else None,
+                    profile=AUTOSAVE_PROFILE, metadata=metadata, **options)
+            except Exception as e:
+                # Nothing was queued, so no saved/failed signal will claim it
+                self._remote_saves.pop(tag, None)
+                future.set_exception(e)
+
+        if delay > 0:
+            QTimer.singleShot(int(delay * 1000), grab)
+        else:
+            grab()
+        return future
 
     def _on_capture_cancelled(self):
         """Handle cancelled capture."""
-        self.selector = None
+        print("Capture cancelled")
 
     def _show_editor(self):
         """Show the editor window."""
@@ -527,6 +715,10 @@ class BretClipApp:
 
     def _on_exit(self):
         """Handle application exit."""
+        self.instance.close()
+        # Let queued saves finish before the process goes away
+        self.save_service.shutdown(wait=True)
+        self.library.close()
         self.hotkey_manager.stop()
         self.tray.stop()
         self.app.quit()
@@ -546,7 +738,16 @@ class BretClipApp:
 
 def main():
     """Main entry point."""
-    app = BretClipApp()
+    try:
+        app = BretClipApp()
+    except AlreadyRunningError:
+        # A second launch opens the capture dialog of the running instance
+        print("BretClip is already running")
+        try:
+            send_command({'command': 'capture'})
+        except OSError as e:
+            print(f"Could not reach it: {e}")
+        sys.exit(0)
     sys.exit(app.run())
 
 
@@ -1,5 +1,10 @@
 from .screen import ScreenCapture
 from .selector import SelectionOverlay
 from .modes import CaptureMode
+from .frame import Frame
+from .backends import CaptureBackend, MssBackend, SyntheticBackend, set_default_backend
 
-__all__ = ['ScreenCapture', 'SelectionOverlay', 'CaptureMode']
+__all__ = [
+    'ScreenCapture', 'SelectionOverlay', 'CaptureMode', 'Frame',
+    'CaptureBackend', 'MssBackend', 'SyntheticBackend', 'set_default_backend'
+]
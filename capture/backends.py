@@ -0,0 +1,191 @@
+"""Pluggable screen capture backends.
+
+ScreenCapture delegates all OS access to a backend. The mss backend talks to
+the real desktop; the synthetic backend serves deterministic frames from
+generated patterns or image files so the capture path can run headless.
+"""
+
+import ctypes
+from ctypes import wintypes
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import mss
+from PIL import Image, ImageDraw
+
+from .frame import Frame
+
+
+class CaptureBackend:
+    """Interface implemented by every capture backend.
+
+    Monitors are described with mss-style dictionaries (left, top, width,
+    height). Index 0 of :meth:`monitors` is the bounding box of all monitors,
+    1+ are the individual monitors.
+    """
+
+    def grab(self, region: Dict) -> Frame:
+        """Grab a screen region as a BGRA frame."""
+        raise NotImplementedError
+
+    def grab_monitor(self, index: int) -> Frame:
+        """Grab a monitor (0 = all monitors combined, 1+ = specific monitor)."""
+        return self.grab(self.monitors()[index])
+
+    def monitors(self) -> List[Dict]:
+        """Enumerate monitors, combined bounds first."""
+        raise NotImplementedError
+
+    def window_rect(self, hwnd: int) -> Optional[Dict]:
+        """Look up a window's screen rectangle, or None if unknown."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any OS resources."""
+
+
+class MssBackend(CaptureBackend):
+    """Backend grabbing the real desktop through mss."""
+
+    def __init__(self):
+        self.sct = mss.mss()
+
+    def grab(self, region: Dict) -> Frame:
+        screenshot = self.sct.grab(region)
+        # .raw is the bytearray mss filled; .bgra would be a copy of it
+        return Frame(screenshot.raw, screenshot.width, screenshot.height,
+                     screenshot.left, screenshot.top)
+
+    def monitors(self) -> List[Dict]:
+        return self.sct.monitors
+
+    def window_rect(self, hwnd: int) -> Optional[Dict]:
+        try:
+            rect = wintypes.RECT()
+            ctypes.windll.user32.GetWindowRect(hwnd, ctypes.byref(rect))
+        except Exception:
+            return None
+
+        width = rect.right - rect.left
+        height = rect.bottom - rect.top
+        if width <= 0 or height <= 0:
+            return None
+        return {'left': rect.left, 'top': rect.top, 'width': width, 'height': height}
+
+    def close(self):
+        self.sct.close()
+
+
+class SyntheticBackend(CaptureBackend):
+    """Deterministic backend serving a fixed virtual desktop.
+
+    Monitors are laid out left to right, top-aligned, starting at (0, 0).
+    Each monitor shows either an image file (scaled to the monitor size) or a
+    generated UI-like pattern, so grabs are reproducible across runs.
+    """
+
+    def __init__(self, resolutions: Sequence[Tuple[int, int]] = ((1920, 1080),),
+                 images: Optional[Sequence[Optional[str]]] = None,
+                 windows: Optional[Dict[int, Dict]] = None):
+        """Build the virtual desktop.
+
+        Args:
+            resolutions: (width, height) of each monitor, left to right
+            images: Optional image path per monitor (None = generated pattern)
+            windows: Optional mapping of fake window handles to rectangles
+        """
+        self._monitors: List[Dict] = []
+        left = 0
+        for width, height in resolutions:
+            self._monitors.append({'left': left, 'top': 0, 'width': width, 'height': height})
+            left += width
+
+        total = {
+            'left': 0,
+            'top': 0,
+            'width': left,
+            'height': max(height for _, height in resolutions)
+        }
+        self._monitors.insert(0, total)
+        self.windows: Dict[int, Dict] = dict(windows or {})
+
+        desktop = Image.new('RGB', (total['width'], total['height']), (0, 0, 0))
+        images = list(images or [])
+        for i, mon in enumerate(self._monitors[1:]):
+            path = images[i] if i < len(images) else None
+            if path:
+                content = Image.open(path).convert('RGB').resize((mon['width'], mon['height']))
+            else:
+                content = self._make_pattern(mon['width'], mon['height'], i)
+            desktop.paste(content, (mon['left'], mon['top']))
+
+        self.desktop = Frame(bytearray(desktop.tobytes('raw', 'BGRX')),
+                             total['width'], total['height'])
+
+    @classmethod
+    def with_monitors(cls, count: int, width: int = 3840, height: int = 2160, **kwargs) -> 'SyntheticBackend':
+        """Create a backend with ``count`` identical monitors (e.g. 3x4K)."""
+        return cls([(width, height)] * count, **kwargs)
+
+    @staticmethod
+    def _make_pattern(width: int, height: int, seed: int) -> Image.Image:
+        """Generate a screenshot-like pattern: flat panels, gradients and text."""
+        base = Image.linear_gradient('L').resize((width, height))
+        image = Image.merge('RGB', (
+            base,
+            base.transpose(Image.Transpose.FLIP_LEFT_RIGHT),
+            Image.new('L', (width, height), (seed * 67) % 256)
+        ))
+
+        draw = ImageDraw.Draw(image)
+        step = max(height // 12, 40)
+        for row, y in enumerate(range(step, height - step, step)):
+            shade = 30 + (row * 17 + seed * 40) % 200
+            draw.rectangle([width // 20, y, width // 2, y + step // 2], fill=(shade, shade, shade))
+            draw.text((width // 20 + 8, y + 4), f"Monitor {seed + 1} - row {row}", fill=(255, 255, 255))
+        return image
+
+    def grab(self, region: Dict) -> Frame:
+        """Copy a region out of the virtual desktop, like a real grab."""
+        width = region['width']
+        height = region['height']
+        view = self.desktop.crop(region['left'], region['top'], width, height)
+
+        if view is not None and view.size == (width, height):
+            row_bytes = width * Frame.BYTES_PER_PIXEL
+            data = bytearray(b''.join(
+                view.buffer[y * view.stride:y * view.stride + row_bytes]
+                for y in range(height)
+            ))
+            return Frame(data, width, height, region['left'], region['top'])
+
+        # Partially off-desktop: pad with black like an unmapped area
+        canvas = Image.new('RGB', (width, height), (0, 0, 0))
+        if view is not None:
+            canvas.paste(view.to_image(), (view.left - region['left'], view.top - region['top']))
+        return Frame(bytearray(canvas.tobytes('raw', 'BGRX')), width, height,
+                     region['left'], region['top'])
+
+    def monitors(self) -> List[Dict]:
+        return self._monitors
+
+    def window_rect(self, hwnd: int) -> Optional[Dict]:
+        return self.windows.get(hwnd)
+
+
+_default_backend_factory: Callable[[], CaptureBackend] = MssBackend
+
+
+def set_default_backend(factory: Callable[[], CaptureBackend]):
+    """Set the factory ScreenCapture uses when no backend is passed.
+
+    Args:
+        factory: Callable returning a backend, e.g. ``MssBackend`` or
+            ``lambda: SyntheticBackend.with_monitors(3)``
+    """
+    global _default_backend_factory
+    _default_backend_factory = factory
+
+
+def create_default_backend() -> CaptureBackend:
+    """Create a backend using the configured default factory."""
+    return _default_backend_factory()
@@ -0,0 +1,87 @@
+"""Raw screen frames backed by a single BGRA buffer."""
+
+from PIL import Image
+from PyQt5.QtGui import QImage
+from typing import Optional, Tuple
+
+
+class Frame:
+    """A BGRA screen grab positioned in virtual-desktop coordinates.
+
+    The pixel data lives in one buffer (the ``raw`` bytearray handed back by
+    mss). Cropping never copies: a cropped frame is a view into the parent
+    buffer with its own origin and size but the parent's row stride.
+    """
+
+    BYTES_PER_PIXEL = 4
+
+    def __init__(self, buffer, width: int, height: int,
+                 left: int = 0, top: int = 0, stride: Optional[int] = None):
+        """Wrap a BGRA buffer.
+
+        Args:
+            buffer: Bytes-like object holding BGRA pixels
+            width: Width in pixels
+            height: Height in pixels
+            left: Screen X coordinate of the first pixel
+            top: Screen Y coordinate of the first pixel
+            stride: Bytes per row (defaults to a tightly packed row)
+        """
+        self.buffer = memoryview(buffer)
+        self.width = width
+        self.height = height
+        self.left = left
+        self.top = top
+        self.stride = stride or width * self.BYTES_PER_PIXEL
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    @property
+    def mode(self) -> str:
+        """PIL mode this frame converts to."""
+        return 'RGB'
+
+    def crop(self, x: int, y: int, width: int, height: int) -> Optional['Frame']:
+        """Return a view of a screen rectangle without copying pixels.
+
+        Args:
+            x: Left screen coordinate
+            y: Top screen coordinate
+            width: Width of region
+            height: Height of region
+
+        Returns:
+            Frame sharing this frame's buffer, clipped to the frame bounds,
+            or None if the rectangle does not overlap the frame
+        """
+        left = max(x, self.left)
+        top = max(y, self.top)
+        right = min(x + width, self.left + self.width)
+        bottom = min(y + height, self.top + self.height)
+        if right <= left or bottom <= top:
+            return None
+
+        offset = ((top - self.top) * self.stride +
+                  (left - self.left) * self.BYTES_PER_PIXEL)
+        crop_width = right - left
+        crop_height = bottom - top
+        end = offset + (crop_height - 1) * self.stride + crop_width * self.BYTES_PER_PIXEL
+        return Frame(self.buffer[offset:end], crop_width, crop_height,
+                     left, top, self.stride)
+
+    def to_qimage(self) -> QImage:
+        """Wrap the buffer as a QImage without copying.
+
+        BGRA in memory is exactly QImage.Format_RGB32 on little-endian
+        machines, so no conversion is needed. The returned image shares this
+        frame's buffer: keep the frame alive for as long as the QImage is
+        used, and copy() it before painting on it.
+        """
+        return QImage(self.buffer, self.width, self.height, self.stride, QImage.Format_RGB32)
+
+    def to_image(self) -> Image.Image:
+        """Convert to a PIL RGB image (the only copy made on this path)."""
+        return Image.frombuffer('RGB', self.size, self.buffer,
+                                'raw', 'BGRX', self.stride, 1)
@@ -1,18 +1,22 @@
 """Screen capture module using mss for fast screenshot capture."""
 
-import mss
-import mss.tools
 from PIL import Image
 from typing import Optional, Tuple
-import ctypes
-from ctypes import wintypes
+
+from .backends import CaptureBackend, create_default_backend
+from .frame import Frame
 
 
 class ScreenCapture:
-    """Fast screen capture using mss library."""
+    """Fast screen capture on top of a pluggable backend (mss by default)."""
+
+    def __init__(self, backend: Optional[CaptureBackend] = None):
+        """Initialize screen capture.
 
-    def __init__(self):
-        self.sct = mss.mss()
+        Args:
+            backend: Capture backend to use (None = configured default)
+        """
+        self.backend = backend or create_default_backend()
 
     def capture_fullscreen(self, monitor: int = 0) -> Image.Image:
         """Capture the entire screen or a specific monitor.
@@ -23,9 +27,7 @@ class ScreenCapture:
         Returns:
             PIL Image of the captured screen
         """
-        monitor_info = self.sct.monitors[monitor]
-        screenshot = self.sct.grab(monitor_info)
-        return Image.frombytes('RGB', screenshot.size, screenshot.bgra, 'raw', 'BGRX')
+        return self.backend.grab_monitor(monitor).to_image()
 
     def capture_region(self, x: int, y: int, width: int, height: int) -> Image.Image:
         """Capture a specific region of the screen.
@@ -40,8 +42,21 @@ class ScreenCapture:
             PIL Image of the captured region
         """
         region = {'left': x, 'top': y, 'width': width, 'height': height}
-        screenshot = self.sct.grab(region)
-        return Image.frombytes('RGB', screenshot.size, screenshot.bgra, 'raw', 'BGRX')
+        return self.backend.grab(region).to_image()
+
+    def grab_frame(self, region: Optional[dict] = None, monitor: int = 0) -> Frame:
+        """Grab raw BGRA pixels without converting to a PIL image.
+
+        Args:
+            region: Dict with left, top, width, height (None = a whole monitor)
+            monitor: Monitor to grab without a region (0 = all monitors combined)
+
+        Returns:
+            Frame wrapping the buffer returned by the backend
+        """
+        if region is None:
+            return self.backend.grab_monitor(monitor)
+        return self.backend.grab(region)
 
     def capture_window(self, hwnd: int) -> Optional[Image.Image]:
         """Capture a specific window by its handle.
@@ -53,18 +68,11 @@ class ScreenCapture:
             PIL Image of the window, or None if window not found
         """
         try:
-            rect = wintypes.RECT()
-            ctypes.windll.user32.GetWindowRect(hwnd, ctypes.byref(rect))
-
-            x = rect.left
-            y = rect.top
-            width = rect.right - rect.left
-            height = rect.bottom - rect.top
-
-            if width <= 0 or height <= 0:
+            rect = self.backend.window_rect(hwnd)
+            if rect is None:
                 return None
 
-            return self.capture_region(x, y, width, height)
+            return self.capture_region(rect['left'], rect['top'], rect['width'], rect['height'])
         except Exception:
             return None
 
@@ -74,7 +82,7 @@ class ScreenCapture:
         Returns:
             List of monitor dictionaries with position and size info
         """
-        return self.sct.monitors[1:]  # Skip the "all monitors" entry
+        return self.backend.monitors()[1:]  # Skip the "all monitors" entry
 
     def get_screen_size(self) -> Tuple[int, int]:
         """Get the total screen size (all monitors combined).
@@ -82,12 +90,12 @@ class ScreenCapture:
         Returns:
             Tuple of (width, height)
         """
-        mon = self.sct.monitors[0]  # Combined monitor
+        mon = self.backend.monitors()[0]  # Combined monitor
         return mon['width'], mon['height']
 
     def close(self):
         """Clean up resources."""
-        self.sct.close()
+        self.backend.close()
 
     def __enter__(self):
         return self
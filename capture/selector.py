@@ -2,12 +2,19 @@
 
 from PyQt5.QtWidgets import QWidget, QApplication, QLabel
 from PyQt5.QtCore import Qt, QRect, QPoint, QTimer, pyqtSignal
-from PyQt5.QtGui import QPainter, QPen, QColor, QCursor, QPolygon, QPainterPath, QFont, QBrush
+from PyQt5.QtGui import (
+    QPainter, QPen, QColor, QCursor, QPolygon, QPainterPath, QFont, QBrush,
+    QFontMetrics, QRegion
+)
 import ctypes
+import time
+from collections import deque
 from ctypes import wintypes
 from typing import Optional, List, Dict
 from .modes import CaptureMode
 from .screen import ScreenCapture
+from .frame import Frame
+from .topology import get_topology
 
 
 # Enable Per-Monitor DPI awareness (Windows 10+)
@@ -21,34 +28,12 @@ except Exception:
 
 
 def get_all_monitors() -> List[Dict]:
-    """Get all monitors using Windows EnumDisplayMonitors API.
+    """Get all monitors from the cached monitor topology.
 
     Returns:
-        List of monitor dictionaries with left, top, width, height
+        List of monitor dictionaries with left, top, width, height, scale
     """
-    monitors = []
-
-    def callback(hMonitor, hdcMonitor, lprcMonitor, dwData):
-        rect = lprcMonitor.contents
-        monitors.append({
-            'left': rect.left,
-            'top': rect.top,
-            'width': rect.right - rect.left,
-            'height': rect.bottom - rect.top,
-            'right': rect.right,
-            'bottom': rect.bottom
-        })
-        return True
-
-    MonitorEnumProc = ctypes.WINFUNCTYPE(
-        ctypes.c_bool,
-        ctypes.c_ulong,
-        ctypes.c_ulong,
-        ctypes.POINTER(wintypes.RECT),
-        ctypes.c_double
-    )
-    ctypes.windll.user32.EnumDisplayMonitors(None, None, MonitorEnumProc(callback), 0)
-    return monitors
+    return get_topology().monitors
 
 
 def get_virtual_screen_bounds() -> Dict:
@@ -57,24 +42,7 @@ def get_virtual_screen_bounds() -> Dict:
     Returns:
         Dictionary with left, top, width, height of virtual screen
     """
-    monitors = get_all_monitors()
-    if not monitors:
-        # Fallback to primary screen
-        return {'left': 0, 'top': 0, 'width': 1920, 'height': 1080}
-
-    min_left = min(m['left'] for m in monitors)
-    min_top = min(m['top'] for m in monitors)
-    max_right = max(m['right'] for m in monitors)
-    max_bottom = max(m['bottom'] for m in monitors)
-
-    return {
-        'left': min_left,
-        'top': min_top,
-        'width': max_right - min_left,
-        'height': max_bottom - min_top,
-        'right': max_right,
-        'bottom': max_bottom
-    }
+    return get_topology().virtual_bounds
 
 
 def find_monitor_at_point(x: int, y: int) -> Optional[Dict]:
@@ -87,12 +55,22 @@ def find_monitor_at_point(x: int, y: int) -> Optional[Dict]:
     Returns:
         Monitor dictionary or None if not found
     """
-    monitors = get_all_monitors()
-    for mon in monitors:
-        if (mon['left'] <= x < mon['right'] and
-            mon['top'] <= y < mon['bottom']):
-            return mon
-    return monitors[0] if monitors else None
+    topology = get_topology()
+    mon = topology.monitor_at(x, y)
+    if mon is not None:
+        return mon
+    return topology.monitors[0] if topology.monitors else None
+
+
+def _window_title(hwnd: int) -> Optional[str]:
+    """Title of a top-level window, or None if it has none (or not on Windows)."""
+    try:
+        length = ctypes.windll.user32.GetWindowTextLengthW(hwnd)
+        buffer = ctypes.create_unicode_buffer(length + 1)
+        ctypes.windll.user32.GetWindowTextW(hwnd, buffer, length + 1)
+    except Exception:
+        return None
+    return buffer.value or None
 
 
 class SelectionOverlay(QWidget):
@@ -102,10 +80,12 @@ class SelectionOverlay(QWidget):
     - Multi-monitor support with proper coordinate handling
     - Modern dark semi-transparent design
     - Clean selection rectangle with subtle styling
+    - Frozen-frame mode: the desktop is grabbed once when the overlay is
+      shown and every selection is cropped from that single buffer
     """
 
     # Signals
-    selection_complete = pyqtSignal(object)  # Emits PIL Image or None
+    selection_complete = pyqtSignal(object)  # Emits Frame, PIL Image or None
     selection_cancelled = pyqtSignal()
 
     # Modern color scheme
@@ -117,20 +97,81 @@ class SelectionOverlay(QWidget):
     TEXT_BG_COLOR = QColor(30, 30, 35, 220)
     WINDOW_HIGHLIGHT_COLOR = QColor(100, 180, 255, 100)
     WINDOW_BORDER_COLOR = QColor(100, 180, 255, 255)
+    WINDOW_BORDER_WIDTH = 3
+    HANDLE_SIZE = 8
 
-    def __init__(self, mode: CaptureMode = CaptureMode.RECTANGULAR, target_monitor: int = None):
+    # Number of recent frames kept for frame_stats()
+    FRAME_STATS_SIZE = 240
+
+    def __init__(self, mode: CaptureMode = CaptureMode.RECTANGULAR, target_monitor: int = None,
+                 frozen: bool = True, screen_capture: Optional[ScreenCapture] = None,
+                 pooled: bool = False):
         """Initialize the selection overlay.
 
         Args:
             mode: The capture mode to use
             target_monitor: Optional monitor index to target (None = all monitors)
+            frozen: Grab the screen once on show and crop selections from it
+                instead of hiding the overlay and grabbing again on release
+            screen_capture: Capture source to use (None = default backend)
+            pooled: Hide instead of closing when a capture ends, so the same
+                overlay can be reset() and shown again for the next capture
         """
         super().__init__()
+        self.frozen = frozen
+        self.pooled = pooled
+        self.frozen_frame: Optional[Frame] = None
+        self.screen_capture = screen_capture or ScreenCapture()
+
+        # Paint timing: (paint duration ms, interval since previous frame ms)
+        self.frame_times = deque(maxlen=self.FRAME_STATS_SIZE)
+        self._last_frame_end: Optional[float] = None
+
+        self._setup_ui()
+        self.reset(mode, target_monitor)
+
+    def _setup_ui(self):
+        """Configure the overlay window (done once per overlay)."""
+        # Window flags for overlay behavior
+        self.setWindowFlags(
+            Qt.FramelessWindowHint |
+            Qt.WindowStaysOnTopHint |
+            Qt.Tool |
+            Qt.X11BypassWindowManagerHint  # Helps on some systems
+        )
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setAttribute(Qt.WA_ShowWithoutActivating, False)
+
+        # Instructions label with modern styling
+        self.instructions = QLabel(self)
+        self.instructions.setStyleSheet("""
+            QLabel {
+                background-color: rgba(26, 26, 30, 230);
+                color: rgba(255, 255, 255, 230);
+                padding: 14px 28px;
+                border-radius: 10px;
+                font-family: 'Segoe UI Variable', 'Segoe UI';
+                font-size: 15px;
+                font-weight: 500;
+                border: 1px solid rgba(45, 127, 249, 60);
+            }
+        """)
+
+        self.indicator_font = QFont("Segoe UI Variable", 11)
+        self.indicator_font.setWeight(QFont.Medium)
+        self._indicator_metrics = QFontMetrics(self.indicator_font)
+
+    def reset(self, mode: CaptureMode = CaptureMode.RECTANGULAR, target_monitor: int = None):
+        """Prepare the overlay for a new capture.
+
+        Args:
+            mode: The capture mode to use
+            target_monitor: Optional monitor index to target (None = all monitors)
+        """
         self.mode = mode
         self.target_monitor_index = target_monitor
-        self.screen_capture = ScreenCapture()
 
-        # Get monitor information
+        # Get monitor information (cached until the display layout changes)
         self.monitors = get_all_monitors()
         self.virtual_bounds = get_virtual_screen_bounds()
 
@@ -143,70 +184,52 @@ class SelectionOverlay(QWidget):
         self.start_point: Optional[QPoint] = None
         self.end_point: Optional[QPoint] = None
         self.freeform_points: List[QPoint] = []
+        self.freeform_path = QPainterPath()
         self.is_selecting = False
         self.selection_rect: Optional[QRect] = None
 
+        # Area covered by the selection decorations at the last repaint
+        self._painted_bounds = QRect()
+        self.frame_times.clear()
+        self._last_frame_end = None
+
         # Window capture state
         self.hovered_window: Optional[int] = None
         self.window_rect: Optional[QRect] = None
-
-        self._setup_ui()
-
-    def _setup_ui(self):
-        """Configure the overlay window for multi-monitor coverage."""
-        # Window flags for overlay behavior
-        self.setWindowFlags(
-            Qt.FramelessWindowHint |
-            Qt.WindowStaysOnTopHint |
-            Qt.Tool |
-            Qt.X11BypassWindowManagerHint  # Helps on some systems
-        )
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setAttribute(Qt.WA_ShowWithoutActivating, False)
+        self.captured_window_title: Optional[str] = None  # Title of the last window captured
 
         # Position and size the overlay to cover the virtual screen (all monitors)
         # or just the target monitor
-        if self.target_monitor:
-            self.setGeometry(
-                self.target_monitor['left'],
-                self.target_monitor['top'],
-                self.target_monitor['width'],
-                self.target_monitor['height']
-            )
-            self.overlay_offset_x = self.target_monitor['left']
-            self.overlay_offset_y = self.target_monitor['top']
-        else:
-            self.setGeometry(
-                self.virtual_bounds['left'],
-                self.virtual_bounds['top'],
-                self.virtual_bounds['width'],
-                self.virtual_bounds['height']
-            )
-            self.overlay_offset_x = self.virtual_bounds['left']
-            self.overlay_offset_y = self.virtual_bounds['top']
+        bounds = self.target_monitor or self.virtual_bounds
+        geometry = QRect(bounds['left'], bounds['top'], bounds['width'], bounds['height'])
+        if self.geometry() != geometry:
+            self.setGeometry(geometry)
+        self.overlay_offset_x = bounds['left']
+        self.overlay_offset_y = bounds['top']
 
         # Set cursor based on mode
         if self.mode in (CaptureMode.RECTANGULAR, CaptureMode.FREEFORM):
             self.setCursor(Qt.CrossCursor)
         elif self.mode == CaptureMode.WINDOW:
             self.setCursor(Qt.PointingHandCursor)
+        else:
+            self.unsetCursor()
 
-        # Instructions label with modern styling
-        self.instructions = QLabel(self)
-        self.instructions.setStyleSheet("""
-            QLabel {
-                background-color: rgba(26, 26, 30, 230);
-                color: rgba(255, 255, 255, 230);
-                padding: 14px 28px;
-                border-radius: 10px;
-                font-family: 'Segoe UI Variable', 'Segoe UI';
-                font-size: 15px;
-                font-weight: 500;
-                border: 1px solid rgba(45, 127, 249, 60);
-            }
-        """)
         self._update_instructions()
 
+    def warm_up(self):
+        """Create the native window up front so the first show is cheap."""
+        self.winId()
+        self.instructions.ensurePolished()
+
+    def _dismiss(self):
+        """End the current capture: hide a pooled overlay, close otherwise."""
+        if self.pooled:
+            self.hide()
+            self.frozen_frame = None
+        else:
+            self.close()
+
     def _update_instructions(self):
         """Update instruction text based on mode."""
         texts = {
@@ -218,6 +241,44 @@ class SelectionOverlay(QWidget):
         self.instructions.setText(texts.get(self.mode, ""))
         self.instructions.adjustSize()
 
+    def setVisible(self, visible: bool):
+        """Freeze the screen before the overlay is first mapped."""
+        if visible and not self.isVisible() and self.frozen:
+            self._freeze_screen()
+        super().setVisible(visible)
+
+    def _freeze_screen(self):
+        """Grab the area under the overlay once, before it is drawn."""
+        bounds = self.target_monitor or self.virtual_bounds
+        try:
+            self.frozen_frame = self.screen_capture.grab_frame({
+                'left': bounds['left'],
+                'top': bounds['top'],
+                'width': bounds['width'],
+                'height': bounds['height']
+            })
+        except Exception as e:
+            print(f"Frozen frame grab failed, falling back to live capture: {e}")
+            self.frozen_frame = None
+
+    def _grab(self, x: int, y: int, width: int, height: int):
+        """Get the pixels of a screen rectangle.
+
+        Crops the frozen frame when one is available; otherwise hides the
+        overlay and grabs the live screen.
+
+        Returns:
+            Frame view of the region (frozen mode) or PIL Image (live mode),
+            or None if it is off-screen
+        """
+        if self.frozen_frame is not None:
+            self.hide()
+            return self.frozen_frame.crop(x, y, width, height)
+
+        self.hide()
+        QApplication.processEvents()
+        return self.screen_capture.capture_region(x, y, width, height)
+
     def showEvent(self, event):
         """Position instructions when shown and ensure proper focus."""
         super().showEvent(event)
@@ -240,31 +301,104 @@ class SelectionOverlay(QWidget):
         self.activateWindow()
         self.setFocus()
 
-        # If fullscreen mode, capture immediately
+        # If fullscreen mode, capture immediately (the frozen frame already
+        # holds the screen, so there is no need to wait for the overlay)
         if self.mode == CaptureMode.FULLSCREEN:
-            QTimer.singleShot(100, self._capture_fullscreen)
+            delay = 0 if self.frozen_frame is not None else 100
+            QTimer.singleShot(delay, self._capture_fullscreen)
 
     def _capture_fullscreen(self):
         """Capture the full screen."""
-        self.hide()
-        QApplication.processEvents()
-
         # Determine which monitor to capture
         monitor_idx = 1  # Default to first monitor in mss (1-indexed)
         if self.target_monitor_index is not None:
             monitor_idx = self.target_monitor_index + 1  # mss is 1-indexed
 
-        image = self.screen_capture.capture_fullscreen(monitor_idx)
-        self.selection_complete.emit(image)
-        self.close()
+        if self.frozen_frame is not None:
+            mon = self.screen_capture.get_monitors()[monitor_idx - 1]
+            image = self._grab(mon['left'], mon['top'], mon['width'], mon['height'])
+        else:
+            self.hide()
+            QApplication.processEvents()
+            image = self.screen_capture.capture_fullscreen(monitor_idx)
+
+        if image:
+            self.selection_complete.emit(image)
+        else:
+            self.selection_cancelled.emit()
+        self._dismiss()
+
+    def frame_stats(self) -> Dict:
+        """Summarize recent repaints to check drag smoothness.
+
+        Returns:
+            Dictionary with frame count, mean/max paint time and mean/max
+            interval between frames in milliseconds
+        """
+        if not self.frame_times:
+            return {'frames': 0, 'paint_ms_mean': 0.0, 'paint_ms_max': 0.0,
+                    'interval_ms_mean': 0.0, 'interval_ms_max': 0.0}
+
+        paint = [p for p, _ in self.frame_times]
+        intervals = [i for _, i in self.frame_times if i is not None] or [0.0]
+        return {
+            'frames': len(paint),
+            'paint_ms_mean': sum(paint) / len(paint),
+            'paint_ms_max': max(paint),
+            'interval_ms_mean': sum(intervals) / len(intervals),
+            'interval_ms_max': max(intervals)
+        }
+
+    def _selection_bounds(self) -> QRect:
+        """Local-coordinate area covered by the current selection decorations.
+
+        Includes the border pen, corner handles, size-indicator pill and the
+        window highlight, so invalidating it repaints everything drawn for
+        the selection.
+        """
+        if self.mode == CaptureMode.RECTANGULAR and self.selection_rect:
+            pad = self.SELECTION_BORDER_WIDTH + 1
+            bounds = self.selection_rect.adjusted(-pad, -pad, pad, pad)
+            indicator = self._size_indicator_geometry(self.selection_rect)
+            if indicator:
+                bounds = bounds.united(indicator[0].adjusted(-1, -1, 1, 1))
+            return bounds
+
+        if self.mode == CaptureMode.FREEFORM and self.freeform_points:
+            pad = self.SELECTION_BORDER_WIDTH + 1
+            return self.freeform_path.boundingRect().toAlignedRect().adjusted(-pad, -pad, pad, pad)
+
+        if self.mode == CaptureMode.WINDOW and self.window_rect:
+            pad = self.WINDOW_BORDER_WIDTH
+            return self._window_local_rect().adjusted(-pad, -pad, pad, pad)
+
+        return QRect()
+
+    def _invalidate_selection(self):
+        """Repaint only the union of the previous and current selection areas."""
+        bounds = self._selection_bounds()
+        region = QRegion(self._painted_bounds).united(QRegion(bounds))
+        self._painted_bounds = bounds
+        if not region.isEmpty():
+            self.update(region)
+
+    def _window_local_rect(self) -> QRect:
+        """Hovered window rectangle in overlay coordinates."""
+        return QRect(
+            self.window_rect.x() - self.overlay_offset_x,
+            self.window_rect.y() - self.overlay_offset_y,
+            self.window_rect.width(),
+            self.window_rect.height()
+        )
 
     def paintEvent(self, event):
         """Draw the overlay and selection indicators with modern styling."""
+        start = time.perf_counter()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
 
-        # Draw semi-transparent dark overlay
-        painter.fillRect(self.rect(), self.OVERLAY_COLOR)
+        # Draw semi-transparent dark overlay (only over the invalidated area)
+        painter.fillRect(event.rect(), self.OVERLAY_COLOR)
 
         # Draw rectangular selection
         if self.mode == CaptureMode.RECTANGULAR and self.selection_rect:
@@ -291,12 +425,10 @@ class SelectionOverlay(QWidget):
             pen = QPen(self.SELECTION_BORDER_COLOR, self.SELECTION_BORDER_WIDTH)
             painter.setPen(pen)
 
-            path = QPainterPath()
-            path.moveTo(self.freeform_points[0])
-            for point in self.freeform_points[1:]:
-                path.lineTo(point)
-
+            # The path is extended point by point as the mouse moves
+            path = self.freeform_path
             if not self.is_selecting and len(self.freeform_points) > 2:
+                path = QPainterPath(path)
                 path.closeSubpath()
                 painter.setBrush(self.SELECTION_FILL_COLOR)
 
@@ -305,19 +437,19 @@ class SelectionOverlay(QWidget):
         # Draw window highlight
         elif self.mode == CaptureMode.WINDOW and self.window_rect:
             # Adjust window rect to local coordinates
-            local_rect = QRect(
-                self.window_rect.x() - self.overlay_offset_x,
-                self.window_rect.y() - self.overlay_offset_y,
-                self.window_rect.width(),
-                self.window_rect.height()
-            )
-            painter.setPen(QPen(self.WINDOW_BORDER_COLOR, 3))
+            painter.setPen(QPen(self.WINDOW_BORDER_COLOR, self.WINDOW_BORDER_WIDTH))
             painter.setBrush(self.WINDOW_HIGHLIGHT_COLOR)
-            painter.drawRect(local_rect)
+            painter.drawRect(self._window_local_rect())
+
+        painter.end()
+        end = time.perf_counter()
+        interval = (end - self._last_frame_end) * 1000 if self._last_frame_end else None
+        self.frame_times.append(((end - start) * 1000, interval))
+        self._last_frame_end = end
 
     def _draw_corner_handles(self, painter: QPainter, rect: QRect):
         """Draw corner handles on the selection rectangle."""
-        handle_size = 8
+        handle_size = self.HANDLE_SIZE
         handle_color = self.SELECTION_BORDER_COLOR
 
         painter.setPen(Qt.NoPen)
@@ -334,39 +466,51 @@ class SelectionOverlay(QWidget):
         for x, y in corners:
             painter.drawRoundedRect(x, y, handle_size, handle_size, 2, 2)
 
-    def _draw_size_indicator(self, painter: QPainter, rect: QRect):
-        """Draw a size indicator showing selection dimensions."""
+    def _size_indicator_geometry(self, rect: QRect):
+        """Lay out the size indicator for a selection.
+
+        Returns:
+            Tuple of (background pill rect, text x, text baseline y, text),
+            or None if the selection is too small to show it
+        """
         width = rect.width()
         height = rect.height()
 
         if width < 50 or height < 30:
-            return  # Too small to show indicator
+            return None  # Too small to show indicator
 
         size_text = f"{width} x {height}"
 
-        font = QFont("Segoe UI Variable", 11)
-        font.setWeight(QFont.Medium)
-        painter.setFont(font)
-
         # Position at bottom of selection
-        text_rect = painter.fontMetrics().boundingRect(size_text)
+        text_rect = self._indicator_metrics.boundingRect(size_text)
         text_x = rect.center().x() - text_rect.width() // 2
         text_y = rect.bottom() + 25
 
-        # Draw background pill
         bg_rect = QRect(
             text_x - 10,
             text_y - text_rect.height() - 4,
             text_rect.width() + 20,
             text_rect.height() + 8
         )
+        return bg_rect, text_x, text_y - 4, size_text
+
+    def _draw_size_indicator(self, painter: QPainter, rect: QRect):
+        """Draw a size indicator showing selection dimensions."""
+        geometry = self._size_indicator_geometry(rect)
+        if geometry is None:
+            return
+        bg_rect, text_x, text_y, size_text = geometry
+
+        painter.setFont(self.indicator_font)
+
+        # Draw background pill
         painter.setPen(Qt.NoPen)
         painter.setBrush(self.TEXT_BG_COLOR)
         painter.drawRoundedRect(bg_rect, 4, 4)
 
         # Draw text
         painter.setPen(self.TEXT_COLOR)
-        painter.drawText(text_x, text_y - 4, size_text)
+        painter.drawText(text_x, text_y, size_text)
 
     def mousePressEvent(self, event):
         """Handle mouse press for selection start."""
@@ -376,9 +520,12 @@ class SelectionOverlay(QWidget):
 
             if self.mode == CaptureMode.RECTANGULAR:
                 self.selection_rect = QRect(self.start_point, self.start_point)
-                self.update()
+                self._invalidate_selection()
             elif self.mode == CaptureMode.FREEFORM:
                 self.freeform_points = [self.start_point]
+                self.freeform_path = QPainterPath()
+                self.freeform_path.moveTo(self.start_point)
+                self._invalidate_selection()
             elif self.mode == CaptureMode.WINDOW:
                 self._capture_window_at_cursor()
 
@@ -387,11 +534,18 @@ class SelectionOverlay(QWidget):
         if self.mode == CaptureMode.RECTANGULAR and self.is_selecting:
             self.end_point = event.pos()
             self.selection_rect = QRect(self.start_point, self.end_point).normalized()
-            self.update()
+            self._invalidate_selection()
 
         elif self.mode == CaptureMode.FREEFORM and self.is_selecting:
-            self.freeform_points.append(event.pos())
-            self.update()
+            # Only the new segment needs repainting while drawing
+            previous = self.freeform_points[-1]
+            point = event.pos()
+            self.freeform_points.append(point)
+            self.freeform_path.lineTo(point)
+            pad = self.SELECTION_BORDER_WIDTH + 1
+            segment = QRect(previous, point).normalized().adjusted(-pad, -pad, pad, pad)
+            self._painted_bounds = self._painted_bounds.united(segment)
+            self.update(segment)
 
         elif self.mode == CaptureMode.WINDOW:
             self._update_hovered_window()
@@ -411,7 +565,7 @@ class SelectionOverlay(QWidget):
         """Handle keyboard input."""
         if event.key() == Qt.Key_Escape:
             self.selection_cancelled.emit()
-            self.close()
+            self._dismiss()
 
     def _local_to_screen(self, local_point: QPoint) -> QPoint:
         """Convert local overlay coordinates to screen coordinates."""
@@ -424,33 +578,31 @@ class SelectionOverlay(QWidget):
         """Capture the rectangular selection."""
         if not self.start_point or not self.end_point:
             self.selection_cancelled.emit()
-            self.close()
+            self._dismiss()
             return
 
         rect = QRect(self.start_point, self.end_point).normalized()
         if rect.width() < 5 or rect.height() < 5:
             self.selection_cancelled.emit()
-            self.close()
+            self._dismiss()
             return
 
         # Convert to screen coordinates
         screen_x = rect.x() + self.overlay_offset_x
         screen_y = rect.y() + self.overlay_offset_y
 
-        self.hide()
-        QApplication.processEvents()
-
-        image = self.screen_capture.capture_region(
-            screen_x, screen_y, rect.width(), rect.height()
-        )
-        self.selection_complete.emit(image)
-        self.close()
+        image = self._grab(screen_x, screen_y, rect.width(), rect.height())
+        if image:
+            self.selection_complete.emit(image)
+        else:
+            self.selection_cancelled.emit()
+        self._dismiss()
 
     def _capture_freeform(self):
         """Capture the freeform selection."""
         if len(self.freeform_points) < 3:
             self.selection_cancelled.emit()
-            self.close()
+            self._dismiss()
             return
 
         # Get bounding rect of freeform selection
@@ -459,24 +611,23 @@ class SelectionOverlay(QWidget):
 
         if rect.width() < 5 or rect.height() < 5:
             self.selection_cancelled.emit()
-            self.close()
+            self._dismiss()
             return
 
         # Convert to screen coordinates
         screen_x = rect.x() + self.overlay_offset_x
         screen_y = rect.y() + self.overlay_offset_y
 
-        self.hide()
-        QApplication.processEvents()
-
         # Capture bounding rectangle
-        image = self.screen_capture.capture_region(
-            screen_x, screen_y, rect.width(), rect.height()
-        )
+        image = self._grab(screen_x, screen_y, rect.width(), rect.height())
+        if image is None:
+            self.selection_cancelled.emit()
+            self._dismiss()
+            return
 
         # Create mask from polygon (offset to local coordinates)
         from PIL import Image, ImageDraw
-        mask = Image.new('L', (rect.width(), rect.height()), 0)
+        mask = Image.new('L', image.size, 0)
         draw = ImageDraw.Draw(mask)
 
         # Convert points to local coordinates within the bounding rect
@@ -484,11 +635,13 @@ class SelectionOverlay(QWidget):
         draw.polygon(local_points, fill=255)
 
         # Apply mask - create RGBA image
+        if isinstance(image, Frame):
+            image = image.to_image()
         image = image.convert('RGBA')
         image.putalpha(mask)
 
         self.selection_complete.emit(image)
-        self.close()
+        self._dismiss()
 
     def _update_hovered_window(self):
         """Update the currently hovered window."""
@@ -509,27 +662,35 @@ class SelectionOverlay(QWidget):
                 rect.right - rect.left,
                 rect.bottom - rect.top
             )
-            self.update()
+            self._invalidate_selection()
 
     def _capture_window_at_cursor(self):
         """Capture the window under the cursor."""
         if not self.hovered_window or not self.window_rect:
             self.selection_cancelled.emit()
-            self.close()
+            self._dismiss()
             return
 
-        self.hide()
-        QApplication.processEvents()
+        if self.frozen_frame is not None:
+            image = self._grab(
+                self.window_rect.x(), self.window_rect.y(),
+                self.window_rect.width(), self.window_rect.height()
+            )
+        else:
+            self.hide()
+            QApplication.processEvents()
+            image = self.screen_capture.capture_window(self.hovered_window)
 
-        image = self.screen_capture.capture_window(self.hovered_window)
         if image:
+            self.captured_window_title = _window_title(self.hovered_window)
             self.selection_complete.emit(image)
         else:
             self.selection_cancelled.emit()
-        self.close()
+        self._dismiss()
 
     def closeEvent(self, event):
         """Clean up resources."""
+        self.frozen_frame = None
         try:
             self.screen_capture.close()
         except Exception:
@@ -561,6 +722,7 @@ def get_monitor_info() -> List[Dict]:
         - index: Monitor index (0-based)
         - left, top: Position
         - width, height: Dimensions
+        - scale: DPI scale factor (1.0 = 100%)
         - is_primary: Whether this is likely the primary monitor (at 0,0)
     """
     monitors = get_all_monitors()
@@ -573,6 +735,7 @@ def get_monitor_info() -> List[Dict]:
             'top': mon['top'],
             'width': mon['width'],
             'height': mon['height'],
+            'scale': mon['scale'],
             'is_primary': mon['left'] == 0 and mon['top'] == 0
         })
 
@@ -0,0 +1,201 @@
+"""Cached monitor topology with display-change invalidation."""
+
+import ctypes
+from bisect import bisect_right
+from ctypes import wintypes
+from typing import Dict, List, Optional, Tuple
+
+from .backends import CaptureBackend, create_default_backend
+
+
+def _enumerate_windows_monitors() -> List[Dict]:
+    """Enumerate monitors and their DPI scale with EnumDisplayMonitors.
+
+    Raises:
+        AttributeError: When not running on Windows
+    """
+    monitors = []
+
+    def callback(hMonitor, hdcMonitor, lprcMonitor, dwData):
+        rect = lprcMonitor.contents
+        scale = 1.0
+        try:
+            dpi_x = ctypes.c_uint()
+            dpi_y = ctypes.c_uint()
+            # MDT_EFFECTIVE_DPI = 0; 96 DPI is 100% scaling
+            ctypes.windll.shcore.GetDpiForMonitor(
+                hMonitor, 0, ctypes.byref(dpi_x), ctypes.byref(dpi_y))
+            scale = dpi_x.value / 96.0 if dpi_x.value else 1.0
+        except Exception:
+            pass
+
+        monitors.append({
+            'left': rect.left,
+            'top': rect.top,
+            'width': rect.right - rect.left,
+            'height': rect.bottom - rect.top,
+            'right': rect.right,
+            'bottom': rect.bottom,
+            'scale': scale
+        })
+        return True
+
+    MonitorEnumProc = ctypes.WINFUNCTYPE(
+        ctypes.c_bool,
+        wintypes.HMONITOR,
+        wintypes.HDC,
+        ctypes.POINTER(wintypes.RECT),
+        wintypes.LPARAM
+    )
+    ctypes.windll.user32.EnumDisplayMonitors(None, None, MonitorEnumProc(callback), 0)
+    return monitors
+
+
+class MonitorTopology:
+    """Monitor layout computed once and reused until the displays change.
+
+    Holds every monitor's rectangle and DPI scale factor, the virtual screen
+    bounds, and a grid index over monitor edges so point-to-monitor lookups
+    are two binary searches instead of an OS call plus a linear scan.
+    """
+
+    def __init__(self, backend: Optional[CaptureBackend] = None):
+        """Initialize an empty (lazily computed) topology.
+
+        Args:
+            backend: Capture backend to enumerate from when the Windows API
+                is unavailable (None = configured default backend)
+        """
+        self._backend = backend
+        self._monitors: Optional[List[Dict]] = None
+        self._virtual_bounds: Optional[Dict] = None
+        self._xs: List[int] = []
+        self._ys: List[int] = []
+        self._cells: Dict[Tuple[int, int], int] = {}
+        self._watched_screens = set()
+        self._watching_app = False
+
+    def invalidate(self, *args):
+        """Drop the cached layout; it is recomputed on next access."""
+        self._monitors = None
+        self._virtual_bounds = None
+
+    def _enumerate(self) -> List[Dict]:
+        """Ask the OS (or the capture backend) for the monitor layout."""
+        try:
+            monitors = _enumerate_windows_monitors()
+            if monitors:
+                return monitors
+        except (AttributeError, OSError):
+            pass
+
+        backend = self._backend or create_default_backend()
+        try:
+            return [{
+                'left': mon['left'],
+                'top': mon['top'],
+                'width': mon['width'],
+                'height': mon['height'],
+                'right': mon['left'] + mon['width'],
+                'bottom': mon['top'] + mon['height'],
+                'scale': mon.get('scale', 1.0)
+            } for mon in backend.monitors()[1:]]
+        finally:
+            if self._backend is None:
+                backend.close()
+
+    def _ensure(self):
+        """Compute the layout and lookup index if they are not cached."""
+        if self._monitors is not None:
+            return
+
+        self._watch_display_changes()
+        monitors = self._enumerate()
+        self._monitors = monitors
+
+        if monitors:
+            min_left = min(m['left'] for m in monitors)
+            min_top = min(m['top'] for m in monitors)
+            max_right = max(m['right'] for m in monitors)
+            max_bottom = max(m['bottom'] for m in monitors)
+            self._virtual_bounds = {
+                'left': min_left,
+                'top': min_top,
+                'width': max_right - min_left,
+                'height': max_bottom - min_top,
+                'right': max_right,
+                'bottom': max_bottom
+            }
+        else:
+            self._virtual_bounds = {'left': 0, 'top': 0, 'width': 1920, 'height': 1080}
+
+        # Grid index: every distinct monitor edge splits the desktop into
+        # cells, and each cell belongs to at most one monitor
+        self._xs = sorted({m['left'] for m in monitors} | {m['right'] for m in monitors})
+        self._ys = sorted({m['top'] for m in monitors} | {m['bottom'] for m in monitors})
+        self._cells = {}
+        for index, mon in enumerate(monitors):
+            for ix in range(self._xs.index(mon['left']), self._xs.index(mon['right'])):
+                for iy in range(self._ys.index(mon['top']), self._ys.index(mon['bottom'])):
+                    self._cells.setdefault((ix, iy), index)
+
+    def _watch_display_changes(self):
+        """Invalidate on Qt screen add/remove/geometry/DPI change signals."""
+        from PyQt5.QtGui import QGuiApplication
+
+        app = QGuiApplication.instance()
+        if app is None:
+            return
+
+        if not self._watching_app:
+            app.screenAdded.connect(self.invalidate)
+            app.screenRemoved.connect(self.invalidate)
+            app.primaryScreenChanged.connect(self.invalidate)
+            self._watching_app = True
+
+        for screen in app.screens():
+            if id(screen) in self._watched_screens:
+                continue
+            screen.geometryChanged.connect(self.invalidate)
+            screen.logicalDotsPerInchChanged.connect(self.invalidate)
+            self._watched_screens.add(id(screen))
+
+    @property
+    def monitors(self) -> List[Dict]:
+        """All monitors with left, top, width, height, right, bottom, scale."""
+        self._ensure()
+        return self._monitors
+
+    @property
+    def virtual_bounds(self) -> Dict:
+        """Bounding rectangle of all monitors combined."""
+        self._ensure()
+        return self._virtual_bounds
+
+    def index_at(self, x: int, y: int) -> Optional[int]:
+        """Index of the monitor containing a point, or None."""
+        self._ensure()
+        ix = bisect_right(self._xs, x) - 1
+        iy = bisect_right(self._ys, y) - 1
+        return self._cells.get((ix, iy))
+
+    def monitor_at(self, x: int, y: int) -> Optional[Dict]:
+        """Monitor containing a point, or None if the point is off-screen."""
+        index = self.index_at(x, y)
+        return self._monitors[index] if index is not None else None
+
+    def scale_at(self, x: int, y: int) -> float:
+        """DPI scale factor of the monitor under a point (1.0 off-screen)."""
+        mon = self.monitor_at(x, y)
+        return mon['scale'] if mon else 1.0
+
+
+_topology: Optional[MonitorTopology] = None
+
+
+def get_topology() -> MonitorTopology:
+    """Get the shared, process-wide monitor topology."""
+    global _topology
+    if _topology is None:
+        _topology = MonitorTopology()
+    return _topology
@@ -0,0 +1,467 @@
+"""
+BretClip command line.
+
+Commands that work on saved captures without starting the tray app, or
+drive the running instance over its local socket:
+
+    python bretclip.py capture [--mode MODE] [--region X,Y,W,H] [--monitor N]
+                               [--delay S] [--format NAME] [--output PATH|-]
+                               [--count N] [--interval S]
+    python bretclip.py similar IMAGE [--distance 10] [--limit 20] [--scan]
+    python bretclip.py trigger [--mode MODE] [--region X,Y,W,H] [--monitor N]
+                               [--delay S] [--output PATH] [--format NAME]
+    python bretclip.py status | show | quit
+"""
+
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Modes understood by the running instance (capture.modes.CaptureMode)
+CAPTURE_MODES = ('rectangular', 'freeform', 'window', 'fullscreen')
+
+# Modes `capture` can do without the overlay
+HEADLESS_MODES = ('fullscreen', 'region', 'window')
+
+# Exit status when no BretClip instance is running
+NOT_RUNNING = 3
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def _similar(args) -> int:
+    from library import ScreenshotLibrary, get_library
+
+    if args.database:
+        library = ScreenshotLibrary(args.database)
+    else:
+        library = get_library()
+    try:
+        if args.scan:
+            added, removed = library.scan(args.folder)
+            hashed = library.backfill_hashes()
+            print(f"Scanned: {added} added, {removed} removed, {hashed} hashed", file=sys.stderr)
+        try:
+            matches = library.similar(args.image, args.distance, args.limit or None)
+        except OSError as e:
+            print(f"Cannot read {args.image}: {e}", file=sys.stderr)
+            return 1
+    finally:
+        library.close()
+
+    for record, distance in matches:
+        when = datetime.fromtimestamp(record.captured_at).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"{distance:3d}  {when}  {record.path}")
+    return 0 if matches else 2
+
+
+def _region(text: str) -> List[int]:
+    """Parse an X,Y,W,H region argument."""
+    try:
+        values = [int(value) for value in text.split(',')]
+    except ValueError:
+        values = []
+    if len(values) != 4 or values[2] <= 0 or values[3] <= 0:
+        raise argparse.ArgumentTypeError(f"expected X,Y,WIDTH,HEIGHT, got {text!r}")
+    return values
+
+
+def _resolutions(text: str) -> List[Tuple[int, int]]:
+    """Parse a WxH[,WxH...] list of monitor sizes."""
+    try:
+        sizes = [tuple(int(value) for value in size.lower().split('x')) for size in text.split(',')]
+    except ValueError:
+        sizes = []
+    if not sizes or any(len(size) != 2 or min(size) <= 0 for size in sizes):
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT[,WIDTHxHEIGHT...], got {text!r}")
+    return sizes
+
+
+def _positive_int(text: str) -> int:
+    """Parse a count that must be at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"expected a whole number of at least 1, got {text!r}")
+    return value
+
+
+def _foreground_window() -> int:
+    """Handle of the window in front (Windows only)."""
+    import ctypes
+    try:
+        return ctypes.windll.user32.GetForegroundWindow()
+    except AttributeError:
+        raise ValueError("there is no foreground window to find here; pass --window HWND")
+
+
+class _CaptureTarget:
+    """What `capture` grabs, resolved against the backend's monitors."""
+
+    def __init__(self, screen, args):
+        self.screen = screen
+        mode = args.mode or ('region' if args.region else 'window' if args.window else 'fullscreen')
+        monitors = screen.backend.monitors()
+        self.monitor = args.monitor or 0
+        if not 0 <= self.monitor < len(monitors):
+            raise ValueError(f"no monitor {self.monitor} (have {len(monitors) - 1})")
+
+        self.region = None
+        self.window = None
+        if mode == 'region':
+            if not args.region:
+                raise ValueError("region mode needs --region X,Y,W,H")
+            left, top, width, height = args.region
+            if args.monitor:
+                # Relative to the chosen monitor
+                left += monitors[self.monitor]['left']
+                top += monitors[self.monitor]['top']
+            self.region = {'left': left, 'top': top, 'width': width, 'height': height}
+        elif mode == 'window':
+            self.window = args.window if args.window is not None else _foreground_window()
+
+    def grab(self):
+        """Grab one frame; a window is looked up again each time it moves."""
+        region = self.region
+        if self.window is not None:
+            region = self.screen.backend.window_rect(self.window)
+            if region is None:
+                raise ValueError(f"window {self.window:#x} not found")
+        return self.screen.grab_frame(region, self.monitor)
+
+
+def _capture(args) -> int:
+    from capture.backends import SyntheticBackend
+    from capture.screen import ScreenCapture
+    from storage.formats import AUTOSAVE_FORMAT, format_for_path, get_format
+
+    to_stdout = args.output == '-'
+    try:
+        if args.format:
+            output_format = get_format(args.format)
+        elif args.output and not to_stdout and not os.path.isdir(args.output):
+            # Unknown extensions are left to Pillow, like "Save As"
+            output_format = format_for_path(args.output)
+        else:
+            output_format = get_format(AUTOSAVE_FORMAT)
+        screen = ScreenCapture(SyntheticBackend(args.synthetic) if args.synthetic else None)
+        target = _CaptureTarget(screen, args)
+    except ValueError as e:
+        print(f"bretclip capture: {e}", file=sys.stderr)
+        return 1
+
+    if args.delay > 0:
+        time.sleep(args.delay)
+
+    sink = _StdoutSink(output_format, args) if to_stdout else _FileSink(output_format, args)
+    count = 0
+    start = time.perf_counter()
+    due = start
+    try:
+        while args.count == 0 or count < args.count:
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            # Captures start every --interval seconds, without bursting to catch up
+            due = max(due + args.interval, time.perf_counter())
+            sink.put(target.grab(), count)
+            count += 1
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        sink.failed = True  # The reader went away; nothing more to report
+    except (OSError, ValueError) as e:
+        print(f"bretclip capture: {e}", file=sys.stderr)
+        sink.failed = True
+    finally:
+        screen.close()
+    ok = sink.close()
+
+    if count > 1:
+        elapsed = time.perf_counter() - start
+        print(f"{count} captures in {elapsed:.2f} s ({count / elapsed:.1f}/s)", file=sys.stderr)
+    return 0 if ok else 1
+
+
+class _FileSink:
+    """Saves captures through the SaveService, printing each path once written.
+
+    Paths are printed in capture order even when a later capture finishes
+    encoding first.
+    """
+
+    def __init__(self, output_format, args):
+        from PyQt5.QtCore import Qt
+        from storage.profiles import AUTOSAVE_PROFILE
+        from storage.saver import SaveService
+
+        self.output = args.output
+        self.output_format = output_format
+        self.options = output_format.save_options(args.effort, args.quality) if output_format else {}
+        self.profile = args.profile or AUTOSAVE_PROFILE
+        self.failed = False
+        self._lock = threading.Lock()
+        self._finished: Dict[int, Optional[str]] = {}  # capture number -> path (None = failed)
+        self._printed = 0
+        # A short queue: a loop outrunning the encoders waits instead of
+        # piling up frames in memory
+        self.service = SaveService(workers=args.workers, max_pending=args.workers * 2)
+        # No event loop here; the slots run on the save workers
+        self.service.saved.connect(self._on_saved, Qt.DirectConnection)
+        self.service.failed.connect(self._on_failed, Qt.DirectConnection)
+
+    def _path(self, number: int) -> Tuple[str, bool]:
+        """Destination for a capture, and whether it is a reserved placeholder."""
+        from storage.naming import allocate_path
+
+        extension = self.output_format.extension if self.output_format else '.png'
+        if self.output is None or os.path.isdir(self.output):
+            return allocate_path(self.output, extension=extension), True
+        # "{n}" numbers the files of a loop; otherwise each capture replaces the last
+        try:
+            return os.path.abspath(self.output.format(n=number)), False
+        except (IndexError, KeyError, ValueError):
+            raise ValueError(f"bad output pattern {self.output!r}; only {{n}} may be used")
+
+    def put(self, frame, number: int):
+        path, reserved = self._path(number)
+        self.service.submit(frame.to_image, path, tag=str(number), reserved=reserved,
+                            format=self.output_format.pil_format if self.output_format else None,
+                            profile=self.profile, **self.options)
+
+    def _on_saved(self, path: str, tag: str):
+        self._finish(int(tag), path)
+
+    def _on_failed(self, path: str, tag: str, error: str):
+        # SaveService has already logged it
+        self.failed = True
+        self._finish(int(tag), None)
+
+    def _finish(self, number: int, path: Optional[str]):
+        with self._lock:
+            self._finished[number] = path
+            while self._printed in self._finished:
+                path = self._finished.pop(self._printed)
+                if path is not None:
+                    print(path, flush=True)
+                self._printed += 1
+
+    def close(self) -> bool:
+        self.service.shutdown(wait=True)
+        return not self.failed
+
+
+class _StdoutSink:
+    """Encodes captures on a thread pool and writes them to stdout in order.
+
+    Several PNGs back to back are a valid stream for readers such as
+    ``ffmpeg -f image2pipe``.
+    """
+
+    def __init__(self, output_format, args):
+        from concurrent.futures import ThreadPoolExecutor
+        from storage.profiles import AUTOSAVE_PROFILE
+
+        self.output_format = output_format
+        self.options = output_format.save_options(args.effort, args.quality)
+        self.profile = args.profile or AUTOSAVE_PROFILE
+        self.failed = False
+        self.workers = args.workers
+        self.executor = ThreadPoolExecutor(args.workers, thread_name_prefix="BretClipEncode")
+        self.pending = deque()
+        self.stream = sys.stdout.buffer
+
+    def _encode(self, frame) -> bytes:
+        from storage.saver import encode_image
+
+        buffer = io.BytesIO()
+        encode_image(frame.to_image(), buffer, self.output_format.pil_format,
+                     self.profile, **self.options)
+        return buffer.getvalue()
+
+    def put(self, frame, number: int):
+        self.pending.append(self.executor.submit(self._encode, frame))
+        while len(self.pending) > self.workers * 2:
+            self._write(self.pending.popleft().result())
+
+    def _write(self, data: bytes):
+        self.stream.write(data)
+        self.stream.flush()
+
+    def close(self) -> bool:
+        try:
+            while self.pending and not self.failed:
+                self._write(self.pending.popleft().result())
+        except BrokenPipeError:
+            self.failed = True
+        except Exception as e:
+            print(f"bretclip capture: {e}", file=sys.stderr)
+            self.failed = True
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        return not self.failed
+
+
+def _send(message: Dict, timeout: float = 10.0) -> Optional[Dict]:
+    """Send a command to the running instance; None (reported) if there is none."""
+    from system.instance import send_command
+
+    try:
+        reply = send_command(message, timeout)
+    except (OSError, ValueError) as e:
+        print(f"BretClip did not answer: {e}", file=sys.stderr)
+        return {'ok': False}
+    if reply is None:
+        print("BretClip is not running", file=sys.stderr)
+    elif not reply.get('ok'):
+        print(f"BretClip: {reply.get('error', 'command failed')}", file=sys.stderr)
+    return reply
+
+
+def _trigger(args) -> int:
+    message = {'command': 'capture'}
+    if args.mode:
+        message['mode'] = args.mode
+    if args.region:
+        message['region'] = args.region
+    if args.monitor is not None:
+        message['monitor'] = args.monitor
+    if args.delay:
+        message['delay'] = args.delay
+    if args.output:
+        # The instance has its own working directory
+        message['output'] = os.path.abspath(args.output)
+    if args.format:
+        message['format'] = args.format
+
+    reply = _send(message, timeout=args.delay + args.timeout)
+    if reply is None:
+        return NOT_RUNNING
+    if not reply.get('ok'):
+        return 1
+    if 'path' in reply:
+        print(reply['path'])
+    return 0
+
+
+def _status(args) -> int:
+    from system.instance import send_command  # noqa: F401 - keep the import out of the timing
+
+    start = time.perf_counter()
+    reply = _send({'command': 'ping'})
+    if reply is None:
+        return NOT_RUNNING
+    if not reply.get('ok'):
+        return 1
+    print(f"BretClip is running (pid {reply['pid']}), "
+          f"round trip {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+def _simple_command(args) -> int:
+    reply = _send({'command': args.command})
+    if reply is None:
+        return NOT_RUNNING
+    return 0 if reply.get('ok') else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bretclip", description="BretClip screen capture tool")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+
+    capture = commands.add_parser(
+        "capture", help="take a screenshot without any UI",
+        description="Grab the screen without the overlay or editor and save it. Prints "
+                    "each saved path, or streams the image(s) to stdout with --output -.")
+    capture.add_argument("-m", "--mode", choices=HEADLESS_MODES,
+                         help="what to grab (default: region with --region, window with "
+                              "--window, otherwise fullscreen)")
+    capture.add_argument("-r", "--region", type=_region, metavar="X,Y,W,H",
+                         help="rectangle of the virtual desktop (of --monitor, if given)")
+    capture.add_argument("--monitor", type=int, default=None,
+                         help="monitor index, 1+ (default: 0 = all monitors)")
+    capture.add_argument("--window", type=lambda text: int(text, 0), metavar="HWND",
+                         help="window handle for window mode (default: the foreground window)")
+    capture.add_argument("-d", "--delay", type=float, default=0.0,
+                         help="seconds to wait before the first capture")
+    capture.add_argument("-f", "--format", help="png, webp-lossless, webp or avif "
+                                                "(default: from --output, else png)")
+    capture.add_argument("-o", "--output", metavar="PATH",
+                         help="file, folder or '-' for stdout (default: the screenshots "
+                              "folder); use {n} in a file name to number looped captures")
+    capture.add_argument("-n", "--count", type=int, default=1,
+                         help="number of captures, 0 = until interrupted (default: 1)")
+    capture.add_argument("-i", "--interval", type=float, default=0.0,
+                         help="seconds between the start of consecutive captures")
+    capture.add_argument("--profile", choices=("fast", "balanced", "smallest"),
+                         help="PNG encoding profile (default: fast)")
+    capture.add_argument("--quality", type=int, default=None, help="0-100, lossy formats")
+    capture.add_argument("--effort", type=int, default=None, help="0-100, WebP and AVIF")
+    capture.add_argument("--workers", type=_positive_int, default=2, help="encoder threads (default: 2)")
+    capture.add_argument("--synthetic", type=_resolutions, nargs='?', const=[(1920, 1080)],
+                         metavar="WxH[,WxH...]",
+                         help="grab a generated virtual desktop instead of the screen (for tests)")
+    capture.set_defaults(handler=_capture)
+
+    similar = commands.add_parser(
+        "similar", help="find saved captures that look like an image",
+        description="Search the capture library by example, closest first. "
+                    "Exits with status 2 when nothing is within the distance.")
+    similar.add_argument("image", help="image file to search by (may itself be a capture)")
+    similar.add_argument("-d", "--distance", type=int, default=10,
+                         help="maximum perceptual-hash distance in bits, 0-64 (default: 10)")
+    similar.add_argument("-n", "--limit", type=int, default=20,
+                         help="maximum results, 0 for all (default: 20)")
+    similar.add_argument("--scan", action="store_true",
+                         help="bring the library up to date with the folder first")
+    similar.add_argument("--folder", default=None,
+                         help="captures folder to scan (default: the screenshots folder)")
+    similar.add_argument("--database", default=None,
+                         help="library database to use (default: the per-user library)")
+    similar.set_defaults(handler=_similar)
+
+    trigger = commands.add_parser(
+        "trigger", help="ask the running BretClip to capture",
+        description="Start a capture in the running instance. Without --region, --monitor "
+                    "or --output this is the hotkey (or the tray menu entry for --mode). "
+                    "With them the screen is grabbed without the overlay; with --output the "
+                    "saved path is printed once the file is written. Exits with status "
+                    f"{NOT_RUNNING} if BretClip is not running.")
+    trigger.add_argument("-m", "--mode", choices=CAPTURE_MODES, help="capture mode")
+    trigger.add_argument("-r", "--region", type=_region, metavar="X,Y,W,H",
+                         help="capture this rectangle of the virtual desktop")
+    trigger.add_argument("--monitor", type=int, default=None,
+                         help="capture a whole monitor (1+; 0 = all monitors)")
+    trigger.add_argument("-d", "--delay", type=float, default=0.0, help="seconds to wait first")
+    trigger.add_argument("-o", "--output", help="save the capture to this file")
+    trigger.add_argument("-f", "--format", help="output format (default: from the file extension)")
+    trigger.add_argument("--timeout", type=float, default=30.0,
+                         help="seconds to wait for the capture after the delay (default: 30)")
+    trigger.set_defaults(handler=_trigger)
+
+    status = commands.add_parser("status", help="check whether BretClip is running")
+    status.set_defaults(handler=_status)
+    show = commands.add_parser("show", help="show the running BretClip's editor")
+    show.set_defaults(handler=_simple_command)
+    close = commands.add_parser("quit", help="quit the running BretClip")
+    close.set_defaults(handler=_simple_command, command="exit")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a command line; returns the process exit status."""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,13 @@
-from .window import EditorWindow
 from .canvas import DrawingCanvas
 from .tools import AnnotationTool
 
 __all__ = ['EditorWindow', 'DrawingCanvas', 'AnnotationTool']
+
+
+def __getattr__(name):
+    # EditorWindow pulls in the tray/hotkey/clipboard integrations; import it
+    # lazily so the canvas and headless renderer work without a desktop
+    if name == 'EditorWindow':
+        from .window import EditorWindow
+        return EditorWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
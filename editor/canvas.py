@@ -1,16 +1,25 @@
 """Drawing canvas for image annotation."""
 
 from PyQt5.QtWidgets import QWidget, QInputDialog
-from PyQt5.QtCore import Qt, QPoint, QRect, pyqtSignal
+from PyQt5.QtCore import Qt, QPoint, QRect, QSize, pyqtSignal
 from PyQt5.QtGui import (
     QPainter, QPen, QColor, QPixmap, QImage,
-    QPainterPath, QFont, QBrush
+    QBrush
 )
 from PIL import Image
-from typing import Optional, List
-import io
+from typing import Optional, List, Union
+import math
+import time
+import os
+import sys
 
-from .tools import ToolType, AnnotationTool, Annotation, AnnotationHistory
+from .tools import ToolType, AnnotationTool, Annotation, AnnotationHistory, HistoryEntry
+from .scheduler import FrameScheduler
+from .renderer import composite, draw_annotation, qimage_to_pil, render_layer
+from .spatial import AnnotationIndex, annotation_bounds
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from capture.frame import Frame
 
 
 class DrawingCanvas(QWidget):
@@ -23,8 +32,8 @@ class DrawingCanvas(QWidget):
         self.setMinimumSize(400, 300)
 
         # Image state
-        self.original_image: Optional[QPixmap] = None
-        self.display_image: Optional[QPixmap] = None
+        self.original_image: Optional[QImage] = None
+        self._image_source = None  # Keeps the buffer behind original_image alive
         self.scale_factor: float = 1.0
         self.offset: QPoint = QPoint(0, 0)
 
@@ -32,6 +41,32 @@ class DrawingCanvas(QWidget):
         self.annotations: List[Annotation] = []
         self.current_annotation: Optional[Annotation] = None
         self.history = AnnotationHistory()
+        self.index = AnnotationIndex()
+
+        # Select/move state; the annotation being dragged is left out of the
+        # baked layer and drawn live at drag_offset until it is dropped
+        self.selected_annotation: Optional[Annotation] = None
+        self.drag_origin: Optional[QPoint] = None
+        self.drag_offset = QPoint(0, 0)
+        self._hidden_annotation: Optional[Annotation] = None
+
+        # Screen area the in-progress annotation covered at the last repaint
+        self._live_rect = QRect()
+
+        # Mouse samples received since the last frame; applied in one batch
+        # by the frame scheduler so high-rate input repaints once per frame
+        self._pending_input: List[QPoint] = []
+        self.scheduler = FrameScheduler(self._apply_pending_input, parent=self)
+
+        # Committed annotations baked at image resolution; rebuilt only when
+        # the annotation list changes, so repaints cost only the live stroke
+        self.annotation_layer: Optional[QImage] = None
+
+        # Image and annotation layer pre-scaled to the current view, keyed by
+        # (scale_factor, widget width, widget height)
+        self._view_cache_key = None
+        self._scaled_image: Optional[QPixmap] = None
+        self._scaled_layer: Optional[QImage] = None
 
         # Current tool
         self.current_tool = AnnotationTool(ToolType.PEN, QColor(255, 0, 0), 3)
@@ -43,23 +78,37 @@ class DrawingCanvas(QWidget):
         self.setMouseTracking(True)
         self.setFocusPolicy(Qt.StrongFocus)
 
-    def set_image(self, image: Image.Image):
-        """Set the image to display and annotate."""
-        # Convert PIL Image to QPixmap
-        if image.mode == 'RGBA':
-            data = image.tobytes('raw', 'RGBA')
-            qimage = QImage(data, image.width, image.height, QImage.Format_RGBA8888)
+    def set_image(self, image: Union[Frame, Image.Image]):
+        """Set the image to display and annotate.
+
+        A Frame is wrapped in place as a QImage with no copy; a PIL Image is
+        converted once. The original is never painted on.
+        """
+        if isinstance(image, Frame):
+            qimage = image.to_qimage()
+            source = image
+        elif image.mode == 'RGBA':
+            source = image.tobytes('raw', 'RGBA')
+            qimage = QImage(source, image.width, image.height, QImage.Format_RGBA8888)
         else:
             image = image.convert('RGB')
-            data = image.tobytes('raw', 'RGB')
-            qimage = QImage(data, image.width, image.height, QImage.Format_RGB888)
+            source = image.tobytes('raw', 'RGB')
+            qimage = QImage(source, image.width, image.height, image.width * 3, QImage.Format_RGB888)
 
-        self.original_image = QPixmap.fromImage(qimage)
-        self.display_image = self.original_image.copy()
+        self.original_image = qimage
+        self._image_source = source
+        self.annotation_layer = None
+        self._view_cache_key = None
+        self._scaled_layer = None
 
         # Clear annotations
         self.annotations = []
         self.history.clear()
+        self.index.rebuild(self.annotations)
+        self.selected_annotation = None
+        self._hidden_annotation = None
+        self._pending_input = []
+        self.scheduler.cancel()
 
         self._fit_to_window()
         self.update()
@@ -85,6 +134,39 @@ class DrawingCanvas(QWidget):
             int((widget_size.height() - scaled_height) / 2)
         )
 
+        key = (self.scale_factor, widget_size.width(), widget_size.height())
+        if key != self._view_cache_key:
+            self._view_cache_key = key
+            self._rebuild_view_cache()
+
+    def _scaled_size(self) -> QSize:
+        """Size of the image as displayed at the current scale."""
+        return self.original_image.size() * self.scale_factor
+
+    def _rebuild_view_cache(self):
+        """Pre-scale the image (smoothly, once) for interactive repaints."""
+        size = self._scaled_size()
+        if size.isEmpty():
+            self._scaled_image = None
+            self._scaled_layer = None
+            return
+
+        if size == self.original_image.size():
+            scaled = self.original_image
+        else:
+            scaled = self.original_image.scaled(size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        self._scaled_image = QPixmap.fromImage(scaled)
+        self._rebuild_scaled_layer()
+
+    def _rebuild_scaled_layer(self):
+        """Re-draw committed annotations at display resolution."""
+        if self._scaled_image is None or not self.annotations:
+            self._scaled_layer = None
+            return
+
+        self._scaled_layer = render_layer(self._scaled_image.size(), self.annotations,
+                                          self.scale_factor, skip=self._hidden_annotation)
+
     def _screen_to_image(self, pos: QPoint) -> QPoint:
         """Convert screen coordinates to image coordinates."""
         return QPoint(
@@ -102,15 +184,36 @@ class DrawingCanvas(QWidget):
     def set_tool(self, tool: AnnotationTool):
         """Set the current drawing tool."""
         self.current_tool = tool
+        if tool.tool_type != ToolType.SELECT:
+            self._select(None)
+            self.unsetCursor()
+
+    def set_frame_rate(self, rate: int):
+        """Set the repaint rate for live drawing (60, 120 or 144 Hz)."""
+        self.scheduler.set_rate(rate)
+
+    def frame_stats(self) -> dict:
+        """Samples-per-frame and paint-time summary for latency tuning."""
+        return self.scheduler.stats()
 
     def paintEvent(self, event):
         """Draw the canvas with image and annotations."""
+        start = time.perf_counter()
+        self._paint(event)
+        self.scheduler.record_paint((time.perf_counter() - start) * 1000)
+
+    def _paint(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         painter.setRenderHint(QPainter.SmoothPixmapTransform)
 
+        # Only the invalidated area is repainted; everything below is
+        # restricted to it
+        dirty = event.rect()
+        painter.setClipRect(dirty)
+
         # Background
-        painter.fillRect(self.rect(), QColor(45, 45, 45))
+        painter.fillRect(dirty, QColor(45, 45, 45))
 
         if not self.original_image:
             # Draw placeholder
@@ -118,102 +221,180 @@ class DrawingCanvas(QWidget):
             painter.drawText(self.rect(), Qt.AlignCenter, "No image captured")
             return
 
-        # Draw scaled image
-        scaled_size = self.original_image.size() * self.scale_factor
-        target_rect = QRect(self.offset, scaled_size.toSize())
-        painter.drawPixmap(target_rect, self.original_image)
+        # Draw the pre-scaled image and committed annotations unscaled;
+        # fall back to scaling on the fly until the view cache exists
+        if self._scaled_image is not None:
+            source = dirty.translated(-self.offset).intersected(self._scaled_image.rect())
+            if not source.isEmpty():
+                target = source.translated(self.offset)
+                painter.drawPixmap(target, self._scaled_image, source)
+                if self._scaled_layer is not None:
+                    painter.drawImage(target, self._scaled_layer, source)
+        else:
+            target_rect = QRect(self.offset, self._scaled_size())
+            painter.drawImage(target_rect, self.original_image)
+            if self.annotation_layer is not None:
+                painter.drawImage(target_rect, self.annotation_layer)
+
+        # Draw the annotation in progress
+        if self.current_annotation:
+            painter.save()
+            painter.translate(self.offset)
+            painter.scale(self.scale_factor, self.scale_factor)
+            draw_annotation(painter, self.current_annotation)
+            painter.restore()
+
+        # Draw the annotation being dragged and the selection outline
+        if self.selected_annotation is not None:
+            if self._hidden_annotation is not None:
+                painter.save()
+                painter.translate(self.offset)
+                painter.scale(self.scale_factor, self.scale_factor)
+                painter.translate(self.drag_offset)
+                draw_annotation(painter, self._hidden_annotation)
+                painter.restore()
+
+            outline = self._selection_rect()
+            painter.setBrush(Qt.NoBrush)
+            painter.setPen(QPen(QColor(0, 120, 215), 1, Qt.DashLine))
+            painter.drawRect(outline)
+
+    def _rebuild_annotation_layer(self):
+        """Re-bake all committed annotations into the cached layer."""
+        if not self.original_image or not self.annotations:
+            self.annotation_layer = None
+            self._rebuild_scaled_layer()
+            return
 
-        # Draw annotations
-        painter.save()
-        painter.translate(self.offset)
-        painter.scale(self.scale_factor, self.scale_factor)
+        self.annotation_layer = render_layer(self.original_image.size(), self.annotations,
+                                             skip=self._hidden_annotation)
+        self._rebuild_scaled_layer()
 
-        for annotation in self.annotations + ([self.current_annotation] if self.current_annotation else []):
-            self._draw_annotation(painter, annotation)
+    def _bake_annotation(self, annotation: Annotation):
+        """Add one newly committed annotation to the cached layer."""
+        if self.annotation_layer is None:
+            self._rebuild_annotation_layer()
+            return
 
-        painter.restore()
+        painter = QPainter(self.annotation_layer)
+        painter.setRenderHint(QPainter.Antialiasing)
+        draw_annotation(painter, annotation)
+        painter.end()
 
-    def _draw_annotation(self, painter: QPainter, annotation: Annotation):
-        """Draw a single annotation."""
-        if not annotation or not annotation.points:
+        if self._scaled_layer is None:
+            self._rebuild_scaled_layer()
             return
 
-        tool = annotation.tool
+        painter = QPainter(self._scaled_layer)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.scale(self.scale_factor, self.scale_factor)
+        draw_annotation(painter, annotation)
+        painter.end()
+
+    def _rebake_region(self, region: QRect):
+        """Re-draw the cached layers inside an image-space rectangle only.
 
-        # Set pen properties
-        pen = QPen(tool.color)
-        pen.setWidth(tool.size)
-        pen.setCapStyle(Qt.RoundCap)
-        pen.setJoinStyle(Qt.RoundJoin)
+        Clears the area and repaints just the annotations the spatial index
+        reports there, so erasing, moving or undoing one annotation does not
+        cost a full re-bake.
+        """
+        if self.annotation_layer is None or region.isEmpty():
+            self._rebuild_annotation_layer()
+            return
 
-        if tool.tool_type == ToolType.HIGHLIGHTER:
-            color = QColor(tool.color)
-            color.setAlphaF(tool.opacity)
-            pen.setColor(color)
+        scaled = QRect()
+        if self._scaled_layer is not None:
+            # The view area is rounded out, so it covers image pixels beyond
+            # region; widen region to everything that can paint into it (one
+            # view pixel of antialiasing included) so neighbours are redrawn
+            scaled = self._image_rect_to_view(region).translated(-self.offset)
+            scaled = scaled.intersected(self._scaled_layer.rect())
+            region = region.united(self._view_rect_to_image(scaled.adjusted(-1, -1, 1, 1)))
+
+        region = region.intersected(self.annotation_layer.rect())
+        if region.isEmpty():
+            return
+        affected = [a for a in self.index.query(region) if a is not self._hidden_annotation]
 
-        painter.setPen(pen)
+        painter = QPainter(self.annotation_layer)
+        painter.setCompositionMode(QPainter.CompositionMode_Clear)
+        painter.fillRect(region, Qt.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        painter.setClipRect(region)
+        painter.setRenderHint(QPainter.Antialiasing)
+        for annotation in affected:
+            draw_annotation(painter, annotation)
+        painter.end()
 
-        if tool.tool_type in (ToolType.PEN, ToolType.HIGHLIGHTER, ToolType.ERASER):
-            # Freehand drawing
-            if len(annotation.points) > 1:
-                path = QPainterPath()
-                path.moveTo(annotation.points[0])
-                for point in annotation.points[1:]:
-                    path.lineTo(point)
-                painter.drawPath(path)
-            elif len(annotation.points) == 1:
-                painter.drawPoint(annotation.points[0])
-
-        elif tool.tool_type == ToolType.RECTANGLE:
-            if len(annotation.points) >= 2:
-                rect = QRect(annotation.points[0], annotation.points[-1]).normalized()
-                painter.setBrush(Qt.NoBrush)
-                painter.drawRect(rect)
-
-        elif tool.tool_type == ToolType.CIRCLE:
-            if len(annotation.points) >= 2:
-                rect = QRect(annotation.points[0], annotation.points[-1]).normalized()
-                painter.setBrush(Qt.NoBrush)
-                painter.drawEllipse(rect)
-
-        elif tool.tool_type == ToolType.ARROW:
-            if len(annotation.points) >= 2:
-                start = annotation.points[0]
-                end = annotation.points[-1]
-
-                # Draw line
-                painter.drawLine(start, end)
-
-                # Draw arrowhead
-                import math
-                angle = math.atan2(end.y() - start.y(), end.x() - start.x())
-                arrow_size = tool.size * 4
-
-                p1 = QPoint(
-                    int(end.x() - arrow_size * math.cos(angle - math.pi / 6)),
-                    int(end.y() - arrow_size * math.sin(angle - math.pi / 6))
-                )
-                p2 = QPoint(
-                    int(end.x() - arrow_size * math.cos(angle + math.pi / 6)),
-                    int(end.y() - arrow_size * math.sin(angle + math.pi / 6))
-                )
+        if self._scaled_layer is None:
+            self._rebuild_scaled_layer()
+            return
+        if scaled.isEmpty():
+            return
 
-                painter.drawLine(end, p1)
-                painter.drawLine(end, p2)
+        painter = QPainter(self._scaled_layer)
+        painter.setCompositionMode(QPainter.CompositionMode_Clear)
+        painter.fillRect(scaled, Qt.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        painter.setClipRect(scaled)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.scale(self.scale_factor, self.scale_factor)
+        for annotation in affected:
+            draw_annotation(painter, annotation)
+        painter.end()
 
-        elif tool.tool_type == ToolType.TEXT:
-            if annotation.points and annotation.text:
-                font = QFont("Arial", tool.size * 4)
-                painter.setFont(font)
-                painter.drawText(annotation.points[0], annotation.text)
+    def _view_rect_to_image(self, rect: QRect) -> QRect:
+        """Image rectangle covering a rectangle of the scaled view (offset removed)."""
+        scale = self.scale_factor
+        left = math.floor(rect.left() / scale)
+        top = math.floor(rect.top() / scale)
+        right = math.ceil((rect.right() + 1) / scale)
+        bottom = math.ceil((rect.bottom() + 1) / scale)
+        return QRect(left, top, right - left, bottom - top)
+
+    def _image_rect_to_view(self, rect: QRect) -> QRect:
+        """Widget rectangle covering an image-space rectangle (rounded out)."""
+        if rect.isEmpty():
+            return QRect()
+        scale = self.scale_factor
+        left = int(rect.left() * scale) - 1
+        top = int(rect.top() * scale) - 1
+        right = int((rect.right() + 1) * scale) + 2
+        bottom = int((rect.bottom() + 1) * scale) + 2
+        return QRect(left, top, right - left, bottom - top).translated(self.offset)
+
+    def _refresh_region(self, region: QRect):
+        """Re-bake and repaint an image-space area after annotations changed."""
+        self._rebake_region(region)
+        self.update(self._image_rect_to_view(region))
+
+    def _update_live(self, rect: QRect):
+        """Repaint the in-progress annotation's old and new screen areas."""
+        self.update(self._live_rect.united(rect))
+        self._live_rect = rect
 
     def mousePressEvent(self, event):
         """Handle mouse press for drawing."""
         if event.button() == Qt.LeftButton and self.original_image:
-            self.is_drawing = True
             pos = self._screen_to_image(event.pos())
             self.last_point = pos
 
+            if self.current_tool.tool_type == ToolType.SELECT:
+                self._select(self.index.topmost_at(pos, self._hit_tolerance()))
+                if self.selected_annotation is not None:
+                    self.drag_origin = pos
+                    self.drag_offset = QPoint(0, 0)
+                return
+
+            if self.current_tool.tool_type == ToolType.ERASER:
+                self.is_drawing = True
+                # Everything one drag erases is undone with a single Ctrl+Z
+                self.history.begin_group()
+                self._erase_along([pos])
+                return
+
+            self.is_drawing = True
+
             # Handle text tool differently
             if self.current_tool.tool_type == ToolType.TEXT:
                 text, ok = QInputDialog.getText(self, "Add Text", "Enter text:")
@@ -228,10 +409,8 @@ class DrawingCanvas(QWidget):
                         points=[pos],
                         text=text
                     )
-                    self.annotations.append(self.current_annotation)
-                    self.history.add_state(self.annotations)
+                    self._commit_annotation(self.current_annotation)
                     self.current_annotation = None
-                    self.image_modified.emit()
                 self.is_drawing = False
             else:
                 self.current_annotation = Annotation(
@@ -243,39 +422,216 @@ class DrawingCanvas(QWidget):
                     ),
                     points=[pos]
                 )
-
-            self.update()
+                self._live_rect = QRect()
+                self._update_live(self._image_rect_to_view(annotation_bounds(self.current_annotation)))
 
     def mouseMoveEvent(self, event):
         """Handle mouse move for drawing."""
-        if self.is_drawing and self.current_annotation and self.original_image:
+        if not self.original_image:
+            return
+
+        if self.current_tool.tool_type == ToolType.SELECT:
             pos = self._screen_to_image(event.pos())
+            if self.drag_origin is not None:
+                self._pending_input.append(pos)
+                self.scheduler.request()
+            elif self.index.topmost_at(pos, self._hit_tolerance()) is not None:
+                self.setCursor(Qt.SizeAllCursor)
+            else:
+                self.unsetCursor()
+            return
 
-            if self.current_tool.tool_type in (ToolType.PEN, ToolType.HIGHLIGHTER, ToolType.ERASER):
-                # Add point to path
-                self.current_annotation.points.append(pos)
+        if self.is_drawing and (self.current_annotation or self.current_tool.tool_type == ToolType.ERASER):
+            self._pending_input.append(self._screen_to_image(event.pos()))
+            self.scheduler.request()
+
+    def _apply_pending_input(self):
+        """Apply the samples batched since the last frame and invalidate once."""
+        samples = self._pending_input
+        if not samples:
+            return
+        self._pending_input = []
+
+        if self.drag_origin is not None:
+            # Only the latest position matters for a drag
+            self._drag_to(samples[-1])
+            return
+
+        if self.current_tool.tool_type == ToolType.ERASER:
+            # Erase along the whole path since the last frame in one pass
+            self._erase_along([self.last_point] + samples)
+            self.last_point = samples[-1]
+            return
+
+        annotation = self.current_annotation
+        if annotation is None:
+            return
+
+        if annotation.tool.tool_type in (ToolType.PEN, ToolType.HIGHLIGHTER):
+            # Add points to the path; only the new segments need repainting
+            points = annotation.points
+            dirty = QRect()
+            previous = points[-1]
+            for pos in samples:
+                if points.append(pos):
+                    dirty = dirty.united(QRect(previous, pos).normalized())
+                    previous = pos
+            if not dirty.isNull():
+                pad = annotation.tool.size // 2 + 2
+                self.update(self._image_rect_to_view(dirty.adjusted(-pad, -pad, pad, pad)))
+        else:
+            # For shapes, just update end point
+            pos = samples[-1]
+            if len(annotation.points) > 1:
+                annotation.points[-1] = pos
             else:
-                # For shapes, just update end point
-                if len(self.current_annotation.points) > 1:
-                    self.current_annotation.points[-1] = pos
-                else:
-                    self.current_annotation.points.append(pos)
+                annotation.points.append(pos)
+            self._update_live(self._image_rect_to_view(annotation_bounds(annotation)))
 
-            self.last_point = pos
-            self.update()
+        self.last_point = samples[-1]
 
     def mouseReleaseEvent(self, event):
         """Handle mouse release to finish drawing."""
-        if event.button() == Qt.LeftButton and self.is_drawing:
-            self.is_drawing = False
+        if event.button() != Qt.LeftButton:
+            return
+
+        # Apply samples still waiting for the next frame before finishing
+        self.scheduler.flush_now()
 
-            if self.current_annotation and len(self.current_annotation.points) > 0:
-                self.annotations.append(self.current_annotation)
-                self.history.add_state(self.annotations)
-                self.image_modified.emit()
+        if self.drag_origin is not None:
+            self._drop_selection()
+            return
+
+        if self.is_drawing:
+            self.is_drawing = False
+            self.history.end_group()
 
+            finished = self.current_annotation
             self.current_annotation = None
-            self.update()
+            self._live_rect = QRect()
+            if finished and len(finished.points) > 0:
+                self._commit_annotation(finished)
+
+    def keyPressEvent(self, event):
+        """Delete the selected annotation with Delete/Backspace."""
+        if event.key() in (Qt.Key_Delete, Qt.Key_Backspace) and self.selected_annotation is not None:
+            self._remove_annotations([self.selected_annotation])
+            self._select(None)
+            return
+        super().keyPressEvent(event)
+
+    def _commit_annotation(self, annotation: Annotation):
+        """Add a finished annotation on top of the others."""
+        self.history.record_add(len(self.annotations), annotation)
+        self.annotations.append(annotation)
+        self.index.insert(annotation)
+        self._bake_annotation(annotation)
+        self.update(self._image_rect_to_view(annotation_bounds(annotation)))
+        self.image_modified.emit()
+
+    def _hit_tolerance(self) -> float:
+        """Pick tolerance in image pixels (about 4 screen pixels)."""
+        return 4 / self.scale_factor if self.scale_factor else 4
+
+    def _remove_annotations(self, doomed: List[Annotation]):
+        """Remove annotations, recording each removal in the history.
+
+        Removals made during an eraser drag are grouped into one undo step.
+        """
+        if not doomed:
+            return
+
+        region = QRect()
+        for annotation in doomed:
+            index = self.annotations.index(annotation)
+            del self.annotations[index]
+            region = region.united(self.index.bounds(annotation) or annotation_bounds(annotation))
+            self.index.remove(annotation)
+            self.history.record_remove(index, annotation)
+
+        self._refresh_region(region)
+        self.image_modified.emit()
+
+    def _erase_along(self, path: List[QPoint]):
+        """Erase every annotation the eraser touches along a polyline.
+
+        The eraser is a disc of the tool size; fast drags are sampled every
+        radius so no annotation slips through the gap between mouse events.
+        Everything the path touches is removed, re-baked and repainted once.
+        """
+        radius = max(self.current_tool.size / 2, self._hit_tolerance())
+
+        doomed = []
+        for start, end in zip(path, path[1:] or path):
+            dx = end.x() - start.x()
+            dy = end.y() - start.y()
+            steps = max(1, int(max(abs(dx), abs(dy)) / max(radius, 1)))
+            for i in range(steps + 1):
+                probe = QPoint(start.x() + dx * i // steps, start.y() + dy * i // steps)
+                for annotation in self.index.hits(probe, radius):
+                    if annotation not in doomed:
+                        doomed.append(annotation)
+
+        if self.selected_annotation in doomed:
+            self._select(None)
+        self._remove_annotations(doomed)
+
+    def _select(self, annotation: Optional[Annotation]):
+        """Change the selected annotation and repaint the outline."""
+        if annotation is self.selected_annotation:
+            return
+        if self.selected_annotation is not None:
+            self.update(self._selection_rect())
+        self.selected_annotation = annotation
+        self.drag_origin = None
+        self.drag_offset = QPoint(0, 0)
+        if annotation is not None:
+            self.update(self._selection_rect())
+
+    def _selection_rect(self) -> QRect:
+        """Screen rectangle outlining the selected annotation."""
+        bounds = annotation_bounds(self.selected_annotation).translated(self.drag_offset)
+        return self._image_rect_to_view(bounds).adjusted(-2, -2, 2, 2)
+
+    def _drag_to(self, pos: QPoint):
+        """Move the selected annotation with the mouse."""
+        offset = pos - self.drag_origin
+        if offset == self.drag_offset:
+            return
+
+        if self._hidden_annotation is None:
+            # Lift the annotation out of the baked layer for the drag
+            self._hidden_annotation = self.selected_annotation
+            self._rebake_region(annotation_bounds(self.selected_annotation))
+
+        before = self._selection_rect()
+        self.drag_offset = offset
+        self.update(before.united(self._selection_rect()))
+
+    def _drop_selection(self):
+        """Finish a drag, committing the move as one undoable edit."""
+        previous = self.selected_annotation
+        offset = self.drag_offset
+        self.drag_origin = None
+        self.drag_offset = QPoint(0, 0)
+        self._hidden_annotation = None
+
+        if previous is None or offset.isNull():
+            if previous is not None:
+                self.update(self._selection_rect())
+            return
+
+        moved = previous.translated(offset.x(), offset.y())
+        index = self.annotations.index(previous)
+        self.annotations[index] = moved
+        self.index.replace(previous, moved)
+        self.history.record_modify(index, previous, moved)
+        self.selected_annotation = moved
+
+        region = annotation_bounds(previous).united(annotation_bounds(moved))
+        self._refresh_region(region.adjusted(-4, -4, 4, 4))
+        self.update(self._selection_rect())
+        self.image_modified.emit()
 
     def resizeEvent(self, event):
         """Handle resize to refit image."""
@@ -284,50 +640,93 @@ class DrawingCanvas(QWidget):
 
     def undo(self):
         """Undo last annotation."""
-        state = self.history.undo()
-        if state is not None:
-            self.annotations = list(state)
+        entry = self.history.undo(self.annotations)
+        if entry is not None:
+            self._history_applied(entry, undone=True)
             self.image_modified.emit()
-            self.update()
 
     def redo(self):
         """Redo last undone annotation."""
-        state = self.history.redo()
-        if state is not None:
-            self.annotations = list(state)
+        entry = self.history.redo(self.annotations)
+        if entry is not None:
+            self._history_applied(entry)
             self.image_modified.emit()
+
+    def _history_applied(self, entry: Optional[HistoryEntry] = None, undone: bool = False):
+        """Resync the index, selection and layers after the list changed.
+
+        Only the annotations an entry touched are re-indexed, and only their
+        bounds are re-baked and repainted; clearing (or no entry) refreshes
+        everything.
+        """
+        if entry is None or entry.action == 'clear':
+            self.index.rebuild(self.annotations)
+        else:
+            self._reindex(entry, undone)
+        if self.selected_annotation not in self.index:
+            self._select(None)
+
+        if entry is None or entry.action == 'clear':
+            self._rebuild_annotation_layer()
             self.update()
+            return
+
+        self._refresh_region(self._entry_region(entry).adjusted(-4, -4, 4, 4))
+        if self.selected_annotation is not None:
+            self.update(self._selection_rect())
+
+    def _reindex(self, entry: HistoryEntry, undone: bool):
+        """Apply the change a history entry made (or reverted) to the index."""
+        if entry.action == 'group':
+            for part in (reversed(entry.entries) if undone else entry.entries):
+                self._reindex(part, undone)
+        elif entry.action == 'modify':
+            if undone:
+                self.index.replace(entry.annotation, entry.previous)
+            else:
+                self.index.replace(entry.previous, entry.annotation)
+        elif (entry.action == 'add') != undone:
+            self.index.insert(entry.annotation)
+        else:
+            self.index.remove(entry.annotation)
+
+    @classmethod
+    def _entry_region(cls, entry: HistoryEntry) -> QRect:
+        """Image-space area covered by the annotations a history entry changed."""
+        if entry.action == 'group':
+            region = QRect()
+            for part in entry.entries:
+                region = region.united(cls._entry_region(part))
+            return region
+        region = annotation_bounds(entry.annotation)
+        if entry.previous is not None:
+            region = region.united(annotation_bounds(entry.previous))
+        return region
 
     def clear_annotations(self):
         """Clear all annotations."""
         if self.annotations:
+            self.history.record_clear(self.annotations)
             self.annotations = []
-            self.history.add_state(self.annotations)
+            self._history_applied()
             self.image_modified.emit()
-            self.update()
+
+    def get_final_qimage(self) -> Optional[QImage]:
+        """Get a standalone copy of the image with annotations baked in.
+
+        The copy does not share the capture buffer, so it can be handed to
+        another thread (e.g. for background encoding).
+        """
+        if not self.original_image:
+            return None
+        # Paint annotations on a copy; the original may share a capture buffer
+        return composite(self.original_image, self.annotation_layer)
 
     def get_final_image(self) -> Optional[Image.Image]:
         """Get the image with annotations baked in."""
         if not self.original_image:
             return None
 
-        # Create a pixmap with annotations
-        result = self.original_image.copy()
-        painter = QPainter(result)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        for annotation in self.annotations:
-            self._draw_annotation(painter, annotation)
-
-        painter.end()
-
-        # Convert to PIL Image
-        qimage = result.toImage()
-        buffer = qimage.bits().asstring(qimage.sizeInBytes())
-
-        if qimage.format() == QImage.Format_RGBA8888:
-            return Image.frombytes('RGBA', (qimage.width(), qimage.height()), buffer, 'raw', 'RGBA')
-        else:
-            qimage = qimage.convertToFormat(QImage.Format_RGB888)
-            buffer = qimage.bits().asstring(qimage.sizeInBytes())
-            return Image.frombytes('RGB', (qimage.width(), qimage.height()), buffer, 'raw', 'RGB')
+        if self.annotation_layer is None:
+            return qimage_to_pil(self.original_image)
+        return qimage_to_pil(self.get_final_qimage())
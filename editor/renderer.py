@@ -0,0 +1,290 @@
+"""Headless annotation rendering.
+
+Everything needed to draw annotations onto an image lives here, apart from
+the DrawingCanvas widget, so annotated images can be produced without a
+window (batch export, tests, the offscreen Qt platform).
+"""
+
+import json
+import math
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from PIL import Image
+from PyQt5.QtCore import QPoint, QRect, QSize, Qt
+from PyQt5.QtGui import QColor, QGuiApplication, QImage, QPainter, QPen
+
+from .spatial import arrow_head_size, text_font
+from .tools import Annotation, AnnotationTool, StrokePoints, ToolType
+
+_gui_app = None
+
+
+def ensure_gui_application():
+    """Make sure a QGuiApplication exists so QPainter and fonts work.
+
+    Reuses a running application (e.g. the editor's QApplication). When
+    there is none and no display is available on Linux, the ``offscreen``
+    platform is selected so rendering works on a headless box.
+    """
+    global _gui_app
+    app = QGuiApplication.instance()
+    if app is not None:
+        return app
+
+    if sys.platform.startswith('linux') and not (
+            os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    _gui_app = QGuiApplication(sys.argv[:1])
+    return _gui_app
+
+
+def draw_annotation(painter: QPainter, annotation: Annotation):
+    """Draw a single annotation with the painter's current transform."""
+    if not annotation or not annotation.points:
+        return
+
+    tool = annotation.tool
+
+    # Set pen properties
+    pen = QPen(tool.color)
+    pen.setWidth(tool.size)
+    pen.setCapStyle(Qt.RoundCap)
+    pen.setJoinStyle(Qt.RoundJoin)
+
+    if tool.tool_type == ToolType.HIGHLIGHTER:
+        color = QColor(tool.color)
+        color.setAlphaF(tool.opacity)
+        pen.setColor(color)
+
+    painter.setPen(pen)
+
+    if tool.tool_type in (ToolType.PEN, ToolType.HIGHLIGHTER, ToolType.ERASER):
+        # Freehand drawing
+        if len(annotation.points) > 1:
+            painter.drawPolyline(annotation.points.polygon())
+        elif len(annotation.points) == 1:
+            painter.drawPoint(annotation.points[0])
+
+    elif tool.tool_type == ToolType.RECTANGLE:
+        if len(annotation.points) >= 2:
+            rect = QRect(annotation.points[0], annotation.points[-1]).normalized()
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(rect)
+
+    elif tool.tool_type == ToolType.CIRCLE:
+        if len(annotation.points) >= 2:
+            rect = QRect(annotation.points[0], annotation.points[-1]).normalized()
+            painter.setBrush(Qt.NoBrush)
+            painter.drawEllipse(rect)
+
+    elif tool.tool_type == ToolType.ARROW:
+        if len(annotation.points) >= 2:
+            start = annotation.points[0]
+            end = annotation.points[-1]
+
+            # Draw line
+            painter.drawLine(start, end)
+
+            # Draw arrowhead
+            angle = math.atan2(end.y() - start.y(), end.x() - start.x())
+            arrow_size = arrow_head_size(annotation)
+
+            p1 = QPoint(
+                int(end.x() - arrow_size * math.cos(angle - math.pi / 6)),
+                int(end.y() - arrow_size * math.sin(angle - math.pi / 6))
+            )
+            p2 = QPoint(
+                int(end.x() - arrow_size * math.cos(angle + math.pi / 6)),
+                int(end.y() - arrow_size * math.sin(angle + math.pi / 6))
+            )
+
+            painter.drawLine(end, p1)
+            painter.drawLine(end, p2)
+
+    elif tool.tool_type == ToolType.TEXT:
+        if annotation.points and annotation.text:
+            painter.setFont(text_font(annotation))
+            painter.drawText(annotation.points[0], annotation.text)
+
+
+def render_layer(size: QSize, annotations: Iterable[Annotation], scale: float = 1.0,
+                 skip: Optional[Annotation] = None) -> QImage:
+    """Draw annotations onto a transparent layer.
+
+    Args:
+        size: Layer size in pixels
+        annotations: Annotations in image coordinates, bottom to top
+        scale: Factor from image coordinates to layer pixels
+        skip: Annotation to leave out (e.g. one being dragged)
+
+    Returns:
+        ARGB32_Premultiplied layer
+    """
+    layer = QImage(size, QImage.Format_ARGB32_Premultiplied)
+    layer.fill(Qt.transparent)
+    painter = QPainter(layer)
+    painter.setRenderHint(QPainter.Antialiasing)
+    if scale != 1.0:
+        painter.scale(scale, scale)
+    for annotation in annotations:
+        if annotation is not skip:
+            draw_annotation(painter, annotation)
+    painter.end()
+    return layer
+
+
+def composite(image: QImage, layer: Optional[QImage]) -> QImage:
+    """Return a copy of image with an annotation layer painted over it.
+
+    The input is never modified; it may wrap a capture buffer.
+    """
+    result = image.copy()
+    if layer is not None:
+        painter = QPainter(result)
+        painter.drawImage(0, 0, layer)
+        painter.end()
+    return result
+
+
+# QImage formats whose memory layout PIL can decode directly:
+# format -> (PIL mode, raw mode). 32-bit RGB formats are stored as B, G, R, A
+# bytes on little-endian machines.
+_PIL_LAYOUTS = {
+    QImage.Format_RGB32: ('RGB', 'BGRX'),
+    QImage.Format_ARGB32: ('RGBA', 'BGRA'),
+    QImage.Format_RGBA8888: ('RGBA', 'RGBA'),
+    QImage.Format_RGBX8888: ('RGB', 'RGBX'),
+    QImage.Format_RGB888: ('RGB', 'RGB'),
+    QImage.Format_Grayscale8: ('L', 'L'),
+}
+
+
+def qimage_to_pil(qimage: QImage) -> Image.Image:
+    """Convert a QImage to a PIL image with a single pixel copy.
+
+    The QImage's buffer is read in place through the buffer protocol, using
+    its real bytes-per-line so padded rows (odd widths in 24-bit formats)
+    decode correctly. Formats PIL cannot read directly are converted once
+    first, and that temporary is released as soon as PIL has its copy.
+
+    Args:
+        qimage: Image to convert (not modified)
+
+    Returns:
+        PIL image in RGB, RGBA or L mode
+    """
+    if sys.byteorder == 'little' and qimage.format() in _PIL_LAYOUTS:
+        source = qimage
+    elif qimage.hasAlphaChannel():
+        source = qimage.convertToFormat(QImage.Format_RGBA8888)
+    else:
+        source = qimage.convertToFormat(QImage.Format_RGB888)
+
+    mode, raw_mode = _PIL_LAYOUTS[source.format()]
+    bits = source.constBits()
+    bits.setsize(source.sizeInBytes())
+    view = memoryview(bits)
+    try:
+        return Image.frombytes(mode, (source.width(), source.height()), view,
+                               'raw', raw_mode, source.bytesPerLine(), 1)
+    finally:
+        view.release()
+
+
+def render(image: QImage, annotations: Iterable[Annotation]) -> QImage:
+    """Composite annotations onto a copy of an image, offscreen.
+
+    Args:
+        image: Source image (left untouched)
+        annotations: Annotations in image coordinates, bottom to top
+
+    Returns:
+        New QImage with the annotations drawn in
+    """
+    ensure_gui_application()
+    if image.format() in (QImage.Format_Indexed8, QImage.Format_Mono, QImage.Format_MonoLSB):
+        # QPainter cannot draw on palette images
+        result = image.convertToFormat(QImage.Format_ARGB32)
+    else:
+        result = image.copy()
+    painter = QPainter(result)
+    painter.setRenderHint(QPainter.Antialiasing)
+    for annotation in annotations:
+        draw_annotation(painter, annotation)
+    painter.end()
+    return result
+
+
+@dataclass
+class AnnotationDocument:
+    """Serializable list of annotations for one image.
+
+    The JSON form stores each annotation's tool settings, its points as a
+    flat [x0, y0, x1, y1, ...] list and any text, so annotations can be
+    saved next to a capture and rendered later without the editor.
+    """
+    annotations: List[Annotation] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': 1,
+            'annotations': [{
+                'tool': annotation.tool.tool_type.name.lower(),
+                'color': annotation.tool.color.name(QColor.HexArgb),
+                'size': annotation.tool.size,
+                'opacity': annotation.tool.opacity,
+                'points': list(annotation.points.data),
+                'text': annotation.text
+            } for annotation in self.annotations]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AnnotationDocument':
+        annotations = []
+        for item in data.get('annotations', []):
+            tool = AnnotationTool(
+                tool_type=ToolType[item['tool'].upper()],
+                color=QColor(item.get('color', '#ffff0000')),
+                size=item.get('size', 3)
+            )
+            # Set after construction: AnnotationTool applies highlighter defaults
+            tool.size = item.get('size', tool.size)
+            tool.opacity = item.get('opacity', tool.opacity)
+            coords = item.get('points', [])
+            points = StrokePoints(zip(coords[0::2], coords[1::2]))
+            annotations.append(Annotation(tool, points, item.get('text', '')))
+        return cls(annotations)
+
+    def save(self, path: str):
+        """Write the document as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> 'AnnotationDocument':
+        """Read a document written by :meth:`save`."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def render_file(image_path: str, document: AnnotationDocument, output_path: str):
+    """Render annotations onto an image file and save the result.
+
+    Args:
+        image_path: Source image
+        document: Annotations to draw
+        output_path: Destination file (format from the extension)
+
+    Raises:
+        IOError: If the image cannot be read or the output cannot be written
+    """
+    ensure_gui_application()
+    image = QImage(image_path)
+    if image.isNull():
+        raise IOError(f"Could not read image: {image_path}")
+    result = render(image, document.annotations)
+    if not result.save(output_path):
+        raise IOError(f"Could not write image: {output_path}")
@@ -0,0 +1,118 @@
+"""Frame-paced repaint scheduling for the editor canvas."""
+
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from PyQt5.QtCore import QObject, QTimer, Qt
+
+
+class FrameScheduler(QObject):
+    """Batches input samples and flushes them at most once per display frame.
+
+    Input handlers call :meth:`request` for every sample. The first request
+    in a frame arms a precise single-shot timer aligned to the target
+    refresh rate; when it fires, ``flush`` is called once to process every
+    sample that arrived since the last frame and schedule the repaint.
+    Samples per frame and paint times are kept for tuning.
+    """
+
+    SUPPORTED_RATES = (60, 120, 144)
+    STATS_SIZE = 240
+
+    def __init__(self, flush: Callable[[], None], rate: int = 60, parent=None):
+        """Create a scheduler.
+
+        Args:
+            flush: Called once per frame to apply pending samples and
+                invalidate what changed
+            rate: Target frame rate in Hz (60, 120 or 144)
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self._flush = flush
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_frame)
+
+        self.rate = 60
+        self.interval_ms = 1000 / 60
+        self.set_rate(rate)
+
+        self._pending_samples = 0
+        self._last_frame: Optional[float] = None
+        self.frames = deque(maxlen=self.STATS_SIZE)
+        self.paint_times = deque(maxlen=self.STATS_SIZE)
+
+    def set_rate(self, rate: int):
+        """Change the target frame rate.
+
+        Raises:
+            ValueError: If rate is not one of SUPPORTED_RATES
+        """
+        if rate not in self.SUPPORTED_RATES:
+            raise ValueError(f"Unsupported frame rate {rate} Hz; use one of {self.SUPPORTED_RATES}")
+        self.rate = rate
+        self.interval_ms = 1000 / rate
+
+    def request(self):
+        """Note one input sample; the flush runs on the next frame boundary."""
+        self._pending_samples += 1
+        if self._timer.isActive():
+            return
+
+        # Fire on the next frame boundary relative to the previous flush, or
+        # immediately if the pointer has been idle for longer than a frame
+        delay = 0
+        if self._last_frame is not None:
+            elapsed = (time.perf_counter() - self._last_frame) * 1000
+            delay = max(0, round(self.interval_ms - elapsed))
+        self._timer.start(delay)
+
+    def flush_now(self):
+        """Apply pending samples immediately (e.g. before a mouse release)."""
+        if self._timer.isActive():
+            self._timer.stop()
+        if self._pending_samples:
+            self._on_frame()
+
+    def cancel(self):
+        """Drop the pending frame without flushing."""
+        self._timer.stop()
+        self._pending_samples = 0
+
+    def _on_frame(self):
+        samples = self._pending_samples
+        self._pending_samples = 0
+        self._last_frame = time.perf_counter()
+        self._flush()
+        self.frames.append(samples)
+
+    def record_paint(self, paint_ms: float):
+        """Record how long the canvas took to paint a frame."""
+        self.paint_times.append(paint_ms)
+
+    def reset_stats(self):
+        """Forget collected frame statistics."""
+        self.frames.clear()
+        self.paint_times.clear()
+
+    def stats(self) -> Dict:
+        """Summarize recent frames.
+
+        Returns:
+            Dictionary with target rate, frame count, mean/max samples per
+            frame and mean/max paint time in milliseconds
+        """
+        frames = list(self.frames) or [0]
+        paints = list(self.paint_times) or [0.0]
+        return {
+            'rate_hz': self.rate,
+            'frames': len(self.frames),
+            'samples_per_frame_mean': sum(frames) / len(frames),
+            'samples_per_frame_max': max(frames),
+            'paint_ms_mean': sum(paints) / len(paints),
+            'paint_ms_max': max(paints),
+            'frame_budget_ms': self.interval_ms
+        }
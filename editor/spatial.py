@@ -0,0 +1,251 @@
+"""Spatial index and hit-testing for committed annotations."""
+
+import math
+import weakref
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from PyQt5.QtCore import QPoint, QRect
+from PyQt5.QtGui import QFont, QFontMetrics
+
+from .tools import Annotation, ToolType
+
+
+def arrow_head_size(annotation: Annotation) -> int:
+    """Length of an arrow's head strokes in image pixels."""
+    return annotation.tool.size * 4
+
+
+def text_font(annotation: Annotation) -> QFont:
+    """Font used to draw a text annotation."""
+    return QFont("Arial", annotation.tool.size * 4)
+
+
+def annotation_bounds(annotation: Annotation) -> QRect:
+    """Image-space rectangle covering everything an annotation paints.
+
+    Geometry bounds are padded by half the pen width (plus a pixel of
+    antialiasing), and arrows by their head size, so the rectangle can be
+    used both for hit-testing and as a repaint region.
+    """
+    points = annotation.points
+    if not points:
+        return QRect()
+
+    tool_type = annotation.tool.tool_type
+    if tool_type == ToolType.TEXT:
+        metrics = QFontMetrics(text_font(annotation))
+        origin = points[0]
+        rect = metrics.boundingRect(annotation.text)
+        return rect.translated(origin).adjusted(-2, -2, 2, 2)
+
+    if tool_type in (ToolType.RECTANGLE, ToolType.CIRCLE, ToolType.ARROW) and len(points) >= 2:
+        rect = QRect(points[0], points[-1]).normalized()
+    else:
+        rect = points.bounding_rect()
+
+    pad = annotation.tool.size // 2 + 2
+    if tool_type == ToolType.ARROW:
+        pad += arrow_head_size(annotation)
+    return rect.adjusted(-pad, -pad, pad, pad)
+
+
+def _segment_distance_sq(px: float, py: float, ax: float, ay: float, bx: float, by: float) -> float:
+    """Squared distance from point p to segment ab."""
+    dx = bx - ax
+    dy = by - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        t = 0.0
+    else:
+        t = ((px - ax) * dx + (py - ay) * dy) / length_sq
+        t = max(0.0, min(1.0, t))
+    cx = ax + t * dx - px
+    cy = ay + t * dy - py
+    return cx * cx + cy * cy
+
+
+def hit_test(annotation: Annotation, point: QPoint, tolerance: float) -> bool:
+    """Check whether a point touches an annotation's painted geometry.
+
+    Args:
+        annotation: Annotation to test
+        point: Point in image coordinates
+        tolerance: Extra distance (image pixels) that still counts as a hit
+
+    Returns:
+        True if the point is within tolerance of the annotation's stroke
+        (or inside a text annotation's box)
+    """
+    points = annotation.points
+    if not points:
+        return False
+
+    tool_type = annotation.tool.tool_type
+    px, py = point.x(), point.y()
+    reach = tolerance + annotation.tool.size / 2
+    reach_sq = reach * reach
+
+    if tool_type == ToolType.TEXT:
+        return annotation_bounds(annotation).contains(point)
+
+    if tool_type in (ToolType.RECTANGLE, ToolType.CIRCLE) and len(points) >= 2:
+        rect = QRect(points[0], points[-1]).normalized()
+        left, top = rect.left(), rect.top()
+        right, bottom = rect.right() + 1, rect.bottom() + 1
+
+        if tool_type == ToolType.RECTANGLE:
+            corners = ((left, top), (right, top), (right, bottom), (left, bottom))
+            return any(
+                _segment_distance_sq(px, py, *corners[i], *corners[(i + 1) % 4]) <= reach_sq
+                for i in range(4)
+            )
+
+        # Ellipse: approximate distance to the outline along the radius
+        rx = (right - left) / 2
+        ry = (bottom - top) / 2
+        if rx <= 0 or ry <= 0:
+            return _segment_distance_sq(px, py, left, top, right, bottom) <= reach_sq
+        nx = (px - (left + rx)) / rx
+        ny = (py - (top + ry)) / ry
+        radial = math.hypot(nx, ny)
+        return abs(radial - 1) * min(rx, ry) <= reach
+
+    if tool_type == ToolType.ARROW and len(points) >= 2:
+        start, end = points[0], points[-1]
+        if _segment_distance_sq(px, py, start.x(), start.y(), end.x(), end.y()) <= reach_sq:
+            return True
+        # Treat the head as a disc around the tip
+        head = arrow_head_size(annotation) + reach
+        return (px - end.x()) ** 2 + (py - end.y()) ** 2 <= head * head
+
+    # Freehand polyline
+    data = points.data
+    ax, ay = data[0], data[1]
+    if len(data) == 2:
+        return (px - ax) ** 2 + (py - ay) ** 2 <= reach_sq
+    for i in range(2, len(data), 2):
+        bx, by = data[i], data[i + 1]
+        # Cheap box rejection before the exact segment distance
+        if not (min(ax, bx) - reach <= px <= max(ax, bx) + reach and
+                min(ay, by) - reach <= py <= max(ay, by) + reach):
+            ax, ay = bx, by
+            continue
+        if _segment_distance_sq(px, py, ax, ay, bx, by) <= reach_sq:
+            return True
+        ax, ay = bx, by
+    return False
+
+
+class AnnotationIndex:
+    """Uniform grid over annotation bounding boxes.
+
+    Each annotation is registered in every grid cell its bounds overlap, so
+    point and rectangle queries only look at annotations in nearby cells
+    instead of scanning the whole list. Annotations also carry an insertion
+    order so the topmost hit can be picked without consulting the list.
+
+    An annotation keeps its stacking order after it is removed, so undo and
+    redo can put it back where it was without re-indexing everything.
+    """
+
+    CELL_SIZE = 128
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[Annotation]] = {}
+        self._bounds: Dict[Annotation, QRect] = {}
+        self._order: Dict[Annotation, int] = {}
+        # Order of removed annotations, reused if they are inserted again
+        self._retired: 'weakref.WeakKeyDictionary[Annotation, int]' = weakref.WeakKeyDictionary()
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __contains__(self, annotation: Annotation) -> bool:
+        return annotation in self._bounds
+
+    def _cell_range(self, rect: QRect):
+        """Yield the grid cells a rectangle overlaps."""
+        size = self.cell_size
+        for cx in range(rect.left() // size, rect.right() // size + 1):
+            for cy in range(rect.top() // size, rect.bottom() // size + 1):
+                yield cx, cy
+
+    def insert(self, annotation: Annotation):
+        """Add an annotation above everything already indexed.
+
+        A previously removed annotation returns to its old stacking order.
+        """
+        bounds = annotation_bounds(annotation)
+        if bounds.isEmpty():
+            return
+        self._bounds[annotation] = bounds
+        order = self._retired.pop(annotation, None)
+        if order is None:
+            order = self._next_order
+            self._next_order += 1
+        self._order[annotation] = order
+        for cell in self._cell_range(bounds):
+            self._cells.setdefault(cell, set()).add(annotation)
+
+    def remove(self, annotation: Annotation):
+        """Drop an annotation from the index (no-op if absent)."""
+        bounds = self._bounds.pop(annotation, None)
+        if bounds is None:
+            return
+        self._retired[annotation] = self._order.pop(annotation)
+        for cell in self._cell_range(bounds):
+            members = self._cells.get(cell)
+            if members is not None:
+                members.discard(annotation)
+                if not members:
+                    del self._cells[cell]
+
+    def replace(self, old: Annotation, new: Annotation):
+        """Swap an annotation for an edited copy at the same stacking order."""
+        order = self._order.get(old)
+        self.remove(old)
+        self.insert(new)
+        if order is not None and new in self._order:
+            self._order[new] = order
+
+    def rebuild(self, annotations: Iterable[Annotation]):
+        """Re-index from scratch, stacking new annotations in list order."""
+        self._retired.update(self._order)
+        self._cells = {}
+        self._bounds = {}
+        self._order = {}
+        for annotation in annotations:
+            self.insert(annotation)
+
+    def bounds(self, annotation: Annotation) -> Optional[QRect]:
+        """Indexed bounds of an annotation, or None if it is not indexed."""
+        return self._bounds.get(annotation)
+
+    def query(self, rect: QRect) -> List[Annotation]:
+        """Annotations whose bounds intersect a rectangle, bottom to top."""
+        found = set()
+        for cell in self._cell_range(rect):
+            members = self._cells.get(cell)
+            if members:
+                found.update(a for a in members if self._bounds[a].intersects(rect))
+        return sorted(found, key=self._order.__getitem__)
+
+    @staticmethod
+    def _probe(point: QPoint, tolerance: float) -> QRect:
+        """Square around a point that covers the hit tolerance."""
+        reach = int(math.ceil(tolerance))
+        return QRect(point.x() - reach, point.y() - reach, 2 * reach + 1, 2 * reach + 1)
+
+    def hits(self, point: QPoint, tolerance: float = 0) -> List[Annotation]:
+        """All annotations whose painted geometry touches a point, top first."""
+        candidates = self.query(self._probe(point, tolerance))
+        return [a for a in reversed(candidates) if hit_test(a, point, tolerance)]
+
+    def topmost_at(self, point: QPoint, tolerance: float = 0) -> Optional[Annotation]:
+        """The topmost annotation touching a point, or None."""
+        for annotation in reversed(self.query(self._probe(point, tolerance))):
+            if hit_test(annotation, point, tolerance):
+                return annotation
+        return None
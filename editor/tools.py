@@ -1,10 +1,12 @@
 """Annotation tools for the editor canvas."""
 
 from enum import Enum, auto
+from array import array
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
-from PyQt5.QtCore import QPoint
-from PyQt5.QtGui import QColor
+from typing import Deque, Iterable, Iterator, List, Tuple, Optional, Union
+from PyQt5.QtCore import QPoint, QRect
+from PyQt5.QtGui import QColor, QPolygon
 
 
 class ToolType(Enum):
@@ -39,68 +41,339 @@ class AnnotationTool:
                 self.color = QColor(255, 255, 0)  # Default yellow
 
 
-@dataclass
+class StrokePoints:
+    """Compact point storage for annotation geometry.
+
+    Coordinates are kept interleaved (x0, y0, x1, y1, ...) in one
+    ``array('i')`` instead of a list of QPoint wrappers. Indexing still
+    returns QPoint so shape tools can use points[0] / points[-1], and a
+    QPolygon view for drawing is built once and extended incrementally
+    while a stroke is in progress.
+    """
+
+    # Samples closer than this (in image pixels) to the previous point are
+    # dropped at ingestion; high-rate mice report many near-identical points
+    MIN_DISTANCE = 1.5
+
+    def __init__(self, points: Iterable[Union[QPoint, Tuple[int, int]]] = (),
+                 min_distance: float = MIN_DISTANCE):
+        self._data = array('i')
+        self._min_distance_sq = min_distance * min_distance
+        self._polygon: Optional[QPolygon] = None
+        self._bounds: Optional[List[int]] = None  # [left, top, right, bottom]
+        for point in points:
+            if isinstance(point, QPoint):
+                self._data.extend((point.x(), point.y()))
+            else:
+                self._data.extend(point)
+
+    @classmethod
+    def from_array(cls, data: array) -> 'StrokePoints':
+        """Wrap an existing interleaved coordinate array without copying."""
+        points = cls()
+        points._data = data
+        return points
+
+    def append(self, point: QPoint) -> bool:
+        """Add a point unless it nearly duplicates the previous one.
+
+        Returns:
+            True if the point was stored
+        """
+        x, y = point.x(), point.y()
+        data = self._data
+        if data:
+            dx = x - data[-2]
+            dy = y - data[-1]
+            if dx * dx + dy * dy < self._min_distance_sq:
+                return False
+
+        data.append(x)
+        data.append(y)
+        if self._polygon is not None:
+            self._polygon.append(QPoint(x, y))
+        if self._bounds is not None:
+            bounds = self._bounds
+            if x < bounds[0]:
+                bounds[0] = x
+            elif x > bounds[2]:
+                bounds[2] = x
+            if y < bounds[1]:
+                bounds[1] = y
+            elif y > bounds[3]:
+                bounds[3] = y
+        return True
+
+    def __len__(self) -> int:
+        return len(self._data) // 2
+
+    def _index(self, index: int) -> int:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("point index out of range")
+        return index * 2
+
+    def __getitem__(self, index: int) -> QPoint:
+        i = self._index(index)
+        return QPoint(self._data[i], self._data[i + 1])
+
+    def __setitem__(self, index: int, point: QPoint):
+        i = self._index(index)
+        self._data[i] = point.x()
+        self._data[i + 1] = point.y()
+        self._polygon = None
+        self._bounds = None
+
+    def translated(self, dx: int, dy: int) -> 'StrokePoints':
+        """Copy of these points shifted by (dx, dy)."""
+        data = array('i', self._data)
+        for i in range(0, len(data), 2):
+            data[i] += dx
+            data[i + 1] += dy
+        return StrokePoints.from_array(data)
+
+    def __iter__(self) -> Iterator[QPoint]:
+        data = self._data
+        for i in range(0, len(data), 2):
+            yield QPoint(data[i], data[i + 1])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, StrokePoints):
+            return self._data == other._data
+        return NotImplemented
+
+    @property
+    def data(self) -> array:
+        """The interleaved x, y coordinate array (read-only by convention)."""
+        return self._data
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the coordinate buffer."""
+        return len(self._data) * self._data.itemsize
+
+    def polygon(self) -> QPolygon:
+        """Cached QPolygon view of the points for drawPolyline."""
+        if self._polygon is None:
+            self._polygon = QPolygon(self._data.tolist())
+        return self._polygon
+
+    def bounding_rect(self) -> QRect:
+        """Bounding rectangle of all points (empty if there are none)."""
+        if not self._data:
+            return QRect()
+        if self._bounds is None:
+            xs = self._data[0::2]
+            ys = self._data[1::2]
+            self._bounds = [min(xs), min(ys), max(xs), max(ys)]
+        left, top, right, bottom = self._bounds
+        return QRect(left, top, right - left + 1, bottom - top + 1)
+
+
+@dataclass(eq=False)
 class Annotation:
     """Represents a single annotation on the canvas."""
     tool: AnnotationTool
-    points: List[QPoint]
+    points: StrokePoints
     text: str = ""  # For text annotations
 
+    def __post_init__(self):
+        if not isinstance(self.points, StrokePoints):
+            self.points = StrokePoints(self.points)
+
+    def translated(self, dx: int, dy: int) -> 'Annotation':
+        """Copy of this annotation moved by (dx, dy), sharing the tool."""
+        return Annotation(self.tool, self.points.translated(dx, dy), self.text)
+
+
+# Fixed overhead of an annotation and its tool
+_ANNOTATION_BYTES = 256
+# Fixed overhead of a history entry
+_ENTRY_BYTES = 128
+
+
+def annotation_nbytes(annotation: Annotation) -> int:
+    """Estimate the memory held by an annotation."""
+    return _ANNOTATION_BYTES + annotation.points.nbytes + len(annotation.text)
+
+
+@dataclass
+class HistoryEntry:
+    """A single recorded change to the annotation list.
+
+    action is one of 'add', 'remove', 'modify', 'clear' or 'group'. For
+    'add' and 'remove', annotation is the annotation inserted/removed at
+    index. For 'modify', previous is replaced by annotation at index. For
+    'clear', cleared holds the list that was emptied. For 'group', entries
+    holds changes made by one gesture, applied in order and undone together.
+    """
+    action: str
+    index: int = -1
+    annotation: Optional[Annotation] = None
+    previous: Optional[Annotation] = None
+    cleared: Optional[List[Annotation]] = None
+    entries: Optional[List['HistoryEntry']] = None
+    nbytes: int = _ENTRY_BYTES
+
 
 class AnnotationHistory:
-    """Manages undo/redo history for annotations."""
-
-    def __init__(self, max_history: int = 50):
-        self.history: List[List[Annotation]] = [[]]
-        self.current_index: int = 0
-        self.max_history = max_history
-
-    def add_state(self, annotations: List[Annotation]):
-        """Add a new state to history."""
-        # Remove any redo states
-        self.history = self.history[:self.current_index + 1]
-
-        # Add new state (deep copy)
-        new_state = [Annotation(
-            tool=AnnotationTool(
-                tool_type=a.tool.tool_type,
-                color=QColor(a.tool.color),
-                size=a.tool.size,
-                opacity=a.tool.opacity
-            ),
-            points=list(a.points),
-            text=a.text
-        ) for a in annotations]
-
-        self.history.append(new_state)
-        self.current_index += 1
-
-        # Trim old history
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
-            self.current_index = len(self.history) - 1
-
-    def undo(self) -> Optional[List[Annotation]]:
-        """Undo to previous state."""
-        if self.current_index > 0:
-            self.current_index -= 1
-            return self.history[self.current_index]
-        return None
-
-    def redo(self) -> Optional[List[Annotation]]:
-        """Redo to next state."""
-        if self.current_index < len(self.history) - 1:
-            self.current_index += 1
-            return self.history[self.current_index]
-        return None
+    """Manages undo/redo history as a log of changes.
+
+    Recording a change stores references to the affected annotations only,
+    so it costs O(1) regardless of how many annotations exist. Committed
+    annotations are treated as immutable (edits record a new annotation
+    via record_modify). Depth is bounded by an estimated memory budget
+    rather than a fixed number of steps.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.undo_stack: Deque[HistoryEntry] = deque()
+        self.redo_stack: List[HistoryEntry] = []
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        # Changes collected between begin_group() and end_group()
+        self._group: Optional[List[HistoryEntry]] = None
+
+    def begin_group(self):
+        """Start collecting changes into a single undo step (e.g. one eraser drag)."""
+        self.end_group()
+        self._group = []
+
+    def end_group(self):
+        """Record the changes collected since begin_group() as one step."""
+        entries, self._group = self._group, None
+        if not entries:
+            return
+        if len(entries) == 1:
+            self._record(entries[0])
+        else:
+            self._record(HistoryEntry('group', entries=entries,
+                                      nbytes=sum(entry.nbytes for entry in entries)))
+
+    def _record(self, entry: HistoryEntry):
+        """Push a new change, dropping redo states and trimming to budget."""
+        if self._group is not None:
+            self._group.append(entry)
+            return
+
+        for dropped in self.redo_stack:
+            self.nbytes -= dropped.nbytes
+        self.redo_stack = []
+
+        self.undo_stack.append(entry)
+        self.nbytes += entry.nbytes
+
+        # Trim oldest history, but always keep the newest step undoable
+        while self.nbytes > self.max_bytes and len(self.undo_stack) > 1:
+            self.nbytes -= self.undo_stack.popleft().nbytes
+
+    def record_add(self, index: int, annotation: Annotation):
+        """Record that annotation was inserted at index."""
+        self._record(HistoryEntry(
+            'add', index, annotation,
+            nbytes=_ENTRY_BYTES + annotation_nbytes(annotation)
+        ))
+
+    def record_remove(self, index: int, annotation: Annotation):
+        """Record that annotation was removed from index."""
+        self._record(HistoryEntry(
+            'remove', index, annotation,
+            nbytes=_ENTRY_BYTES + annotation_nbytes(annotation)
+        ))
+
+    def record_modify(self, index: int, previous: Annotation, annotation: Annotation):
+        """Record that previous was replaced by annotation at index."""
+        self._record(HistoryEntry(
+            'modify', index, annotation, previous,
+            nbytes=_ENTRY_BYTES + annotation_nbytes(annotation) + annotation_nbytes(previous)
+        ))
+
+    def record_clear(self, cleared: List[Annotation]):
+        """Record that all annotations were removed.
+
+        Args:
+            cleared: The list that was emptied (kept as-is, not copied)
+        """
+        self._record(HistoryEntry(
+            'clear', cleared=cleared,
+            nbytes=_ENTRY_BYTES + sum(annotation_nbytes(a) for a in cleared)
+        ))
+
+    def undo(self, annotations: List[Annotation]) -> Optional[HistoryEntry]:
+        """Revert the last change in place.
+
+        Args:
+            annotations: The live annotation list to modify
+
+        Returns:
+            The reverted entry, or None if there is nothing to undo
+        """
+        self.end_group()
+        if not self.undo_stack:
+            return None
+
+        entry = self.undo_stack.pop()
+        self._revert(entry, annotations)
+        self.redo_stack.append(entry)
+        return entry
+
+    @staticmethod
+    def _revert(entry: HistoryEntry, annotations: List[Annotation]):
+        if entry.action == 'add':
+            del annotations[entry.index]
+        elif entry.action == 'remove':
+            annotations.insert(entry.index, entry.annotation)
+        elif entry.action == 'modify':
+            annotations[entry.index] = entry.previous
+        elif entry.action == 'clear':
+            annotations[:] = entry.cleared
+        elif entry.action == 'group':
+            for part in reversed(entry.entries):
+                AnnotationHistory._revert(part, annotations)
+
+    def redo(self, annotations: List[Annotation]) -> Optional[HistoryEntry]:
+        """Re-apply the last undone change in place.
+
+        Args:
+            annotations: The live annotation list to modify
+
+        Returns:
+            The re-applied entry, or None if there is nothing to redo
+        """
+        self.end_group()
+        if not self.redo_stack:
+            return None
+
+        entry = self.redo_stack.pop()
+        self._apply(entry, annotations)
+        self.undo_stack.append(entry)
+        return entry
+
+    @staticmethod
+    def _apply(entry: HistoryEntry, annotations: List[Annotation]):
+        if entry.action == 'add':
+            annotations.insert(entry.index, entry.annotation)
+        elif entry.action == 'remove':
+            del annotations[entry.index]
+        elif entry.action == 'modify':
+            annotations[entry.index] = entry.annotation
+        elif entry.action == 'clear':
+            del annotations[:]
+        elif entry.action == 'group':
+            for part in entry.entries:
+                AnnotationHistory._apply(part, annotations)
 
     def can_undo(self) -> bool:
-        return self.current_index > 0
+        return bool(self.undo_stack)
 
     def can_redo(self) -> bool:
-        return self.current_index < len(self.history) - 1
+        return bool(self.redo_stack)
 
     def clear(self):
         """Clear all history."""
-        self.history = [[]]
-        self.current_index = 0
+        self.undo_stack.clear()
+        self.redo_stack = []
+        self.nbytes = 0
+        self._group = None
@@ -9,16 +9,22 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QSize, pyqtSignal, QPropertyAnimation, QEasingCurve
 from PyQt5.QtGui import QIcon, QColor, QPixmap, QPainter, QKeySequence, QPen, QBrush, QFont
 from PIL import Image
-from typing import Optional
+from typing import Dict, Optional, Union
 import os
 
 from .canvas import DrawingCanvas
+from .renderer import qimage_to_pil
 from .tools import ToolType, AnnotationTool
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from system.clipboard import ClipboardManager
+from capture.frame import Frame
+from storage.naming import allocate_path
+from storage.formats import AUTOSAVE_FORMAT, available_formats, get_format
+from storage.profiles import AUTOSAVE_PROFILE, SAVE_AS_PROFILE
+from storage.saver import get_save_service
 
 
 # Modern Dark Theme Colors
@@ -387,6 +393,14 @@ class EditorWindow(QMainWindow):
         self.current_size = 3
         self.has_unsaved_changes = False
         self.original_capture = None  # Store original for auto-save
+        self.capture_metadata: Dict = {}
+
+        # Saves run on the shared background service; results come back
+        # through its signals
+        self.save_service = get_save_service()
+        self.save_service.saved.connect(self._on_save_finished)
+        self.save_service.failed.connect(self._on_save_failed)
+        self._pending_saves = set()
 
         self._setup_ui()
         self._create_menus()
@@ -490,13 +504,14 @@ class EditorWindow(QMainWindow):
 
         # Tool definitions with modern icons
         tools = [
+            ("Select", ToolType.SELECT, "S", "Select and move annotations"),
             ("Pen", ToolType.PEN, "P", "Draw freehand"),
             ("Highlighter", ToolType.HIGHLIGHTER, "H", "Highlight area"),
             ("Rectangle", ToolType.RECTANGLE, "R", "Draw rectangle"),
             ("Circle", ToolType.CIRCLE, "C", "Draw circle"),
             ("Arrow", ToolType.ARROW, "A", "Draw arrow"),
             ("Text", ToolType.TEXT, "T", "Add text"),
-            ("Eraser", ToolType.ERASER, "E", "Erase annotations"),
+            ("Eraser", ToolType.ERASER, "E", "Erase whole annotations"),
         ]
 
         for name, tool_type, shortcut, tooltip in tools:
@@ -604,6 +619,7 @@ class EditorWindow(QMainWindow):
 
         # Map tool types to Segoe MDL2 Assets glyphs
         glyph_map = {
+            ToolType.SELECT: '\uE7C9',       # TouchPointer
             ToolType.PEN: '\uED63',          # Edit
             ToolType.HIGHLIGHTER: '\uE7E6',  # Highlight
             ToolType.RECTANGLE: '\uE739',    # Checkbox (square outline)
@@ -748,15 +764,24 @@ class EditorWindow(QMainWindow):
             title += " *"
         self.setWindowTitle(title)
 
-    def set_image(self, image: Image.Image):
-        """Set the captured image for editing."""
+    def set_image(self, image: Union[Frame, Image.Image], metadata: Optional[Dict] = None):
+        """Set the captured image for editing.
+
+        Args:
+            image: The capture
+            metadata: Capture details recorded with saves (captured_at,
+                monitor, window) for the screenshot library
+        """
         self.original_capture = image  # Store for auto-save on close
+        self.capture_metadata = dict(metadata or {})
         self.canvas.set_image(image)
         self.has_unsaved_changes = True  # Mark as needing save
         self._update_title()
 
-        # Auto-copy to clipboard
+        # Auto-copy to clipboard (the first point a PIL image is needed)
         try:
+            if isinstance(image, Frame):
+                image = image.to_image()
             ClipboardManager.copy_image(image)
             self.statusbar.showMessage("Captured and copied to clipboard! Edit your image, then close to auto-save.", 5000)
         except Exception as e:
@@ -782,38 +807,62 @@ class EditorWindow(QMainWindow):
 
     def _save_image_as(self):
         """Save the image with dialog."""
-        image = self.canvas.get_final_image()
-        if not image:
+        qimage = self.canvas.get_final_qimage()
+        if qimage is None:
             QMessageBox.warning(self, "Error", "No image to save!")
             return
 
-        filters = "PNG Image (*.png);;JPEG Image (*.jpg *.jpeg);;GIF Image (*.gif)"
+        # Dialog filter -> (extensions, PIL format, encoder options, PNG profile)
+        choices = {
+            "PNG Image (*.png)": (('.png',), 'PNG', {}, SAVE_AS_PROFILE),
+            # Smallest spends a few hundred ms more encoding for archiving
+            "PNG Image, smallest file (*.png)": (('.png',), 'PNG', {}, 'smallest'),
+        }
+        for output_format in available_formats():
+            if output_format.pil_format != 'PNG':
+                choices[f"{output_format.description} (*{output_format.extension})"] = (
+                    (output_format.extension,), output_format.pil_format,
+                    output_format.save_options(), None)
+        choices["JPEG Image (*.jpg *.jpeg)"] = (('.jpg', '.jpeg'), 'JPEG', {}, None)
+        choices["GIF Image (*.gif)"] = (('.gif',), 'GIF', {}, None)
+
         filename, selected_filter = QFileDialog.getSaveFileName(
-            self, "Save Image", "", filters
+            self, "Save Image", "", ";;".join(choices)
         )
 
         if filename:
+            extensions, image_format, options, profile = choices.get(
+                selected_filter, choices["PNG Image (*.png)"])
             # Ensure correct extension
-            if "PNG" in selected_filter and not filename.lower().endswith('.png'):
-                filename += '.png'
-            elif "JPEG" in selected_filter and not filename.lower().endswith(('.jpg', '.jpeg')):
-                filename += '.jpg'
-            elif "GIF" in selected_filter and not filename.lower().endswith('.gif'):
-                filename += '.gif'
-
-            try:
-                # Convert RGBA to RGB for JPEG
-                if filename.lower().endswith(('.jpg', '.jpeg')) and image.mode == 'RGBA':
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    background.paste(image, mask=image.split()[3])
-                    image = background
-
-                image.save(filename)
-                self.has_unsaved_changes = False
-                self._update_title()
-                self.statusbar.showMessage(f"Saved to {filename}", 3000)
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save: {e}")
+            if not filename.lower().endswith(extensions):
+                filename += extensions[0]
+
+            # Encoded and written in the background (JPEG alpha is
+            # flattened there); _on_save_finished reports the result
+            self._pending_saves.add(filename)
+            self.save_service.submit(lambda: qimage_to_pil(qimage), filename, tag='save_as',
+                                     format=image_format, profile=profile,
+                                     metadata=self.capture_metadata, **options)
+            self.statusbar.showMessage(f"Saving to {filename}...")
+
+    def _on_save_finished(self, path: str, tag: str):
+        """Report a completed background save started by this window."""
+        if path not in self._pending_saves:
+            return
+        self._pending_saves.discard(path)
+        if tag == 'save_as':
+            self.has_unsaved_changes = False
+            self._update_title()
+        self.statusbar.showMessage(f"Saved to {path}", 3000)
+
+    def _on_save_failed(self, path: str, tag: str, error: str):
+        """Report a failed background save started by this window."""
+        if path not in self._pending_saves:
+            return
+        self._pending_saves.discard(path)
+        self.statusbar.showMessage(f"Failed to save {path}", 5000)
+        if self.isVisible():
+            QMessageBox.critical(self, "Error", f"Failed to save: {error}")
 
     def _copy_to_clipboard(self):
         """Copy the current image to clipboard."""
@@ -828,25 +877,24 @@ class EditorWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close - auto-save the image."""
-        # Auto-save to Screenshots folder on close
-        image = self.canvas.get_final_image()
-        if image:
-            import os
-            from datetime import datetime
-
-            screenshots_folder = os.path.join(os.path.expanduser("~"), "Pictures", "Screenshots")
-            if not os.path.exists(screenshots_folder):
-                os.makedirs(screenshots_folder)
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"BretClip_{timestamp}.png"
-            filepath = os.path.join(screenshots_folder, filename)
-
+        # Auto-save to Screenshots folder on close; encoding happens on the
+        # save service so the window closes immediately
+        qimage = self.canvas.get_final_qimage()
+        if qimage is not None:
+            output_format = get_format(AUTOSAVE_FORMAT)
             try:
-                image.save(filepath)
-                print(f"Auto-saved to: {filepath}")
-            except Exception as e:
+                filepath = allocate_path(extension=output_format.extension)
+            except OSError as e:
                 print(f"Auto-save error: {e}")
+            else:
+                self.save_service.submit(lambda: qimage_to_pil(qimage), filepath,
+                                         tag='autosave', reserved=True,
+                                         format=output_format.pil_format,
+                                         profile=AUTOSAVE_PROFILE,
+                                         metadata=self.capture_metadata,
+                                         deduplicate=True,
+                                         **output_format.save_options())
+                print(f"Auto-saving to: {filepath}")
 
         self.closed.emit()
         event.accept()
@@ -0,0 +1,11 @@
+from .index import (ScreenshotLibrary, CaptureRecord, get_library, inspect_file,
+                    library_folder)
+from .thumbnails import ThumbnailCache
+from .dedupe import dhash, hamming, pixel_hash
+from .similarity import HashIndex
+
+__all__ = [
+    'ScreenshotLibrary', 'CaptureRecord', 'get_library', 'inspect_file',
+    'library_folder', 'ThumbnailCache', 'dhash', 'hamming', 'pixel_hash',
+    'HashIndex'
+]
@@ -0,0 +1,84 @@
+"""Content and perceptual hashes for spotting duplicate captures."""
+
+import hashlib
+from typing import List
+
+from PIL import Image
+
+# dHash grid: 9x8 greyscale samples give 8 left/right comparisons per row
+HASH_BITS = 64
+
+# The 64-bit dHash is split into this many 16-bit bands, each indexed. Two
+# hashes within NEAR_DUPLICATE_DISTANCE bits share at least one band
+# exactly (pigeonhole), so band lookups find every near-duplicate.
+BANDS = 4
+BAND_BITS = HASH_BITS // BANDS
+NEAR_DUPLICATE_DISTANCE = BANDS - 1
+
+
+def normalize(image: Image.Image) -> Image.Image:
+    """Bring an image to the mode its pixels are hashed in (RGB or RGBA).
+
+    A capture hashes the same whether it came from the editor, a palette
+    PNG written by the "smallest" profile or an opaque RGBA file.
+    """
+    if image.mode == 'RGBA':
+        if image.getchannel('A').getextrema() == (255, 255):
+            return image.convert('RGB')
+        return image
+    if image.mode == 'RGB':
+        return image
+    if image.mode in ('LA', 'PA') or 'transparency' in image.info:
+        return normalize(image.convert('RGBA'))
+    return image.convert('RGB')
+
+
+def pixel_hash(image: Image.Image) -> str:
+    """Exact content hash of an image's pixels (BLAKE2b-128, hex).
+
+    Independent of the file format and encoder settings the image was
+    saved with.
+    """
+    image = normalize(image)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode} {image.width}x{image.height}\n".encode('ascii'))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def dhash(image: Image.Image) -> int:
+    """64-bit difference hash.
+
+    The image is box-filtered down to 9x8 greyscale in C; each bit says
+    whether a sample is brighter than its right-hand neighbour. Small
+    changes (a moved cursor, a ticking clock) flip few bits.
+    """
+    if image.mode not in ('L', 'RGB', 'RGBA'):
+        image = image.convert('RGB')
+    samples = image.resize((9, 8), Image.BOX).convert('L').tobytes()
+    value = 0
+    for row in range(0, 72, 9):
+        for col in range(row, row + 8):
+            value = (value << 1) | (samples[col] > samples[col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count('1')
+
+
+def bands(value: int) -> List[int]:
+    """Split a 64-bit hash into its indexed bands, most significant first."""
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (BAND_BITS * (BANDS - 1 - i))) & mask for i in range(BANDS)]
+
+
+def to_signed(value: int) -> int:
+    """Store a 64-bit hash in an SQLite INTEGER (signed 64-bit)."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def from_signed(value: int) -> int:
+    """Inverse of :func:`to_signed`."""
+    return value + (1 << 64) if value < 0 else value
@@ -0,0 +1,614 @@
+"""SQLite index of saved captures."""
+
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.naming import screenshots_folder
+
+from . import dedupe
+from .similarity import HashIndex
+from .thumbnails import ThumbnailCache
+
+# Extensions picked up by a folder scan
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.bmp')
+
+# BretClip_YYYYmmdd_HHMMSS[_mmm][_n].ext, as written by allocate_path
+_STAMP = re.compile(r'_(\d{8}_\d{6})(?:_(\d{3}))?(?:_\d+)?\.[^.]+$')
+
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    captured_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    monitor INTEGER,
+    window TEXT,
+    content_hash TEXT NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS captures_captured_at ON captures (captured_at);
+CREATE INDEX IF NOT EXISTS captures_content_hash ON captures (content_hash);
+"""
+
+# Version 2: pixel and perceptual hashes for duplicate detection. The dHash
+# is stored whole and as indexed 16-bit bands (see library.dedupe).
+_MIGRATIONS = {
+    2: """
+ALTER TABLE captures ADD COLUMN pixel_hash TEXT;
+ALTER TABLE captures ADD COLUMN dhash INTEGER;
+ALTER TABLE captures ADD COLUMN dhash_0 INTEGER;
+ALTER TABLE captures ADD COLUMN dhash_1 INTEGER;
+ALTER TABLE captures ADD COLUMN dhash_2 INTEGER;
+ALTER TABLE captures ADD COLUMN dhash_3 INTEGER;
+ALTER TABLE captures ADD COLUMN similar_to TEXT;
+CREATE INDEX captures_pixel_hash ON captures (pixel_hash);
+CREATE INDEX captures_dhash_0 ON captures (dhash_0);
+CREATE INDEX captures_dhash_1 ON captures (dhash_1);
+CREATE INDEX captures_dhash_2 ON captures (dhash_2);
+CREATE INDEX captures_dhash_3 ON captures (dhash_3);
+""",
+}
+
+_COLUMNS = ("path, captured_at, size, width, height, monitor, window, content_hash, mtime, "
+            "pixel_hash, dhash, similar_to")
+_BAND_COLUMNS = [f"dhash_{i}" for i in range(dedupe.BANDS)]
+
+_UPSERT = (
+    f"INSERT INTO captures ({_COLUMNS}, {', '.join(_BAND_COLUMNS)}) "
+    f"VALUES ({', '.join(['?'] * (12 + dedupe.BANDS))}) "
+    "ON CONFLICT(path) DO UPDATE SET "
+    "captured_at = excluded.captured_at, size = excluded.size, "
+    "width = excluded.width, height = excluded.height, "
+    "monitor = COALESCE(excluded.monitor, monitor), "
+    "window = COALESCE(excluded.window, window), "
+    "similar_to = COALESCE(excluded.similar_to, similar_to), "
+    + "".join(
+        f"{column} = CASE WHEN excluded.content_hash = content_hash "
+        f"THEN COALESCE(excluded.{column}, {column}) ELSE excluded.{column} END, "
+        for column in ['pixel_hash', 'dhash'] + _BAND_COLUMNS)
+    + "content_hash = excluded.content_hash, mtime = excluded.mtime"
+)
+
+
+@dataclass
+class CaptureRecord:
+    """One indexed capture file."""
+    path: str
+    captured_at: float  # seconds since the epoch
+    size: int           # bytes on disk
+    width: int
+    height: int
+    monitor: Optional[int]  # monitor index the capture came from, if known
+    window: Optional[str]   # title of the captured window, if any
+    content_hash: str       # BLAKE2b-128 of the file contents, hex
+    mtime: float
+    pixel_hash: Optional[str] = None  # hash of the decoded pixels (library.dedupe)
+    dhash: Optional[int] = None       # 64-bit perceptual hash
+    similar_to: Optional[str] = None  # near-duplicate flagged when it was saved
+
+    def __post_init__(self):
+        if self.dhash is not None:
+            self.dhash = dedupe.from_signed(self.dhash)
+
+
+def library_folder() -> str:
+    """Per-user folder for the library database and thumbnails, created if missing."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser("~")
+        folder = os.path.join(base, "BretClip")
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser("~"), ".local", "share")
+        folder = os.path.join(base, "bretclip")
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def file_hash(path: str) -> str:
+    """Content hash used by the library (BLAKE2b, 128 bits, hex)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stamp_time(path: str) -> Optional[float]:
+    """Capture time encoded in a BretClip file name, or None."""
+    match = _STAMP.search(os.path.basename(path))
+    if not match:
+        return None
+    try:
+        stamp = datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").timestamp()
+    except ValueError:
+        return None
+    return stamp + int(match.group(2) or 0) / 1000
+
+
+def inspect_file(path: str, captured_at: Optional[float] = None, monitor: Optional[int] = None,
+                 window: Optional[str] = None, pixel_hash: Optional[str] = None,
+                 dhash: Optional[int] = None,
+                 similar_to: Optional[str] = None) -> Optional[CaptureRecord]:
+    """Build a record for an image file.
+
+    Only the image header is parsed for the dimensions; the pixels are not
+    decoded. Pixel and perceptual hashes are stored when given (the saver
+    computes them) and otherwise filled in later by
+    ScreenshotLibrary.backfill_hashes.
+
+    Args:
+        path: Image file
+        captured_at: Capture time (None = from the file name, else mtime)
+        monitor: Source monitor index, if known
+        window: Source window title, if known
+        pixel_hash: Hash of the saved pixels, if known
+        dhash: Perceptual hash of the saved pixels, if known
+        similar_to: Near-duplicate flagged when the file was saved
+
+    Returns:
+        The record, or None if the file is empty, missing or not an image
+    """
+    try:
+        stat = os.stat(path)
+        if stat.st_size == 0:
+            return None  # placeholder from allocate_path, not written yet
+        with Image.open(path) as image:
+            width, height = image.size
+        content_hash = file_hash(path)
+    except (OSError, Image.DecompressionBombError):
+        return None
+
+    if captured_at is None:
+        captured_at = _stamp_time(path) or stat.st_mtime
+    return CaptureRecord(os.path.abspath(path), captured_at, stat.st_size, width, height,
+                         monitor, window, content_hash, stat.st_mtime, pixel_hash, dhash,
+                         similar_to)
+
+
+class ScreenshotLibrary:
+    """Index of saved captures with a lazily built thumbnail cache.
+
+    Records live in a SQLite database (WAL mode) shared by the GUI thread
+    and the library's worker pool; file inspection (hashing, header
+    parsing) and thumbnail generation run on the pool.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, thumbnail_folder: Optional[str] = None,
+                 workers: Optional[int] = None):
+        """Open (or create) the library.
+
+        Args:
+            db_path: SQLite file (None = library.sqlite3 in library_folder())
+            thumbnail_folder: Thumbnail cache folder (None = thumbnails in library_folder())
+            workers: Worker threads (None = min(4, cores))
+        """
+        if db_path is None or thumbnail_folder is None:
+            folder = library_folder()
+            db_path = db_path or os.path.join(folder, "library.sqlite3")
+            thumbnail_folder = thumbnail_folder or os.path.join(folder, "thumbnails")
+
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+        self.executor = ThreadPoolExecutor(max_workers=workers or min(4, os.cpu_count() or 1),
+                                           thread_name_prefix="BretClipLibrary")
+        self.thumbnails = ThumbnailCache(thumbnail_folder, self.executor)
+
+        # Perceptual hashes by path, loaded on the first similarity search
+        # and kept in step with the database after that
+        self._similarity: Optional[HashIndex[str]] = None
+        self._similarity_lock = threading.Lock()
+
+    def _migrate(self):
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            self._db.executescript(_SCHEMA)
+            version = 1
+        for target in range(version + 1, _SCHEMA_VERSION + 1):
+            self._db.executescript(f"BEGIN; {_MIGRATIONS[target]} PRAGMA user_version={target}; COMMIT;")
+
+    # --- Recording -------------------------------------------------------
+
+    def add(self, path: str, captured_at: Optional[float] = None, monitor: Optional[int] = None,
+            window: Optional[str] = None, pixel_hash: Optional[str] = None,
+            dhash: Optional[int] = None, similar_to: Optional[str] = None) -> Optional[CaptureRecord]:
+        """Index (or re-index) one file; arguments as for :func:`inspect_file`.
+
+        Returns:
+            The stored record, or None if the file is not a readable image
+        """
+        record = inspect_file(path, captured_at, monitor, window, pixel_hash, dhash, similar_to)
+        if record is not None:
+            self._upsert([record])
+        return record
+
+    def add_async(self, path: str, **metadata) -> Future:
+        """Index a file on the worker pool; the future resolves to the record."""
+        return self.executor.submit(self.add, path, **metadata)
+
+    def record_job(self, job):
+        """Slot for SaveService.job_saved: index the saved file in the background.
+
+        Recognised job metadata keys: captured_at, monitor, window and the
+        pixel_hash, dhash and similar_to set by :meth:`check_duplicate`.
+        """
+        keys = ('captured_at', 'monitor', 'window', 'pixel_hash', 'dhash', 'similar_to')
+        metadata = {key: job.metadata[key] for key in keys if key in job.metadata}
+        self.add_async(job.path, **metadata)
+
+    def remove(self, path: str) -> bool:
+        """Drop a file from the index (the file itself is left alone)."""
+        path = os.path.abspath(path)
+        with self._lock, self._db:
+            cursor = self._db.execute("DELETE FROM captures WHERE path = ?", (path,))
+        self._update_similarity(removed=[path])
+        return cursor.rowcount > 0
+
+    def _upsert(self, records: Iterable[CaptureRecord]):
+        rows = []
+        for r in records:
+            dhash = dedupe.to_signed(r.dhash) if r.dhash is not None else None
+            hash_bands = dedupe.bands(r.dhash) if r.dhash is not None else [None] * dedupe.BANDS
+            rows.append((r.path, r.captured_at, r.size, r.width, r.height, r.monitor, r.window,
+                         r.content_hash, r.mtime, r.pixel_hash, dhash, r.similar_to, *hash_bands))
+        with self._lock, self._db:
+            # Metadata only known at save time survives a later re-scan;
+            # pixel hashes are dropped when the file contents changed
+            self._db.executemany(_UPSERT, rows)
+        # Re-read: a re-scan keeps the stored hash when the file is unchanged
+        self._update_similarity(refreshed=[row[0] for row in rows])
+
+    # --- Cold start ------------------------------------------------------
+
+    def scan(self, folder: Optional[str] = None) -> Tuple[int, int]:
+        """Bring the index in line with a folder's contents.
+
+        New and changed images (by size and mtime) are inspected in
+        parallel on the worker pool and written in one transaction; records
+        for files that disappeared from the folder are dropped. Unchanged
+        files are not read at all, so re-scanning a large folder is cheap.
+
+        Args:
+            folder: Folder to scan (None = screenshots folder); not recursive
+
+        Returns:
+            (records added or updated, records removed)
+        """
+        folder = os.path.abspath(folder or screenshots_folder())
+        with self._lock:
+            known = {
+                path: (size, mtime) for path, size, mtime in self._db.execute(
+                    "SELECT path, size, mtime FROM captures")
+                if os.path.dirname(path) == folder
+            }
+
+        present = set()
+        changed = []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                path = os.path.join(folder, entry.name)
+                present.add(path)
+                if known.get(path) != (stat.st_size, stat.st_mtime):
+                    changed.append(path)
+
+        records = [record for record in self.executor.map(inspect_file, changed) if record]
+        self._upsert(records)
+
+        missing = [(path,) for path in known if path not in present]
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM captures WHERE path = ?", missing)
+        self._update_similarity(removed=[path for path, in missing])
+        return len(records), len(missing)
+
+    def scan_async(self, folder: Optional[str] = None) -> Future:
+        """Run :meth:`scan`, then :meth:`backfill_hashes`, in a background thread.
+
+        The future resolves to scan()'s result once both have finished.
+        """
+        future = Future()
+
+        def run():
+            try:
+                result = self.scan(folder)
+                self.backfill_hashes()
+                future.set_result(result)
+            except BaseException as e:
+                print(f"Library scan failed: {e}")
+                future.set_exception(e)
+
+        # Not on the pool itself: scan() fans its work out onto the pool
+        threading.Thread(target=run, name="BretClipLibraryScan", daemon=True).start()
+        return future
+
+    def backfill_hashes(self) -> int:
+        """Compute pixel and perceptual hashes for records that lack them.
+
+        Files indexed by a scan have no hashes until their pixels are
+        decoded; this decodes them on the worker pool.
+
+        Returns:
+            Number of records updated
+        """
+        with self._lock:
+            pending = self._db.execute(
+                "SELECT path, content_hash FROM captures WHERE pixel_hash IS NULL").fetchall()
+
+        def hash_file(item):
+            path, content_hash = item
+            try:
+                with Image.open(path) as image:
+                    image.load()
+                    return path, content_hash, dedupe.pixel_hash(image), dedupe.dhash(image)
+            except (OSError, Image.DecompressionBombError):
+                return None
+
+        rows = []
+        for result in self.executor.map(hash_file, pending):
+            if result is not None:
+                path, content_hash, pixels, value = result
+                rows.append((pixels, dedupe.to_signed(value), *dedupe.bands(value),
+                             path, content_hash))
+        with self._lock, self._db:
+            # Skipped if the file changed while it was being hashed
+            self._db.executemany(
+                f"UPDATE captures SET pixel_hash = ?, dhash = ?, "
+                f"{', '.join(f'{column} = ?' for column in _BAND_COLUMNS)} "
+                "WHERE path = ? AND content_hash = ?", rows)
+        self._update_similarity(refreshed=[row[-2] for row in rows])
+        return len(rows)
+
+    # --- Duplicates ------------------------------------------------------
+
+    def find_exact(self, pixel_hash: str) -> Optional[CaptureRecord]:
+        """Newest capture with exactly these pixels whose file still exists."""
+        for record in self._select("pixel_hash = ?", (pixel_hash,)):
+            if os.path.isfile(record.path):
+                return record
+        return None
+
+    def find_similar(self, dhash: int, max_distance: int = dedupe.NEAR_DUPLICATE_DISTANCE,
+                     limit: Optional[int] = 10) -> List[Tuple[CaptureRecord, int]]:
+        """Captures whose perceptual hash is within max_distance bits.
+
+        Up to NEAR_DUPLICATE_DISTANCE the lookup only reads rows sharing a
+        hash band (indexed in SQLite); larger distances use the in-memory
+        multi-index (see :meth:`similar`).
+
+        Returns:
+            (record, distance) pairs, closest first
+        """
+        if max_distance > dedupe.NEAR_DUPLICATE_DISTANCE:
+            return self._records_for(self._similarity_index().search(dhash, max_distance, limit))
+
+        where = " OR ".join(f"{column} = ?" for column in _BAND_COLUMNS)
+        matches = []
+        for record in self._select(where, tuple(dedupe.bands(dhash))):
+            distance = dedupe.hamming(dhash, record.dhash)
+            if distance <= max_distance:
+                matches.append((record, distance))
+        matches.sort(key=lambda match: match[1])
+        return matches[:limit] if limit is not None else matches
+
+    def similar(self, query: Union[str, Image.Image], max_distance: int = 10,
+                limit: Optional[int] = 20) -> List[Tuple[CaptureRecord, int]]:
+        """Search by example: captures that look like an image.
+
+        Uses an in-memory multi-index over every stored perceptual hash
+        (library.similarity.HashIndex), built on first use.
+
+        Args:
+            query: Image, or path of an image file (indexed or not)
+            max_distance: Maximum dHash distance in bits (0-64; ~10 is
+                "visibly the same screen")
+            limit: Maximum results (None = all)
+
+        Returns:
+            (record, distance) pairs, closest first, excluding the query file
+
+        Raises:
+            OSError: If the query file cannot be read
+        """
+        exclude = None
+        if isinstance(query, str):
+            exclude = os.path.abspath(query)
+            record = self.get(exclude)
+            if record is not None and record.dhash is not None:
+                value = record.dhash
+            else:
+                with Image.open(query) as image:
+                    value = dedupe.dhash(image)
+        else:
+            value = dedupe.dhash(query)
+
+        matches = self._similarity_index().search(
+            value, max_distance, None if limit is None else limit + 1)
+        matches = [(path, distance) for path, distance in matches if path != exclude]
+        return self._records_for(matches[:limit] if limit is not None else matches)
+
+    def _records_for(self, matches: List[Tuple[str, int]]) -> List[Tuple[CaptureRecord, int]]:
+        """Attach records to (path, distance) pairs, keeping their order."""
+        records = {}
+        paths = [path for path, _ in matches]
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            for record in self._select(f"path IN ({', '.join('?' * len(chunk))})", tuple(chunk)):
+                records[record.path] = record
+        return [(records[path], distance) for path, distance in matches if path in records]
+
+    def _similarity_index(self) -> HashIndex:
+        with self._similarity_lock:
+            if self._similarity is None:
+                with self._lock:
+                    rows = self._db.execute(
+                        "SELECT path, dhash FROM captures WHERE dhash IS NOT NULL").fetchall()
+                index = HashIndex()
+                for path, value in rows:
+                    index.add(path, dedupe.from_signed(value))
+                self._similarity = index
+            return self._similarity
+
+    def _update_similarity(self, refreshed: Iterable[str] = (), removed: Iterable[str] = ()):
+        """Mirror database changes into the similarity index, if it is loaded."""
+        with self._similarity_lock:
+            index = self._similarity
+            if index is None:
+                return
+            for path in removed:
+                index.remove(path)
+            refreshed = list(refreshed)
+            for start in range(0, len(refreshed), 500):
+                chunk = refreshed[start:start + 500]
+                with self._lock:
+                    rows = dict(self._db.execute(
+                        f"SELECT path, dhash FROM captures WHERE path IN ({', '.join('?' * len(chunk))})",
+                        tuple(chunk)).fetchall())
+                for path in chunk:
+                    if rows.get(path) is not None:
+                        index.add(path, dedupe.from_signed(rows[path]))
+                    else:
+                        index.remove(path)
+
+    def check_duplicate(self, image: Image.Image, job) -> Optional[str]:
+        """SaveService duplicate check: hash a capture about to be saved.
+
+        Stores pixel_hash and dhash in the job's metadata (recorded with
+        the save) and flags the closest near-duplicate as similar_to.
+
+        Returns:
+            Path of an existing capture with identical pixels, or None
+        """
+        pixels = dedupe.pixel_hash(image)
+        value = dedupe.dhash(image)
+        job.metadata['pixel_hash'] = pixels
+        job.metadata['dhash'] = value
+
+        existing = self.find_exact(pixels)
+        if existing is not None:
+            return existing.path
+
+        similar = [(record, distance) for record, distance in self.find_similar(value, limit=None)
+                   if os.path.abspath(record.path) != os.path.abspath(job.path)]
+        if similar:
+            record, distance = similar[0]
+            job.metadata['similar_to'] = record.path
+            print(f"{job.path} looks like {record.path} ({distance} bits differ)")
+        return None
+
+    # --- Queries ---------------------------------------------------------
+
+    def _select(self, where: str = "", params: Tuple = (), order: str = "captured_at DESC",
+                limit: Optional[int] = None, offset: int = 0) -> List[CaptureRecord]:
+        sql = f"SELECT {_COLUMNS} FROM captures"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += (limit, offset)
+        with self._lock:
+            return [CaptureRecord(*row) for row in self._db.execute(sql, params)]
+
+    def get(self, path: str) -> Optional[CaptureRecord]:
+        """Record for a path, or None if it is not indexed."""
+        records = self._select("path = ?", (os.path.abspath(path),))
+        return records[0] if records else None
+
+    def recent(self, limit: int = 50, offset: int = 0) -> List[CaptureRecord]:
+        """Newest captures first."""
+        return self._select(limit=limit, offset=offset)
+
+    def search(self, since: Optional[float] = None, until: Optional[float] = None,
+               window: Optional[str] = None, monitor: Optional[int] = None,
+               limit: Optional[int] = 100) -> List[CaptureRecord]:
+        """Captures matching all given filters, newest first.
+
+        Args:
+            since: Earliest capture time (epoch seconds), inclusive
+            until: Latest capture time, exclusive
+            window: Substring of the source window title (case-insensitive)
+            monitor: Source monitor index
+            limit: Maximum number of records (None = all)
+        """
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("captured_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("captured_at < ?")
+            params.append(until)
+        if window:
+            clauses.append("window LIKE ?")
+            params.append(f"%{window}%")
+        if monitor is not None:
+            clauses.append("monitor = ?")
+            params.append(monitor)
+        return self._select(" AND ".join(clauses), tuple(params), limit=limit)
+
+    def find_by_hash(self, content_hash: str) -> List[CaptureRecord]:
+        """Captures whose file contents hash to content_hash."""
+        return self._select("content_hash = ?", (content_hash,))
+
+    def stats(self) -> Dict:
+        """Record count, total bytes and capture time range."""
+        with self._lock:
+            count, total, first, last = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(captured_at), MAX(captured_at) "
+                "FROM captures").fetchone()
+        return {'captures': count, 'bytes': total, 'first': first, 'last': last}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM captures").fetchone()[0]
+
+    # --- Thumbnails ------------------------------------------------------
+
+    def thumbnail(self, record: CaptureRecord) -> Optional[str]:
+        """Cached thumbnail path, scheduling a build (see ThumbnailCache.ready) if missing."""
+        path = self.thumbnails.cached(record.content_hash)
+        if path is None:
+            self.thumbnails.request(record.path, record.content_hash)
+        return path
+
+    def close(self):
+        """Finish background work and close the database."""
+        self.executor.shutdown(wait=True)
+        with self._lock:
+            self._db.close()
+
+
+_library: Optional[ScreenshotLibrary] = None
+_library_lock = threading.Lock()
+
+
+def get_library() -> ScreenshotLibrary:
+    """Get the shared, process-wide library."""
+    global _library
+    with _library_lock:
+        if _library is None:
+            _library = ScreenshotLibrary()
+        return _library
@@ -0,0 +1,145 @@
+"""In-memory multi-index Hamming search over 64-bit perceptual hashes."""
+
+from array import array
+from itertools import combinations
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from . import dedupe
+
+Key = TypeVar('Key', bound=Hashable)
+
+_BAND_MASK = (1 << dedupe.BAND_BITS) - 1
+_probe_cache: Dict[int, List[int]] = {}
+
+
+def _probes(max_bits: int) -> List[int]:
+    """Every band-sized XOR mask with at most max_bits bits set."""
+    masks = _probe_cache.get(max_bits)
+    if masks is None:
+        masks = [0]
+        for count in range(1, max_bits + 1):
+            for bits in combinations(range(dedupe.BAND_BITS), count):
+                mask = 0
+                for bit in bits:
+                    mask |= 1 << bit
+                masks.append(mask)
+        _probe_cache[max_bits] = masks
+    return masks
+
+
+class HashIndex(Generic[Key]):
+    """Multi-index hashing (Norouzi et al.) for Hamming-radius queries.
+
+    Each 64-bit hash is split into BANDS 16-bit substrings and every
+    substring gets its own table of buckets. Two hashes within r bits agree
+    to within r // BANDS bits on at least one substring (pigeonhole), so a
+    query only probes the buckets near each of its own substrings and
+    verifies those candidates, instead of comparing against every hash.
+
+    Entries are identified by a caller-chosen key (the library uses file
+    paths); adding a key again replaces its hash.
+    """
+
+    # Past this many probes per band a linear scan is cheaper
+    MAX_PROBES = 2517  # every mask with up to 4 of 16 bits set
+
+    # Tombstones always tolerated before remove() considers compacting
+    COMPACT_MIN = 1024
+
+    def __init__(self):
+        self._hashes = array('Q')
+        self._keys: List[Optional[Key]] = []
+        self._ids: Dict[Key, int] = {}
+        # One bucket table per band: band value -> array of entry ids
+        self._tables: List[Dict[int, array]] = [{} for _ in range(dedupe.BANDS)]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key) -> bool:
+        return key in self._ids
+
+    def add(self, key: Key, value: int):
+        """Insert a hash, replacing any previous hash for the key."""
+        if key in self._ids:
+            self.remove(key)
+        entry = len(self._keys)
+        self._hashes.append(value)
+        self._keys.append(key)
+        self._ids[key] = entry
+        for table, band in zip(self._tables, dedupe.bands(value)):
+            bucket = table.get(band)
+            if bucket is None:
+                table[band] = array('l', (entry,))
+            else:
+                bucket.append(entry)
+
+    def remove(self, key: Key) -> bool:
+        """Drop a key.
+
+        Its slot is left as a tombstone; the tables are compacted once
+        tombstones outnumber live entries.
+        """
+        entry = self._ids.pop(key, None)
+        if entry is None:
+            return False
+        self._keys[entry] = None
+        dead = len(self._keys) - len(self._ids)
+        if dead > self.COMPACT_MIN and dead > len(self._ids):
+            self.compact()
+        return True
+
+    def compact(self):
+        """Rebuild the tables without the tombstones left by remove()."""
+        live = [(key, self._hashes[entry]) for key, entry in self._ids.items()]
+        self.__init__()
+        for key, value in live:
+            self.add(key, value)
+
+    def search(self, value: int, max_distance: int,
+               limit: Optional[int] = None) -> List[Tuple[Key, int]]:
+        """Keys whose hash is within max_distance bits of value.
+
+        Args:
+            value: Query hash
+            max_distance: Hamming radius, 0-64
+            limit: Maximum results (None = all)
+
+        Returns:
+            (key, distance) pairs, closest first
+        """
+        hamming = dedupe.hamming
+        hashes, keys = self._hashes, self._keys
+        band_bits = max_distance // dedupe.BANDS
+        probes = _probes(band_bits) if band_bits <= 4 else None
+
+        if probes is None or len(probes) > self.MAX_PROBES or len(probes) * dedupe.BANDS > len(keys):
+            candidates = range(len(keys))
+        else:
+            candidates = set()
+            for table, band in zip(self._tables, dedupe.bands(value)):
+                for mask in probes:
+                    bucket = table.get(band ^ mask)
+                    if bucket is not None:
+                        candidates.update(bucket)
+
+        matches = []
+        for entry in candidates:
+            key = keys[entry]
+            if key is None:
+                continue
+            distance = hamming(value, hashes[entry])
+            if distance <= max_distance:
+                matches.append((key, distance))
+        matches.sort(key=lambda match: match[1])
+        return matches[:limit] if limit is not None else matches
+
+    def nearest(self, value: int, count: int = 10,
+                max_distance: int = dedupe.HASH_BITS) -> List[Tuple[Key, int]]:
+        """The count closest keys, searching outward one band-radius at a time."""
+        radius = dedupe.BANDS - 1
+        while True:
+            matches = self.search(value, min(radius, max_distance))
+            if len(matches) >= count or radius >= max_distance:
+                return matches[:count]
+            radius += dedupe.BANDS
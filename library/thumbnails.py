@@ -0,0 +1,87 @@
+"""Disk-backed thumbnail cache for the screenshot library."""
+
+import os
+import sys
+import threading
+from concurrent.futures import Executor, Future
+from typing import Dict, Optional
+
+from PIL import Image
+from PyQt5.QtCore import QObject, pyqtSignal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.saver import write_atomic
+
+
+class ThumbnailCache(QObject):
+    """JPEG thumbnails keyed by capture content hash, built on demand.
+
+    Thumbnails are stored as ``<folder>/<hash[:2]>/<hash>-<size>.jpg``, so
+    identical captures share one thumbnail and a renamed or moved file
+    keeps its thumbnail. Builds run on the given executor; concurrent
+    requests for the same thumbnail share a single build.
+    """
+
+    ready = pyqtSignal(str, str)  # content hash, thumbnail path
+
+    def __init__(self, folder: str, executor: Executor, size: int = 256, parent=None):
+        """Create the cache.
+
+        Args:
+            folder: Cache folder (created if missing)
+            executor: Pool the thumbnails are built on
+            size: Longest thumbnail edge in pixels
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.folder = folder
+        self.size = size
+        self._executor = executor
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    def path_for(self, content_hash: str) -> str:
+        """Where the thumbnail for a hash is (or will be) stored."""
+        return os.path.join(self.folder, content_hash[:2], f"{content_hash}-{self.size}.jpg")
+
+    def cached(self, content_hash: str) -> Optional[str]:
+        """Thumbnail path if it has been built, else None."""
+        path = self.path_for(content_hash)
+        return path if os.path.exists(path) else None
+
+    def request(self, source_path: str, content_hash: str) -> Future:
+        """Build a thumbnail in the background unless it is cached.
+
+        Returns:
+            Future resolving to the thumbnail path; :attr:`ready` is also
+            emitted when a new thumbnail has been written
+        """
+        cached = self.cached(content_hash)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        with self._lock:
+            future = self._pending.get(content_hash)
+            if future is None:
+                future = self._executor.submit(self._build, source_path, content_hash)
+                self._pending[content_hash] = future
+                future.add_done_callback(lambda _: self._forget(content_hash))
+            return future
+
+    def _forget(self, content_hash: str):
+        with self._lock:
+            self._pending.pop(content_hash, None)
+
+    def _build(self, source_path: str, content_hash: str) -> str:
+        path = self.path_for(content_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with Image.open(source_path) as image:
+            # Lets JPEG decode at a reduced scale instead of full size
+            image.draft('RGB', (self.size, self.size))
+            image.thumbnail((self.size, self.size), reducing_gap=2.0)
+            write_atomic(image, path, 'JPEG', quality=85)
+        self.ready.emit(content_hash, path)
+        return path
@@ -0,0 +1,14 @@
+from .saver import (SaveService, SaveJob, get_save_service, encode_image, write_atomic,
+                    link_atomic)
+from .naming import allocate_path, screenshots_folder
+from .profiles import EncodingProfile, PROFILES, get_profile
+from .pngwriter import save_png
+from .formats import OutputFormat, available_formats, format_for_path, get_format
+
+__all__ = [
+    'SaveService', 'SaveJob', 'get_save_service', 'encode_image', 'write_atomic',
+    'link_atomic',
+    'allocate_path', 'screenshots_folder',
+    'EncodingProfile', 'PROFILES', 'get_profile', 'save_png',
+    'OutputFormat', 'available_formats', 'format_for_path', 'get_format'
+]
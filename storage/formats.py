@@ -0,0 +1,108 @@
+"""Output formats for saved captures beyond Pillow's defaults."""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+
+@dataclass(frozen=True)
+class OutputFormat:
+    """A file format with its encoder settings.
+
+    Effort and quality are on a 0-100 scale for every format and are mapped
+    onto each encoder's own knobs by :meth:`save_options`.
+
+    Attributes:
+        name: Format key ('png', 'webp-lossless', 'webp', 'avif')
+        pil_format: Pillow format name
+        extension: File extension including the dot
+        description: Label for file dialogs
+        lossless: Whether decoded pixels match the source exactly
+        effort: Default encoder effort, 0 (fastest) to 100 (smallest)
+        quality: Default quality for lossy formats, 0-100
+    """
+    name: str
+    pil_format: str
+    extension: str
+    description: str
+    lossless: bool
+    effort: int = 50
+    quality: int = 90
+
+    def save_options(self, effort: Optional[int] = None,
+                     quality: Optional[int] = None) -> Dict:
+        """Keyword arguments for Image.save.
+
+        Args:
+            effort: 0-100, None = the format's default
+            quality: 0-100 (lossy formats), None = the format's default
+
+        Returns:
+            Encoder options (empty for PNG, which uses encoding profiles)
+        """
+        effort = self.effort if effort is None else max(0, min(100, effort))
+        quality = self.quality if quality is None else max(0, min(100, quality))
+
+        if self.pil_format == 'WEBP':
+            # libwebp: method 0-6 is the speed/size trade-off; in lossless
+            # mode "quality" is more effort, not fidelity
+            method = round(effort * 6 / 100)
+            if self.lossless:
+                return {'lossless': True, 'quality': effort, 'method': method}
+            return {'quality': quality, 'method': method}
+
+        if self.pil_format == 'AVIF':
+            # speed 10 is fastest, 0 slowest; full chroma keeps text crisp
+            return {'quality': quality, 'speed': 10 - round(effort / 10),
+                    'subsampling': '4:4:4'}
+
+        return {}
+
+
+PNG = OutputFormat('png', 'PNG', '.png', "PNG Image", lossless=True)
+# Defaults keep a 1080p capture well under a second on one core; higher
+# efforts mostly pay off on UI captures, at several seconds per photo
+WEBP_LOSSLESS = OutputFormat('webp-lossless', 'WEBP', '.webp', "WebP Image, lossless",
+                             lossless=True, effort=20)
+WEBP = OutputFormat('webp', 'WEBP', '.webp', "WebP Image", lossless=False)
+# Pillow encodes AVIF through YUV, so even quality 100 is not bit-exact
+AVIF = OutputFormat('avif', 'AVIF', '.avif', "AVIF Image", lossless=False, effort=30)
+
+AUTOSAVE_FORMAT = 'png'
+
+
+def _can_save(pil_format: str) -> bool:
+    Image.init()
+    return pil_format in Image.SAVE
+
+
+def available_formats() -> List[OutputFormat]:
+    """Formats the installed Pillow can write, PNG first."""
+    return [output_format for output_format in (PNG, WEBP_LOSSLESS, WEBP, AVIF)
+            if _can_save(output_format.pil_format)]
+
+
+def get_format(name: str) -> OutputFormat:
+    """Look up an available output format by name.
+
+    Raises:
+        ValueError: If the format is unknown or Pillow cannot write it
+    """
+    for output_format in available_formats():
+        if output_format.name == name:
+            return output_format
+    raise ValueError(f"Unsupported output format: {name!r}")
+
+
+def format_for_path(path: str) -> Optional[OutputFormat]:
+    """The available format a file name implies, or None if it names none.
+
+    ``.webp`` maps to lossless WebP, which suits screenshots best.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for output_format in available_formats():
+        if output_format.extension == extension:
+            return output_format
+    return None
@@ -0,0 +1,79 @@
+"""Collision-free file names for autosaved captures."""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+# Last timestamp handed out in this process and how many names used it
+_last_stamp = ""
+_sequence = 0
+_lock = threading.Lock()
+
+
+def screenshots_folder() -> str:
+    """The autosave folder (~/Pictures/Screenshots), created if missing."""
+    folder = os.path.join(os.path.expanduser("~"), "Pictures", "Screenshots")
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def _next_stamp(now: Optional[float] = None):
+    """Millisecond timestamp plus a per-process sequence number for it.
+
+    Names are only reused across processes, never within one: two calls in
+    the same millisecond get sequence 0 and 1.
+    """
+    global _last_stamp, _sequence
+    now = time.time() if now is None else now
+    stamp = datetime.fromtimestamp(now).strftime("%Y%m%d_%H%M%S")
+    stamp += f"_{int(now * 1000) % 1000:03d}"
+    with _lock:
+        if stamp == _last_stamp:
+            _sequence += 1
+        else:
+            _last_stamp = stamp
+            _sequence = 0
+        return stamp, _sequence
+
+
+def allocate_path(folder: Optional[str] = None, prefix: str = "BretClip",
+                  extension: str = ".png") -> str:
+    """Reserve a new, unique file path for a capture.
+
+    The name is ``<prefix>_<YYYYmmdd_HHMMSS_mmm>[_<n>]<extension>``. The file
+    is created empty with O_EXCL, so the name belongs to the caller even if
+    other threads or BretClip processes allocate in the same millisecond;
+    on a clash the counter is bumped and creation retried. Write the real
+    contents over the placeholder (e.g. with write_atomic).
+
+    Args:
+        folder: Destination folder (None = screenshots folder)
+        prefix: File name prefix
+        extension: File extension including the dot
+
+    Returns:
+        Absolute path of the reserved (empty) file
+    """
+    global _sequence
+    folder = folder or screenshots_folder()
+    stamp, sequence = _next_stamp()
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+    while True:
+        suffix = f"_{sequence}" if sequence else ""
+        path = os.path.join(folder, f"{prefix}_{stamp}{suffix}{extension}")
+        try:
+            fd = os.open(path, flags, 0o666)
+        except FileExistsError:
+            sequence += 1
+            continue
+        os.close(fd)
+        break
+
+    # Skip numbers other processes already took for this millisecond
+    with _lock:
+        if stamp == _last_stamp and sequence > _sequence:
+            _sequence = sequence
+    return os.path.abspath(path)
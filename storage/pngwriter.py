@@ -0,0 +1,211 @@
+"""Multi-core PNG encoder for very large captures.
+
+Pillow compresses a PNG as one zlib stream on one core. Here the image is
+cut into horizontal bands which are filtered and deflated on a thread pool
+(zlib releases the GIL), pigz-style: every band but the last ends with a
+sync flush so its deflate blocks stop on a byte boundary, and each band is
+primed with the previous 32 KiB of filtered data so compression barely
+suffers at the seams. The band outputs concatenate into a single zlib
+stream that any PNG decoder reads.
+"""
+
+import math
+import os
+import struct
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Optional, Tuple
+
+from PIL import Image, ImageChops
+
+# Captures smaller than this encode faster with Pillow than the pool spin-up
+PARALLEL_MIN_PIXELS = 8_000_000
+
+# Target amount of raw scanline data per band
+BAND_BYTES = 1 << 20
+
+# PNG colour type and bytes per pixel for the modes encoded here
+_COLOR_TYPES = {
+    'L': (0, 1),
+    'RGB': (2, 3),
+    'P': (3, 1),
+    'RGBA': (6, 4),
+}
+
+_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_WINDOW = 32768
+_ADLER_BASE = 65521
+
+# PNG filter types produced by _filter_band
+_FILTER_NONE, _FILTER_SUB, _FILTER_UP = 0, 1, 2
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                           thread_name_prefix="BretClipPNG")
+        return _executor
+
+
+def can_encode(image: Image.Image) -> bool:
+    """Whether :func:`save_png` can write this image without losing data."""
+    if image.mode not in _COLOR_TYPES:
+        return False
+    # Metadata Pillow would write as extra chunks
+    return not any(key in image.info for key in ('transparency', 'icc_profile'))
+
+
+def _chunk(fp: BinaryIO, kind: bytes, data: bytes):
+    fp.write(struct.pack('>I', len(data)))
+    fp.write(kind)
+    fp.write(data)
+    fp.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind))))
+
+
+def _adler32_combine(adler1: int, adler2: int, length2: int) -> int:
+    """Adler-32 of A + B from the checksums of A and B (zlib's adler32_combine)."""
+    remainder = length2 % _ADLER_BASE
+    sum1 = adler1 & 0xffff
+    sum2 = (remainder * sum1) % _ADLER_BASE
+    sum1 = (sum1 + (adler2 & 0xffff) + _ADLER_BASE - 1) % _ADLER_BASE
+    sum2 = (sum2 + (adler1 >> 16) + (adler2 >> 16) + _ADLER_BASE - remainder) % _ADLER_BASE
+    return sum1 | (sum2 << 16)
+
+
+def _zlib_header(level: int) -> bytes:
+    flevel = 0 if level in (0, 1) else 1 if level < 6 else 2 if level == 6 else 3
+    cmf, flg = 0x78, flevel << 6
+    flg |= 31 - ((cmf << 8) | flg) % 31
+    return bytes((cmf, flg))
+
+
+def _filter_band(image: Image.Image, top: int, bottom: int, bpp: int) -> bytes:
+    """Filtered scanlines (filter byte + row) for rows top..bottom-1.
+
+    Each row gets whichever of None, Sub and Up has the smallest sum of
+    absolute (signed) byte values, the usual PNG heuristic; the differences
+    are computed by Pillow in C. Palette images always use None.
+    """
+    width = image.width
+    stride = width * bpp
+    rows = image.crop((0, top, width, bottom))
+    if image.mode == 'P':
+        data = rows.tobytes()
+        return b''.join(b'\x00' + data[i:i + stride] for i in range(0, len(data), stride))
+
+    # Pixels outside the image crop as zero, which is what the filters expect
+    candidates = [
+        rows,
+        ImageChops.subtract_modulo(rows, image.crop((-1, top, width - 1, bottom))),
+        ImageChops.subtract_modulo(rows, image.crop((0, top - 1, width, bottom - 1))),
+    ]
+    lut = [min(v, 256 - v) for v in range(256)] * bpp
+    # Mean |value| per row and channel, via a box downscale to one column
+    scores = [
+        candidate.point(lut).resize((1, bottom - top), Image.BOX).tobytes()
+        for candidate in candidates
+    ]
+    data = [candidate.tobytes() for candidate in candidates]
+
+    parts = []
+    for row in range(bottom - top):
+        offset = row * bpp
+        choice = min((_FILTER_NONE, _FILTER_SUB, _FILTER_UP),
+                     key=lambda f: sum(scores[f][offset:offset + bpp]))
+        start = row * stride
+        parts.append(bytes((choice,)))
+        parts.append(data[choice][start:start + stride])
+    return b''.join(parts)
+
+
+def _encode_band(image: Image.Image, top: int, bottom: int, bpp: int, level: int,
+                 strategy: int, last: bool) -> Tuple[bytes, int, int]:
+    """Filter and deflate one band.
+
+    Returns:
+        (raw deflate data, Adler-32 of the filtered bytes, filtered length)
+    """
+    # Re-filter enough preceding rows to prime the window like a single
+    # stream would have it
+    context_rows = min(top, math.ceil(_WINDOW / (image.width * bpp + 1)))
+    filtered = _filter_band(image, top - context_rows, bottom, bpp)
+    split = context_rows * (image.width * bpp + 1)
+    band = memoryview(filtered)[split:]
+
+    if context_rows:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, 8, strategy,
+                                      zdict=filtered[max(0, split - _WINDOW):split])
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, 8, strategy)
+    compressed = compressor.compress(band)
+    compressed += compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+    return compressed, zlib.adler32(band), len(band)
+
+
+def save_png(image: Image.Image, fp: BinaryIO, compress_level: int = 6,
+             strategy: int = zlib.Z_DEFAULT_STRATEGY, workers: Optional[int] = None):
+    """Write an image as PNG, compressing bands in parallel.
+
+    Args:
+        image: Image in L, RGB, RGBA or P mode (see :func:`can_encode`)
+        fp: Binary file object to write to
+        compress_level: zlib level, 0-9
+        strategy: zlib strategy
+        workers: Threads to use (None = shared pool with one per core,
+            1 = encode on the calling thread)
+
+    Raises:
+        ValueError: If the image mode or metadata is not supported
+    """
+    if not can_encode(image):
+        raise ValueError(f"Cannot encode {image.mode} image in parallel")
+    image.load()
+    color_type, bpp = _COLOR_TYPES[image.mode]
+    width, height = image.size
+    band_rows = max(1, BAND_BYTES // (width * bpp + 1))
+    bands = [(top, min(top + band_rows, height)) for top in range(0, height, band_rows)]
+
+    def encode(band):
+        top, bottom = band
+        return _encode_band(image, top, bottom, bpp, compress_level, strategy,
+                            bottom == height)
+
+    fp.write(_SIGNATURE)
+    _chunk(fp, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+    if image.mode == 'P':
+        palette = image.getpalette() or []
+        _chunk(fp, b'PLTE', bytes(palette[:3 * max(1, len(palette) // 3)]))
+
+    if workers == 1:
+        results = map(encode, bands)
+        pool = None
+    elif workers is None:
+        results = _shared_executor().map(encode, bands)
+        pool = None
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="BretClipPNG")
+        results = pool.map(encode, bands)
+
+    try:
+        # One IDAT per band; the zlib header and checksum wrap the whole run
+        adler = 1
+        first = True
+        for compressed, band_adler, length in results:
+            if first:
+                compressed = _zlib_header(compress_level) + compressed
+                first = False
+            adler = _adler32_combine(adler, band_adler, length)
+            if compressed:
+                _chunk(fp, b'IDAT', compressed)
+        _chunk(fp, b'IDAT', struct.pack('>I', adler))
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    _chunk(fp, b'IEND', b'')
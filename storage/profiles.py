@@ -0,0 +1,93 @@
+"""Named PNG encoding profiles trading encode time against file size."""
+
+import zlib
+from dataclasses import dataclass
+from typing import Dict
+
+from PIL import Image, ImageChops
+
+
+@dataclass(frozen=True)
+class EncodingProfile:
+    """PNG encoder settings.
+
+    Attributes:
+        name: Profile name
+        compress_level: zlib level, 0 (store) to 9 (smallest)
+        strategy: zlib strategy applied to the filtered scanlines
+            (zlib.Z_DEFAULT_STRATEGY, Z_FILTERED, Z_RLE, ...)
+        optimize: Let Pillow spend extra effort on the smallest output
+        reduce_palette: Store images with at most 256 colours as palette
+            PNGs (lossless; large win on flat UI captures)
+    """
+    name: str
+    compress_level: int
+    strategy: int = zlib.Z_DEFAULT_STRATEGY
+    optimize: bool = False
+    reduce_palette: bool = False
+
+    def png_options(self) -> Dict:
+        """Keyword arguments for ``Image.save(..., format='PNG')``."""
+        return {
+            'compress_level': self.compress_level,
+            'compress_type': self.strategy,
+            'optimize': self.optimize,
+        }
+
+    def prepare(self, image: Image.Image) -> Image.Image:
+        """Apply lossless pixel-format reductions before encoding."""
+        if self.reduce_palette:
+            return reduce_to_palette(image)
+        return image
+
+
+# Pillow adaptively picks the PNG row filter per scanline; the zlib strategy
+# is the knob on top. Z_RLE is faster still but inflates text-heavy captures
+# several-fold, so "fast" keeps the default strategy at level 1.
+PROFILES: Dict[str, EncodingProfile] = {
+    'fast': EncodingProfile('fast', compress_level=1),
+    'balanced': EncodingProfile('balanced', compress_level=6),
+    'smallest': EncodingProfile('smallest', compress_level=9, strategy=zlib.Z_FILTERED,
+                                optimize=True, reduce_palette=True),
+}
+
+AUTOSAVE_PROFILE = 'fast'
+SAVE_AS_PROFILE = 'balanced'
+
+
+def get_profile(name: str) -> EncodingProfile:
+    """Look up a profile by name.
+
+    Raises:
+        ValueError: If there is no such profile
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown encoding profile: {name!r} "
+                         f"(expected one of {', '.join(PROFILES)})") from None
+
+
+def reduce_to_palette(image: Image.Image) -> Image.Image:
+    """Losslessly convert an image with at most 256 colours to mode P.
+
+    Images with more colours or partial transparency, or whose palette
+    would not reproduce every pixel exactly, are returned unchanged.
+    """
+    if image.mode == 'RGBA':
+        alpha = image.getchannel('A')
+        if alpha.getextrema() != (255, 255):
+            return image
+        image = image.convert('RGB')
+    elif image.mode != 'RGB':
+        return image
+
+    if image.getcolors(256) is None:
+        return image
+
+    # Median cut gives every colour its own box when there are at most 256
+    reduced = image.quantize(colors=256, method=Image.Quantize.MEDIANCUT,
+                             dither=Image.Dither.NONE)
+    if ImageChops.difference(reduced.convert('RGB'), image).getbbox() is not None:
+        return image
+    return reduced
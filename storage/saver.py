@@ -0,0 +1,327 @@
+"""Background image saving with atomic writes."""
+
+import os
+import queue
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Dict, Optional, Union
+
+from PIL import Image
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from . import pngwriter
+from .profiles import get_profile
+
+# An image, or a callable producing one on the worker thread (so pixel
+# conversion happens off the GUI thread too)
+ImageSource = Union[Image.Image, Callable[[], Image.Image]]
+
+
+@dataclass
+class SaveJob:
+    """One queued save."""
+    source: ImageSource
+    path: str
+    tag: str = ""
+    format: Optional[str] = None
+    options: Dict = field(default_factory=dict)
+    reserved: bool = False  # path is an empty placeholder from allocate_path
+    profile: Optional[str] = None  # PNG encoding profile name
+    metadata: Dict = field(default_factory=dict)  # e.g. capture time/monitor for the library
+    deduplicate: bool = False  # consult SaveService.duplicate_check before writing
+
+
+def _fsync_directory(path: str):
+    """Flush a directory entry so a rename survives power loss (POSIX only)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # Windows cannot open directories; NTFS journals the rename
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def encode_image(image: Image.Image, fp: BinaryIO, format: str,
+                 profile: Optional[str] = None, **options):
+    """Encode an image into an open file the way saved captures are encoded.
+
+    Args:
+        image: Image to encode
+        fp: Binary file object to write to
+        format: PIL format name
+        profile: PNG encoding profile name (see storage.profiles); ignored
+            for other formats. Explicit options override its settings.
+            On a multi-core machine, large captures encoded with only a
+            profile (and no ``optimize``) are compressed on all cores by
+            storage.pngwriter.
+        **options: Encoder options passed to Image.save
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    if format == 'JPEG' and image.mode in ('RGBA', 'LA', 'P'):
+        # JPEG has no alpha; flatten onto white like the editor always has
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.convert('RGBA').split()[3])
+        image = background
+
+    if profile is not None and format == 'PNG':
+        encoding = get_profile(profile)
+        image = encoding.prepare(image)
+        # Banding only pays with several cores, and cannot do optimize's
+        # extra search
+        if (not options and not encoding.optimize and (os.cpu_count() or 1) > 1
+                and pngwriter.can_encode(image)
+                and image.width * image.height >= pngwriter.PARALLEL_MIN_PIXELS):
+            pngwriter.save_png(image, fp, encoding.compress_level, encoding.strategy)
+            return
+        options = {**encoding.png_options(), **options}
+    image.save(fp, format=format, **options)
+
+
+def write_atomic(image: Image.Image, path: str, format: Optional[str] = None,
+                 profile: Optional[str] = None, **options):
+    """Write an image so readers never see a partial file.
+
+    The image is encoded into a temp file in the destination directory,
+    flushed to disk with fsync, then renamed over the destination.
+
+    Args:
+        image: Image to write
+        path: Final file path
+        format: PIL format name (None = from the file extension)
+        profile: PNG encoding profile name (see :func:`encode_image`)
+        **options: Encoder options passed to Image.save
+
+    Raises:
+        OSError: If the file cannot be written; no temp file is left behind
+        ValueError: If the profile name is unknown
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if format is None:
+        extension = os.path.splitext(path)[1].lower()
+        format = Image.registered_extensions().get(extension, 'PNG')
+    if profile is not None and format == 'PNG':
+        get_profile(profile)  # Unknown names fail before a temp file exists
+
+    # Created like a normal file (honours the umask, unlike mkstemp's 0600)
+    temp_path = os.path.join(directory, f".bretclip-{uuid.uuid4().hex}.tmp")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    fd = os.open(temp_path, flags, 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            encode_image(image, f, format, profile, **options)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    _fsync_directory(directory)
+
+
+def link_atomic(existing: str, path: str):
+    """Make path a hard link to an existing file, replacing whatever is there.
+
+    Raises:
+        OSError: If the file system cannot hard-link (e.g. across volumes)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    temp_path = os.path.join(directory, f".bretclip-{uuid.uuid4().hex}.tmp")
+    os.link(existing, temp_path)
+    try:
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+class SaveService(QObject):
+    """Encodes and writes images on worker threads.
+
+    Jobs go into a bounded queue; when it is full, :meth:`submit` blocks
+    until a worker frees a slot, so a burst of captures cannot pile up
+    unbounded image memory. Results are reported through Qt signals, which
+    are delivered on the GUI thread.
+
+    Jobs submitted with ``deduplicate=True`` are first passed to
+    :attr:`duplicate_check` (if set) on the worker. When it names an
+    existing file with identical pixels, the new path becomes a hard link
+    to it instead of a second encode; if linking is impossible the save is
+    skipped and ``saved`` reports the existing file.
+    """
+
+    saved = pyqtSignal(str, str)         # path, tag
+    failed = pyqtSignal(str, str, str)   # path, tag, error message
+    job_saved = pyqtSignal(object)       # the finished SaveJob (source released)
+
+    def __init__(self, workers: int = 2, max_pending: int = 8, parent=None):
+        """Start the worker threads.
+
+        Args:
+            workers: Number of encoder threads
+            max_pending: Maximum queued (not yet started) jobs
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self._queue: "queue.Queue[Optional[SaveJob]]" = queue.Queue(maxsize=max_pending)
+        # (image, job) -> path of an existing identical capture, or None
+        self.duplicate_check: Optional[Callable[[Image.Image, SaveJob], Optional[str]]] = None
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._run, name=f"BretClipSaver-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, source: ImageSource, path: str, tag: str = "",
+               format: Optional[str] = None, reserved: bool = False,
+               profile: Optional[str] = None, metadata: Optional[Dict] = None,
+               deduplicate: bool = False, **options) -> SaveJob:
+        """Queue an image to be written to path.
+
+        Args:
+            source: PIL Image, or a callable returning one (run on the worker)
+            path: Destination file
+            tag: Free-form label echoed back in the saved/failed signals
+            format: PIL format name (None = from the file extension)
+            reserved: path is a placeholder from allocate_path; it is
+                removed again if the save fails
+            profile: PNG encoding profile name (None = Pillow defaults)
+            metadata: Extra information echoed back with job_saved
+            deduplicate: Link to an identical existing capture instead of
+                writing a copy (see the class docs)
+            **options: Encoder options passed to Image.save
+
+        Returns:
+            The queued job
+        """
+        job = SaveJob(source, path, tag, format, options, reserved, profile, dict(metadata or {}),
+                      deduplicate)
+        self._queue.put(job)
+        return job
+
+    def pending(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    def wait(self):
+        """Block until every submitted job has finished."""
+        self._queue.join()
+
+    def shutdown(self, wait: bool = True):
+        """Finish queued jobs and stop the workers.
+
+        Args:
+            wait: Block until the workers have exited
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._process(job)
+            finally:
+                self._queue.task_done()
+            # Don't keep the last image alive while idle
+            job = None
+
+    def _process(self, job: SaveJob):
+        try:
+            image = job.source() if callable(job.source) else job.source
+            duplicate = self._find_duplicate(image, job)
+            if duplicate is not None and self._link_duplicate(duplicate, job):
+                return
+            write_atomic(image, job.path, job.format, job.profile, **job.options)
+        except Exception as e:
+            if job.reserved:
+                try:
+                    os.remove(job.path)
+                except OSError:
+                    pass
+            print(f"Save failed for {job.path}: {e}")
+            self.failed.emit(job.path, job.tag, str(e))
+            return
+        job.source = None
+        self.saved.emit(job.path, job.tag)
+        self.job_saved.emit(job)
+
+    def _find_duplicate(self, image: Image.Image, job: SaveJob) -> Optional[str]:
+        """Existing file with the same pixels and extension, if dedup applies."""
+        check = self.duplicate_check
+        if not job.deduplicate or check is None:
+            return None
+        try:
+            existing = check(image, job)
+        except Exception as e:
+            # Best effort: a failed lookup just means a normal save
+            print(f"Duplicate check failed for {job.path}: {e}")
+            return None
+        if existing is None or os.path.abspath(existing) == os.path.abspath(job.path):
+            return None
+        # A link only stands in for the new file if the format matches
+        if os.path.splitext(existing)[1].lower() != os.path.splitext(job.path)[1].lower():
+            return None
+        return existing
+
+    def _link_duplicate(self, existing: str, job: SaveJob) -> bool:
+        """Link job.path to existing, or skip the save if links are unsupported.
+
+        Returns:
+            True if the job is finished (signals emitted), False to fall
+            back to a normal save because the existing file vanished
+        """
+        job.metadata['duplicate_of'] = existing
+        try:
+            link_atomic(existing, job.path)
+        except FileNotFoundError:
+            del job.metadata['duplicate_of']
+            return False
+        except OSError as e:
+            print(f"Skipping duplicate of {existing} (cannot link: {e})")
+            if job.reserved:
+                try:
+                    os.remove(job.path)
+                except OSError:
+                    pass
+            job.source = None
+            self.saved.emit(existing, job.tag)
+            return True
+        print(f"{job.path} is identical to {existing}; linked")
+        job.source = None
+        self.saved.emit(job.path, job.tag)
+        self.job_saved.emit(job)
+        return True
+
+
+_service: Optional[SaveService] = None
+_service_lock = threading.Lock()
+
+
+def get_save_service() -> SaveService:
+    """Get the shared, process-wide save service."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SaveService()
+        return _service
@@ -1,5 +1,23 @@
-from .tray import SystemTray
-from .hotkeys import HotkeyManager
-from .clipboard import ClipboardManager
+import importlib
 
-__all__ = ['SystemTray', 'HotkeyManager', 'ClipboardManager']
+# Submodules are imported on first use, so command-line clients of
+# system.instance don't load the tray (pystray) and hotkey (pynput) stacks
+_EXPORTS = {
+    'SystemTray': '.tray',
+    'HotkeyManager': '.hotkeys',
+    'ClipboardManager': '.clipboard',
+    'InstanceServer': '.instance',
+    'InstanceClient': '.instance',
+    'AlreadyRunningError': '.instance',
+    'send_command': '.instance',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
+
+__all__ = list(_EXPORTS)
@@ -0,0 +1,249 @@
+"""Single-instance enforcement and local IPC with the running BretClip.
+
+The first BretClip process listens on a per-user local socket (a Unix
+domain socket, or a named pipe on Windows, via QLocalServer). Later
+launches and scripts connect to it and send commands instead of starting a
+second tray icon and hotkey listener.
+
+Messages are JSON objects, one per line, in both directions. Every request
+has a ``command`` key and gets exactly one reply with an ``ok`` key, plus
+``error`` when ``ok`` is false. Several requests may be sent over one
+connection; replies come back in order.
+"""
+
+import getpass
+import json
+import os
+import re
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Union
+
+from PyQt5.QtCore import QDir, QLockFile, QObject, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+# Reply from a command handler: ready now, or once the Future completes
+Reply = Union[Dict, Future]
+
+
+class AlreadyRunningError(RuntimeError):
+    """Another BretClip instance already owns the local socket."""
+
+
+def server_name() -> str:
+    """Local socket name for the current user."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = str(os.getuid()) if hasattr(os, 'getuid') else "user"
+    return "BretClip-" + re.sub(r'[^A-Za-z0-9_.-]', '_', user)
+
+
+def _encode(message: Dict) -> bytes:
+    return json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+class InstanceClient:
+    """Blocking connection to the running instance, for launches and scripts.
+
+    Needs no QApplication. Keep one client open to send several commands
+    without paying for a new connection each time.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name or server_name()
+        self._socket = QLocalSocket()
+        self._buffer = b""
+
+    def connect(self, timeout: float = 1.0) -> bool:
+        """Connect to the instance.
+
+        Returns:
+            False if no instance is listening
+        """
+        self._socket.connectToServer(self.name)
+        return self._socket.waitForConnected(int(timeout * 1000))
+
+    def request(self, message: Dict, timeout: float = 5.0) -> Dict:
+        """Send one command and wait for its reply.
+
+        Args:
+            message: Request with at least a ``command`` key
+            timeout: Seconds to wait for the reply
+
+        Returns:
+            The reply
+
+        Raises:
+            ConnectionError: If the instance closed the connection
+            TimeoutError: If no reply arrived in time
+        """
+        self._socket.write(_encode(message))
+        deadline = time.monotonic() + timeout
+        while b'\n' not in self._buffer:
+            if self._socket.state() != QLocalSocket.ConnectedState and not self._socket.bytesAvailable():
+                raise ConnectionError("BretClip closed the connection")
+            remaining = int((deadline - time.monotonic()) * 1000)
+            if remaining <= 0:
+                raise TimeoutError(f"No reply to {message.get('command')!r} within {timeout:g} s")
+            if self._socket.bytesToWrite():
+                self._socket.waitForBytesWritten(remaining)
+            elif self._socket.waitForReadyRead(remaining) or self._socket.bytesAvailable():
+                self._buffer += bytes(self._socket.readAll())
+        line, _, self._buffer = self._buffer.partition(b'\n')
+        return json.loads(line)
+
+    def close(self):
+        """Disconnect."""
+        self._socket.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def send_command(message: Dict, timeout: float = 5.0, name: Optional[str] = None) -> Optional[Dict]:
+    """Send a single command to the running instance.
+
+    Args:
+        message: Request with at least a ``command`` key
+        timeout: Seconds to wait for the reply
+        name: Socket name (None = current user's instance)
+
+    Returns:
+        The reply, or None if no instance is running
+
+    Raises:
+        ConnectionError: If the instance closed the connection
+        TimeoutError: If no reply arrived in time
+    """
+    with InstanceClient(name) as client:
+        if not client.connect():
+            return None
+        return client.request(message, timeout)
+
+
+class InstanceServer(QObject):
+    """Local-socket endpoint of the running instance.
+
+    Commands are passed to :attr:`handler` on the GUI thread. It returns
+    the reply, or a concurrent Future resolving to it for work that
+    finishes later (a delayed capture, a background save). The Future may
+    complete on any thread. ``ping`` is answered here and never reaches the
+    handler. A handler exception becomes an error reply.
+    """
+
+    _completed = pyqtSignal(object, int, object)  # connection, request number, reply
+
+    def __init__(self, name: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        self.name = name or server_name()
+        self.handler: Optional[Callable[[Dict], Reply]] = None
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._connections: Dict[QLocalSocket, _Connection] = {}
+        self._completed.connect(self._on_completed)
+
+    def listen(self):
+        """Become the single instance for this user.
+
+        Raises:
+            AlreadyRunningError: If another instance answers on the socket
+            OSError: If the socket cannot be created
+        """
+        # Serialize simultaneous launches: the check and the listen must not
+        # interleave, or one could remove the other's freshly made socket
+        lock = QLockFile(os.path.join(QDir.tempPath(), f"{self.name}.lock"))
+        if not lock.tryLock(5000):
+            raise AlreadyRunningError(f"{self.name} is being started by another process")
+        try:
+            with InstanceClient(self.name) as client:
+                if client.connect(timeout=0.5):
+                    raise AlreadyRunningError(f"{self.name} is already running")
+            # Nothing answered: a socket file left by a crashed instance
+            QLocalServer.removeServer(self.name)
+            if not self._server.listen(self.name):
+                raise OSError(f"Cannot listen on {self.name}: {self._server.errorString()}")
+        finally:
+            lock.unlock()
+
+    def close(self):
+        """Stop accepting commands and drop open connections."""
+        self._server.close()
+        for socket in list(self._connections):
+            socket.abort()
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            connection = _Connection(socket)
+            self._connections[socket] = connection
+            socket.readyRead.connect(lambda connection=connection: self._on_ready_read(connection))
+            socket.disconnected.connect(lambda connection=connection: self._on_disconnected(connection))
+
+    def _on_disconnected(self, connection: '_Connection'):
+        connection.closed = True
+        self._connections.pop(connection.socket, None)
+        connection.socket.deleteLater()
+
+    def _on_ready_read(self, connection: '_Connection'):
+        socket = connection.socket
+        while not connection.closed and socket.canReadLine():
+            line = bytes(socket.readLine()).strip()
+            if line:
+                self._dispatch(connection, line)
+
+    def _dispatch(self, connection: '_Connection', line: bytes):
+        number = connection.received
+        connection.received += 1
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ValueError("request must be a JSON object")
+            if message.get('command') == 'ping':
+                reply = {'ok': True, 'pid': os.getpid()}
+            elif self.handler is None:
+                reply = {'ok': False, 'error': "not accepting commands"}
+            else:
+                reply = self.handler(message)
+        except Exception as e:
+            reply = {'ok': False, 'error': str(e)}
+
+        if isinstance(reply, Future):
+            # Delivered on the GUI thread whichever thread completes it
+            reply.add_done_callback(
+                lambda future: self._completed.emit(connection, number, _future_reply(future)))
+        else:
+            self._on_completed(connection, number, reply)
+
+    def _on_completed(self, connection: '_Connection', number: int, reply: Dict):
+        if connection.closed:
+            return  # Client went away before its reply was ready
+        reply.setdefault('ok', True)
+        connection.ready[number] = reply
+        # Replies go out in request order
+        while connection.sent in connection.ready:
+            connection.socket.write(_encode(connection.ready.pop(connection.sent)))
+            connection.sent += 1
+        connection.socket.flush()
+
+
+class _Connection:
+    """A client connected to the server and its replies in flight."""
+
+    def __init__(self, socket: QLocalSocket):
+        self.socket = socket
+        self.received = 0  # Requests read so far
+        self.sent = 0  # Replies written so far
+        self.ready: Dict[int, Dict] = {}  # Finished replies waiting for earlier ones
+        self.closed = False
+
+
+def _future_reply(future: Future) -> Dict:
+    try:
+        return future.result()
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
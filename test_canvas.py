@@ -0,0 +1,165 @@
+"""Tests for the cached annotation layers in DrawingCanvas.
+
+Run with: python -m pytest test_canvas.py
+"""
+
+import os
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+from PyQt5.QtCore import QEvent, QPoint, Qt
+from PyQt5.QtGui import QColor, QImage, QMouseEvent
+from PyQt5.QtWidgets import QApplication
+
+from editor.canvas import DrawingCanvas
+from editor.tools import Annotation, AnnotationTool, ToolType
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def make_canvas(width=800, height=600, view=(500, 400)) -> DrawingCanvas:
+    """A canvas showing a blank capture scaled down to fit the view."""
+    canvas = DrawingCanvas()
+    canvas.resize(*view)
+    canvas.set_image(Image.new('RGB', (width, height), (240, 240, 240)))
+    return canvas
+
+
+def draw(canvas: DrawingCanvas, tool_type: ToolType, *points, size=3) -> Annotation:
+    """Commit an annotation as if it had just been drawn."""
+    annotation = Annotation(AnnotationTool(tool_type, QColor(255, 0, 0), size),
+                            [QPoint(x, y) for x, y in points])
+    canvas._commit_annotation(annotation)
+    return annotation
+
+
+def drag(canvas: DrawingCanvas, *points):
+    """Press, move through and release the left button at image pixels."""
+    views = [canvas.offset + QPoint(int(x * canvas.scale_factor), int(y * canvas.scale_factor))
+             for x, y in points]
+    events = [(QEvent.MouseButtonPress, views[0], Qt.LeftButton)]
+    events += [(QEvent.MouseMove, view, Qt.NoButton) for view in views[1:]]
+    events.append((QEvent.MouseButtonRelease, views[-1], Qt.LeftButton))
+    for kind, view, button in events:
+        buttons = Qt.NoButton if kind == QEvent.MouseButtonRelease else Qt.LeftButton
+        QApplication.sendEvent(canvas, QMouseEvent(kind, view, button, buttons, Qt.NoModifier))
+
+
+def is_blank(layer: QImage) -> bool:
+    return layer is None or all(
+        layer.pixelColor(x, y).alpha() == 0
+        for y in range(layer.height()) for x in range(layer.width()))
+
+
+def test_clear_all_empties_scaled_layer():
+    canvas = make_canvas()
+    draw(canvas, ToolType.RECTANGLE, (100, 100), (300, 200))
+    draw(canvas, ToolType.PEN, (50, 50), (120, 90), (200, 60))
+    assert not is_blank(canvas._scaled_layer)
+
+    canvas.clear_annotations()
+    assert is_blank(canvas._scaled_layer)
+
+
+def test_undo_to_empty_empties_scaled_layer():
+    canvas = make_canvas()
+    draw(canvas, ToolType.RECTANGLE, (100, 100), (300, 200))
+    canvas.clear_annotations()
+    canvas.undo()
+    assert not is_blank(canvas._scaled_layer)
+
+    canvas.undo()
+    assert not canvas.annotations
+    assert is_blank(canvas._scaled_layer)
+
+
+def test_eraser_drag_is_one_undo_step():
+    canvas = make_canvas()
+    strokes = [draw(canvas, ToolType.PEN, (x, 100), (x, 300)) for x in (100, 200, 300)]
+    kept = draw(canvas, ToolType.PEN, (100, 500), (300, 500))
+
+    canvas.set_tool(AnnotationTool(ToolType.ERASER, size=10))
+    drag(canvas, *[(x, 200) for x in range(50, 360, 10)])
+    assert canvas.annotations == [kept]
+
+    canvas.undo()
+    assert canvas.annotations == strokes + [kept]
+    canvas.redo()
+    assert canvas.annotations == [kept]
+    canvas.undo()
+    canvas.undo()
+    assert canvas.annotations == strokes
+
+
+def test_eraser_drag_is_batched_per_frame():
+    canvas = make_canvas()
+    for x in (100, 200, 300):
+        draw(canvas, ToolType.PEN, (x, 100), (x, 300))
+    refreshed = []
+    canvas._refresh_region = lambda region, refresh=canvas._refresh_region: (
+        refreshed.append(region), refresh(region))
+
+    canvas.set_tool(AnnotationTool(ToolType.ERASER, size=10))
+    # No event loop runs here, so every move lands in the same frame
+    drag(canvas, *[(x, 200) for x in range(50, 360, 10)])
+    assert not canvas.annotations
+    assert len(refreshed) == 1
+
+
+def assert_layers_match_full_rebuild(canvas: DrawingCanvas):
+    partial = canvas._scaled_layer.copy()
+    image = canvas.annotation_layer.copy()
+    canvas._rebuild_annotation_layer()
+    assert canvas.annotation_layer == image
+    assert canvas._scaled_layer == partial
+
+
+def test_partial_rebake_matches_full_rebuild():
+    # 800x600 in a 500x400 view: scale 0.625, so view pixels straddle image pixels
+    canvas = make_canvas()
+    # Neighbours whose bounds just miss the erased stroke's, but not the
+    # rounded-out screen area cleared for it
+    strokes = [draw(canvas, ToolType.PEN, (x, 100), (x, 400), size=size)
+               for size, gap in ((1, 5), (2, 7), (3, 8), (5, 9)) for x in (300 - gap, 300 + gap)]
+    boxes = [draw(canvas, ToolType.RECTANGLE, (x, 450), (x + 40, 520)) for x in range(100, 400, 9)]
+    erased = draw(canvas, ToolType.PEN, (300, 100), (300, 400), size=1)
+
+    canvas._remove_annotations([erased])
+    assert_layers_match_full_rebuild(canvas)
+    canvas._remove_annotations([strokes[3], boxes[10], boxes[11]])
+    assert_layers_match_full_rebuild(canvas)
+    canvas.undo()
+    assert_layers_match_full_rebuild(canvas)
+    canvas.undo()
+    assert_layers_match_full_rebuild(canvas)
+
+def test_undo_redo_keeps_index_in_list_order():
+    canvas = make_canvas()
+    strokes = [draw(canvas, ToolType.PEN, (x, 100), (x, 300)) for x in range(100, 400, 20)]
+    canvas._remove_annotations([strokes[3]])
+    canvas.history.begin_group()
+    canvas._remove_annotations([strokes[5], strokes[6], strokes[7]])
+    canvas.history.end_group()
+    canvas.selected_annotation = strokes[9]
+    canvas.drag_offset = QPoint(5, 5)
+    canvas._drop_selection()
+    canvas.clear_annotations()
+
+    everything = canvas.original_image.rect()
+    rebuilds = []
+    canvas.index.rebuild = lambda annotations, rebuild=canvas.index.rebuild: (
+        rebuilds.append(1), rebuild(annotations))
+    for step in [canvas.undo] * 4 + [canvas.redo] * 3 + [canvas.undo] * 2:
+        step()
+        assert canvas.index.query(everything) == canvas.annotations
+        assert len(canvas.index) == len(canvas.annotations)
+    # Only undoing and redoing Clear All re-indexes from scratch
+    assert len(rebuilds) == 1
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
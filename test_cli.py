@@ -0,0 +1,98 @@
+"""Tests for the headless `bretclip capture` command on the synthetic backend.
+
+Run with: python -m pytest test_cli.py
+"""
+
+import io
+import os
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from PIL import Image
+
+import cli
+from capture.backends import SyntheticBackend
+
+MONITORS = [(320, 200), (160, 240)]
+SYNTHETIC = "--synthetic=320x200,160x240"
+
+
+def capture(*argv) -> int:
+    args = cli.build_parser().parse_args(["capture", SYNTHETIC, *argv])
+    return cli._capture(args)
+
+
+def desktop(box=None) -> Image.Image:
+    """What the synthetic backend shows, optionally cropped."""
+    image = SyntheticBackend(MONITORS).desktop.to_image().convert('RGB')
+    return image.crop(box) if box else image
+
+
+def assert_same_pixels(image: Image.Image, expected: Image.Image):
+    assert image.size == expected.size
+    assert image.convert('RGB').tobytes() == expected.tobytes()
+
+
+def test_capture_to_file(tmp_path, capsys):
+    path = tmp_path / "shot.png"
+    assert capture("-o", str(path)) == 0
+    assert capsys.readouterr().out.split() == [str(path)]
+    with Image.open(path) as image:
+        assert_same_pixels(image, desktop())
+
+
+def test_region_of_a_monitor(tmp_path, capsys):
+    path = tmp_path / "region.png"
+    # Relative to monitor 2, which starts at x=320
+    assert capture("--monitor", "2", "-r", "10,20,100,50", "-o", str(path)) == 0
+    with Image.open(path) as image:
+        assert_same_pixels(image, desktop((330, 20, 430, 70)))
+
+
+def test_numbered_loop(tmp_path, capsys):
+    pattern = str(tmp_path / "shot_{n}.png")
+    assert capture("--monitor", "1", "-n", "3", "-o", pattern) == 0
+    paths = [pattern.format(n=n) for n in range(3)]
+    # Printed in capture order, whichever encode finished first
+    assert capsys.readouterr().out.split() == paths
+    for path in paths:
+        with Image.open(path) as image:
+            assert_same_pixels(image, desktop((0, 0, 320, 200)))
+
+
+def test_png_stream_to_stdout(capsysbinary):
+    assert capture("-r", "0,0,64,32", "-n", "2", "-o", "-") == 0
+    data = capsysbinary.readouterr().out
+    end = b'IEND\xaeB`\x82'
+    assert data.count(end) == 2
+    first, second = data.split(end)[:2]
+    for png in (first + end, second + end):
+        with Image.open(io.BytesIO(png)) as image:
+            assert image.format == 'PNG'
+            assert_same_pixels(image, desktop((0, 0, 64, 32)))
+
+
+def test_monitor_out_of_range(tmp_path, capsys):
+    assert capture("--monitor", "3", "-o", str(tmp_path / "shot.png")) == 1
+    assert "no monitor 3 (have 2)" in capsys.readouterr().err
+    assert not os.listdir(tmp_path)
+
+
+def test_region_mode_needs_a_region(tmp_path, capsys):
+    assert capture("-m", "region", "-o", str(tmp_path / "shot.png")) == 1
+    assert "region mode needs --region" in capsys.readouterr().err
+    assert not os.listdir(tmp_path)
+
+
+@pytest.mark.parametrize('workers', ['0', '-1', 'two'])
+def test_workers_must_be_positive(workers, capsys):
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(["capture", "--workers", workers])
+    assert "--workers" in capsys.readouterr().err
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,152 @@
+"""Tests for the single-instance socket and its command protocol.
+
+Run with: python -m pytest test_instance.py
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from PyQt5.QtNetwork import QLocalSocket
+from PyQt5.QtWidgets import QApplication
+
+import cli
+from system import instance
+from system.instance import AlreadyRunningError, InstanceClient, InstanceServer, send_command
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def unique_name() -> str:
+    return f"BretClipTest-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    name = unique_name()
+    # cli and send_command() talk to the current user's socket by default
+    monkeypatch.setattr(instance, 'server_name', lambda: name)
+    server = InstanceServer(name)
+    server.listen()
+    yield server
+    server.close()
+
+
+def in_client_thread(function, timeout: float = 10.0):
+    """Run a blocking client call while this thread serves the socket."""
+    result = {}
+
+    def run():
+        try:
+            result['value'] = function()
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    deadline = time.monotonic() + timeout
+    while thread.is_alive() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.002)
+    thread.join(0)
+    assert not thread.is_alive(), "client did not finish"
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+def test_ping_status_and_show(server, capsys):
+    received = []
+    server.handler = lambda message: received.append(message['command']) or {}
+
+    reply = in_client_thread(lambda: send_command({'command': 'ping'}))
+    assert reply == {'ok': True, 'pid': os.getpid()}
+    assert in_client_thread(lambda: cli.main(['status'])) == 0
+    assert f"pid {os.getpid()}" in capsys.readouterr().out
+    assert in_client_thread(lambda: cli.main(['show'])) == 0
+    # ping is answered by the server itself
+    assert received == ['show']
+
+
+def test_without_handler_commands_fail(server):
+    reply = in_client_thread(lambda: send_command({'command': 'show'}))
+    assert reply == {'ok': False, 'error': "not accepting commands"}
+
+
+def test_future_replies(server):
+    def handler(message):
+        command = message['command']
+        if command == 'later':
+            future = Future()
+            threading.Timer(0.1, future.set_result, [{'path': "/tmp/shot.png"}]).start()
+            return future
+        if command == 'broken-later':
+            future = Future()
+            threading.Timer(0.1, future.set_exception, [OSError("disk full")]).start()
+            return future
+        raise ValueError(f"Unknown command: {command!r}")
+    server.handler = handler
+
+    def client():
+        with InstanceClient() as client:
+            assert client.connect()
+            return [client.request({'command': command})
+                    for command in ('later', 'broken-later', 'nonsense')]
+
+    assert in_client_thread(client) == [
+        {'ok': True, 'path': "/tmp/shot.png"},
+        {'ok': False, 'error': "disk full"},
+        {'ok': False, 'error': "Unknown command: 'nonsense'"},
+    ]
+
+
+def test_pipelined_replies_keep_request_order(server):
+    def handler(message):
+        if message['command'] == 'slow':
+            future = Future()
+            threading.Timer(0.2, future.set_result, [{'reply': 'slow'}]).start()
+            return future
+        return {'reply': message['command']}
+    server.handler = handler
+
+    def client():
+        socket = QLocalSocket()
+        socket.connectToServer(server.name)
+        assert socket.waitForConnected(1000)
+        # Several requests in one write, one of them not valid JSON
+        socket.write(b'{"command":"slow"}\n{"command":"fast"}\nnot json\n{"command":"ping"}\n')
+        socket.waitForBytesWritten(1000)
+        data = b""
+        while data.count(b'\n') < 4 and socket.waitForReadyRead(5000):
+            data += bytes(socket.readAll())
+        socket.abort()
+        return [json.loads(line) for line in data.splitlines()]
+
+    replies = in_client_thread(client)
+    assert [reply.get('reply') for reply in replies[:2]] == ['slow', 'fast']
+    assert replies[2]['ok'] is False
+    assert replies[3] == {'ok': True, 'pid': os.getpid()}
+
+
+def test_second_instance_is_refused(server):
+    with pytest.raises(AlreadyRunningError):
+        in_client_thread(lambda: InstanceServer(server.name).listen())
+
+
+def test_no_instance_running(monkeypatch):
+    name = unique_name()
+    monkeypatch.setattr(instance, 'server_name', lambda: name)
+    assert send_command({'command': 'ping'}) is None
+    assert cli.main(['status']) == cli.NOT_RUNNING
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
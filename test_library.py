@@ -0,0 +1,240 @@
+"""Tests for the SQLite screenshot library, duplicate hashes and similarity search.
+
+Run with: python -m pytest test_library.py
+"""
+
+import io
+import os
+import random
+import sqlite3
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from PIL import Image
+from PyQt5.QtWidgets import QApplication
+
+from library import HashIndex, ScreenshotLibrary, dedupe, dhash, hamming, pixel_hash
+from library import index as library_index
+from storage import SaveJob, SaveService
+from storage.profiles import reduce_to_palette
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = ScreenshotLibrary(str(tmp_path / "library.sqlite3"), str(tmp_path / "thumbnails"),
+                                workers=1)
+    yield library
+    library.close()
+
+
+def settle(library: ScreenshotLibrary):
+    """Wait for work queued on the (single-thread) library pool."""
+    library.executor.submit(lambda: None).result()
+
+
+def save(folder, name: str, color=(10, 20, 30), size=(64, 48)) -> str:
+    path = os.path.join(str(folder), name)
+    Image.new('RGB', size, color).save(path)
+    return path
+
+
+def test_migrates_version_1_database(tmp_path):
+    path = save(tmp_path, "BretClip_20240102_030405.png")
+    db_path = str(tmp_path / "library.sqlite3")
+    db = sqlite3.connect(db_path)
+    db.executescript(library_index._SCHEMA)
+    db.execute("INSERT INTO captures (path, captured_at, size, width, height, content_hash, mtime) "
+               "VALUES (?, 1.0, 1, 64, 48, 'abc', 2.0)", (path,))
+    db.execute("PRAGMA user_version=1")
+    db.commit()
+    db.close()
+
+    library = ScreenshotLibrary(db_path, str(tmp_path / "thumbnails"), workers=1)
+    try:
+        record = library.get(path)
+        assert (record.width, record.height, record.content_hash) == (64, 48, 'abc')
+        assert record.pixel_hash is None and record.dhash is None
+        assert library.backfill_hashes() == 1
+    finally:
+        library.close()
+    db = sqlite3.connect(db_path)
+    assert db.execute("PRAGMA user_version").fetchone()[0] == library_index._SCHEMA_VERSION
+    db.close()
+
+
+def test_recorded_job_is_found_by_pixels(tmp_path, library):
+    path = save(tmp_path, "BretClip_20240102_030405_250.png")
+    image = Image.open(path).convert('RGB')
+    job = SaveJob(None, path, metadata={'monitor': 1, 'window': "Editor",
+                                        'pixel_hash': pixel_hash(image), 'dhash': dhash(image)})
+    library.record_job(job)
+    settle(library)
+
+    record = library.find_exact(pixel_hash(image))
+    assert record.path == path
+    assert (record.monitor, record.window, record.dhash) == (1, "Editor", dhash(image))
+    assert record.captured_at % 1 == pytest.approx(0.25)
+    assert library.find_exact(pixel_hash(Image.new('RGB', (64, 48)))) is None
+
+
+def test_remove_leaves_the_file(tmp_path, library):
+    path = save(tmp_path, "a.png")
+    library.add(path)
+    assert library.remove(path)
+    assert library.get(path) is None
+    assert os.path.exists(path)
+    assert not library.remove(path)
+
+
+def test_scan_follows_the_folder(tmp_path, library):
+    folder = tmp_path / "shots"
+    folder.mkdir()
+    first = save(folder, "a.png")
+    save(folder, "b.png", (200, 0, 0))
+    (folder / "notes.txt").write_text("not an image")
+    assert library.scan(str(folder)) == (2, 0)
+    assert library.scan(str(folder)) == (0, 0)
+
+    # Files added and deleted while BretClip was not looking
+    added = save(folder, "c.jpg", (0, 200, 0))
+    os.remove(first)
+    assert library.scan(str(folder)) == (1, 1)
+    assert library.get(first) is None
+    assert library.get(added).width == 64
+    assert len(library) == 2
+
+
+def test_duplicate_save_links_instead_of_encoding(tmp_path, library):
+    service = SaveService(workers=1)
+    service.duplicate_check = library.check_duplicate
+    service.job_saved.connect(library.record_job)
+    image = Image.new('RGB', (64, 48), (90, 60, 30))
+
+    first = str(tmp_path / "first.png")
+    service.submit(image, first, deduplicate=True)
+    service.wait()
+    QApplication.processEvents()
+    settle(library)
+    assert library.get(first).pixel_hash == pixel_hash(image)
+
+    second = service.submit(image.copy(), str(tmp_path / "second.png"), deduplicate=True)
+    service.wait()
+    service.shutdown()
+    assert second.metadata['duplicate_of'] == first
+    assert os.path.samefile(first, second.path)
+
+
+def gradient(size=(90, 80), reverse=False) -> Image.Image:
+    """Brightness rising (or falling) from left to right."""
+    row = bytes(255 * x // (size[0] - 1) for x in range(size[0]))
+    if reverse:
+        row = row[::-1]
+    return Image.frombytes('L', size, row * size[1]).convert('RGB')
+
+
+def test_hamming_and_bands():
+    assert hamming(0, 0) == 0
+    assert hamming(0, (1 << 64) - 1) == 64
+    assert hamming(0b1011, 0b0110) == 3
+    value = 0x0123_4567_89ab_cdef
+    assert dedupe.bands(value) == [0x0123, 0x4567, 0x89ab, 0xcdef]
+    for value in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        assert -(1 << 63) <= dedupe.to_signed(value) < (1 << 63)
+        assert dedupe.from_signed(dedupe.to_signed(value)) == value
+
+
+def test_dhash_bits_follow_brightness():
+    # A bit is set where a sample is brighter than its right-hand neighbour
+    assert dhash(gradient()) == 0
+    assert dhash(gradient(reverse=True)) == (1 << 64) - 1
+    assert dhash(gradient().resize((900, 800))) == 0
+
+
+def test_hashes_ignore_how_the_capture_was_stored():
+    image = gradient()
+    image.paste((255, 0, 0), (10, 10, 30, 30))
+    stored = []
+    for mode, format in (('RGB', 'PNG'), ('RGBA', 'PNG'), ('P', 'PNG'), ('RGB', 'BMP')):
+        buffer = io.BytesIO()
+        # P as written by the "smallest" profile
+        converted = reduce_to_palette(image) if mode == 'P' else image.convert(mode)
+        assert converted.mode == mode
+        converted.save(buffer, format)
+        stored.append(Image.open(buffer))
+    assert {pixel_hash(copy) for copy in stored} == {pixel_hash(image)}
+    assert {dhash(copy) for copy in stored} == {dhash(image)}
+
+    # A small edit changes the pixel hash but only a few dHash bits
+    edited = image.copy()
+    edited.paste((0, 0, 0), (60, 60, 64, 64))
+    assert pixel_hash(edited) != pixel_hash(image)
+    assert hamming(dhash(edited), dhash(image)) <= dedupe.NEAR_DUPLICATE_DISTANCE
+
+
+def flip_bits(value: int, count: int, rng: random.Random) -> int:
+    for bit in rng.sample(range(64), count):
+        value ^= 1 << bit
+    return value
+
+
+def brute_force(hashes: dict, value: int, max_distance: int) -> dict:
+    return {key: hamming(value, stored) for key, stored in hashes.items()
+            if hamming(value, stored) <= max_distance}
+
+
+def test_hash_index_matches_linear_scan(monkeypatch):
+    # Enough entries that small radii probe buckets instead of scanning
+    monkeypatch.setattr(HashIndex, 'COMPACT_MIN', 50)
+    rng = random.Random(23)
+    index = HashIndex()
+    hashes = {}
+    centres = [rng.getrandbits(64) for _ in range(40)]
+    for key in range(3000):
+        hashes[key] = flip_bits(rng.choice(centres), rng.randint(0, 14), rng)
+        index.add(key, hashes[key])
+
+    # Removals leave tombstones and eventually compact; re-adding replaces
+    for key in rng.sample(sorted(hashes), 1200):
+        assert index.remove(key)
+        del hashes[key]
+    for key in rng.sample(sorted(hashes), 200):
+        hashes[key] = flip_bits(hashes[key], 5, rng)
+        index.add(key, hashes[key])
+    assert not index.remove(-1)
+    assert len(index) == len(hashes)
+
+    for _ in range(30):
+        query = flip_bits(rng.choice(centres), rng.randint(0, 6), rng)
+        for radius in range(0, 20):
+            found = index.search(query, radius)
+            assert dict(found) == brute_force(hashes, query, radius)
+            distances = [distance for _, distance in found]
+            assert distances == sorted(distances)
+
+        nearest = index.nearest(query, 25)
+        everything = sorted(brute_force(hashes, query, 64).values())
+        assert [distance for _, distance in nearest] == everything[:25]
+        assert all(hamming(query, hashes[key]) == distance for key, distance in nearest)
+
+
+def test_hash_index_compacts_tombstones(monkeypatch):
+    monkeypatch.setattr(HashIndex, 'COMPACT_MIN', 10)
+    index = HashIndex()
+    for key in range(100):
+        index.add(key, key * 0x9e3779b97f4a7c15 % (1 << 64))
+    for key in range(70):
+        index.remove(key)
+    # Compacted once tombstones outnumbered live entries
+    assert len(index._keys) < 70
+    index.compact()
+    assert len(index._keys) == len(index) == 30
+    assert dict(index.search(99 * 0x9e3779b97f4a7c15 % (1 << 64), 0)) == {99: 0}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
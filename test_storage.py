@@ -0,0 +1,188 @@
+"""Tests for background saving, atomic writes, autosave naming and PNG encoding.
+
+Run with: python -m pytest test_storage.py
+"""
+
+import io
+import os
+import random
+import struct
+import sys
+import threading
+import zlib
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from PIL import Image
+from PyQt5.QtWidgets import QApplication
+
+from storage import SaveService, allocate_path, encode_image, save_png, write_atomic
+from storage import naming, pngwriter
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def temp_files(folder) -> list:
+    return [name for name in os.listdir(folder) if name.startswith('.bretclip-')]
+
+
+def test_write_atomic_replaces_destination(tmp_path):
+    path = tmp_path / "shot.png"
+    path.write_bytes(b"old")
+    write_atomic(Image.new('RGB', (16, 8), (1, 2, 3)), str(path))
+    with Image.open(path) as written:
+        assert written.size == (16, 8)
+        assert written.getpixel((0, 0)) == (1, 2, 3)
+    assert not temp_files(tmp_path)
+
+
+def test_failed_encode_keeps_old_file(tmp_path):
+    path = tmp_path / "shot.jpg"
+    path.write_bytes(b"old")
+    # JPEG cannot hold 32-bit integer pixels
+    with pytest.raises(OSError):
+        write_atomic(Image.new('I', (16, 8)), str(path))
+    assert path.read_bytes() == b"old"
+    assert not temp_files(tmp_path)
+
+
+def test_allocate_path_is_unique_within_one_millisecond(tmp_path, monkeypatch):
+    monkeypatch.setattr(naming.time, 'time', lambda: 1700000000.123)
+    # Another process already took the first name for this millisecond
+    (tmp_path / "BretClip_{}.png".format(naming._next_stamp(1700000000.123)[0])).touch()
+    monkeypatch.setattr(naming, '_last_stamp', "")
+
+    paths = []
+    def allocate():
+        for _ in range(25):
+            paths.append(allocate_path(str(tmp_path)))
+
+    threads = [threading.Thread(target=allocate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(paths)) == len(paths) == 200
+    assert all(os.path.exists(path) and os.path.getsize(path) == 0 for path in paths)
+    assert len(os.listdir(tmp_path)) == 201
+
+
+def collect_signals(service: SaveService):
+    saved, failed = [], []
+    service.saved.connect(lambda path, tag: saved.append((path, tag)))
+    service.failed.connect(lambda path, tag, error: failed.append((path, tag)))
+    return saved, failed
+
+
+def test_saved_and_failed_carry_the_job_tag(tmp_path):
+    service = SaveService(workers=2)
+    saved, failed = collect_signals(service)
+    good = str(tmp_path / "good.png")
+    bad = allocate_path(str(tmp_path), extension=".jpg")
+
+    service.submit(Image.new('RGB', (8, 8)), good, tag="first")
+    service.submit(Image.new('I', (8, 8)), bad, tag="second", reserved=True)
+    service.wait()
+    service.shutdown()
+    QApplication.processEvents()
+
+    assert saved == [(good, "first")]
+    assert failed == [(bad, "second")]
+    # The placeholder of a failed reserved save is removed again
+    assert os.listdir(tmp_path) == ["good.png"]
+
+
+def test_submit_blocks_when_queue_is_full(tmp_path):
+    service = SaveService(workers=1, max_pending=2)
+    started, release = threading.Event(), threading.Event()
+
+    def blocked_source():
+        started.set()
+        release.wait(5)
+        return Image.new('RGB', (8, 8))
+
+    service.submit(blocked_source, str(tmp_path / "0.png"))
+    assert started.wait(5)
+    for i in (1, 2):
+        service.submit(Image.new('RGB', (8, 8)), str(tmp_path / f"{i}.png"))
+    assert service.pending() == 2
+
+    extra = threading.Thread(
+        target=lambda: service.submit(Image.new('RGB', (8, 8)), str(tmp_path / "3.png")))
+    extra.start()
+    extra.join(0.3)
+    assert extra.is_alive()
+
+    release.set()
+    extra.join(5)
+    assert not extra.is_alive()
+    service.wait()
+    service.shutdown()
+    assert sorted(os.listdir(tmp_path)) == ["0.png", "1.png", "2.png", "3.png"]
+
+
+def sample_image(mode: str, size) -> Image.Image:
+    """Noise over flat areas, so bands mix every filter choice."""
+    rng = random.Random(size[0])
+    noise = Image.frombytes('RGBA', size, bytes(rng.getrandbits(8) for _ in range(size[0] * size[1] * 4)))
+    image = Image.new('RGBA', size, (40, 120, 200, 255))
+    image.paste(noise.crop((0, 0, size[0] // 2, size[1] // 2)), (size[0] // 3, 0))
+    image.paste(noise.crop((0, size[1] // 2, size[0] // 2, size[1])), (0, size[1] // 2))
+    if mode == 'P':
+        return image.convert('RGB').quantize(64)
+    return image.convert(mode)
+
+
+def idat_stream(data: bytes) -> bytes:
+    """The zlib stream spread over a PNG's IDAT chunks."""
+    stream, position = [], 8
+    while position < len(data):
+        length, kind = struct.unpack('>I4s', data[position:position + 8])
+        if kind == b'IDAT':
+            stream.append(data[position + 8:position + 8 + length])
+        position += 12 + length
+    return b''.join(stream)
+
+
+@pytest.mark.parametrize('mode', ['RGB', 'RGBA', 'L', 'P'])
+@pytest.mark.parametrize('size', [(97, 61), (700, 90)])
+@pytest.mark.parametrize('workers', [1, 3, None])
+def test_save_png_round_trips(monkeypatch, mode, size, workers):
+    # Small bands: many seams, with and without a full 32 KiB of context
+    monkeypatch.setattr(pngwriter, 'BAND_BYTES', 2000)
+    image = sample_image(mode, size)
+    buffer = io.BytesIO()
+    save_png(image, buffer, compress_level=6, workers=workers)
+
+    # Pillow ignores the Adler-32 trailer; zlib checks it
+    filtered = zlib.decompress(idat_stream(buffer.getvalue()))
+    assert len(filtered) == size[1] * (1 + size[0] * len(image.getbands()))
+    buffer.seek(0)
+    with Image.open(buffer) as decoded:
+        decoded.load()
+        assert decoded.mode == mode
+        assert decoded.size == image.size
+        assert decoded.tobytes() == image.tobytes()
+        if mode == 'P':
+            assert decoded.getpalette()[:192] == image.getpalette()[:192]
+
+
+@pytest.mark.parametrize('cores, profile, parallel', [
+    (4, 'fast', True),
+    (1, 'fast', False),
+    (4, 'smallest', False),
+])
+def test_parallel_png_needs_cores_and_no_optimize(monkeypatch, cores, profile, parallel):
+    calls = []
+    monkeypatch.setattr(pngwriter, 'PARALLEL_MIN_PIXELS', 100)
+    monkeypatch.setattr(pngwriter, 'save_png', lambda *args, **kwargs: calls.append(args))
+    monkeypatch.setattr(os, 'cpu_count', lambda: cores)
+    encode_image(sample_image('RGB', (97, 61)), io.BytesIO(), 'PNG', profile)
+    assert bool(calls) == parallel
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))